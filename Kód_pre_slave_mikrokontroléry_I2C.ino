@@ -1,10 +1,28 @@
 #include <Wire.h>
 #include <DHT.h>
 
-#define SLAVE_ADDRESS 1
+// Adresa musí zodpovedať [Bus N] addresses v config.ini (8 pre prvý slave, 9 pre druhý)
+#define SLAVE_ADDRESS 8
 #define NUM_SENSORS 5
 #define DHTTYPE DHT22
 
+// Rámec verzie 1 (little-endian):
+//   verzia (1 B), počet senzorov (1 B), poradové číslo merania (2 B),
+//   pre každý senzor teplota a vlhkosť v stotinách (2 + 2 B) a stav (1 B),
+//   na konci CRC-8 (polynóm 0x07) zo všetkých predchádzajúcich bajtov.
+// 4 + 5 * 5 + 1 = 30 bajtov, zmestí sa do 32-bajtového buffera knižnice Wire.
+#define FRAME_VERSION 1
+#define HEADER_SIZE 4
+#define SENSOR_BLOCK_SIZE 5
+#define FRAME_SIZE (HEADER_SIZE + NUM_SENSORS * SENSOR_BLOCK_SIZE + 1)
+
+#define STATUS_OK 0
+#define STATUS_READ_ERROR 1  // DHT22 vrátil NaN
+#define STATUS_NO_DATA 2     // po štarte ešte nebolo meranie
+
+#define ERROR_CODE -999
+#define READ_INTERVAL_MS 2000  // DHT22 nemeria častejšie ako raz za 2 s
+
 const int sensorPins[NUM_SENSORS] = {2, 3, 4, 5, 6};
 DHT sensors[NUM_SENSORS] = {
   DHT(sensorPins[0], DHTTYPE),
@@ -14,21 +32,35 @@ DHT sensors[NUM_SENSORS] = {
   DHT(sensorPins[4], DHTTYPE)
 };
 
-int temperatureInts[NUM_SENSORS];  // Pole na uloženie teplôt vo formáte int
-int humidityInts[NUM_SENSORS];     // Pole na uloženie vlhkosti vo formáte int
+int16_t temperatureInts[NUM_SENSORS];  // Pole na uloženie teplôt vo formáte int
+int16_t humidityInts[NUM_SENSORS];     // Pole na uloženie vlhkosti vo formáte int
+uint8_t sensorStatus[NUM_SENSORS];
 
-void setup() {
-  Wire.begin(SLAVE_ADDRESS);  // Nastavenie adresy Slave
-  Wire.onRequest(sendData);   // Nastavenie funkcie na spracovanie požiadavky od Mastera
+uint8_t frame[FRAME_SIZE];  // Hotový rámec, obsluha požiadavky ho iba odošle
+uint16_t sequence = 0;
+unsigned long lastRead = 0UL - READ_INTERVAL_MS;  // Prvé meranie hneď po štarte
 
+void setup() {
   for (int i = 0; i < NUM_SENSORS; i++) {
     sensors[i].begin();  // Inicializácia senzorov
+    temperatureInts[i] = ERROR_CODE;
+    humidityInts[i] = ERROR_CODE;
+    sensorStatus[i] = STATUS_NO_DATA;
   }
+  buildFrame();
+
+  Wire.begin(SLAVE_ADDRESS);  // Nastavenie adresy Slave
+  Wire.onRequest(sendData);   // Nastavenie funkcie na spracovanie požiadavky od Mastera
 }
 
 void loop() {
-  readSensors();  // Čítanie údajov zo senzorov
-  delay(2000);    // Oneskorenie na stabilitu
+  // Bez delay(): meranie podľa millis(), nové poradové číslo iba po novom meraní
+  if (millis() - lastRead >= READ_INTERVAL_MS) {
+    lastRead = millis();
+    readSensors();
+    sequence++;
+    buildFrame();
+  }
 }
 
 void readSensors() {
@@ -36,30 +68,53 @@ void readSensors() {
     float temp = sensors[i].readTemperature();  // Odčítanie teploty
     float hum = sensors[i].readHumidity();     // Odčítanie vlhkosti
 
-    temperatureInts[i] = (int)(temp * 100);  
-    humidityInts[i] = (int)(hum * 100);      
-  }
-}
-
-void sendData() {
-  for (int i = 0; i < NUM_SENSORS; i++) {
-    float temp = sensors[i].readTemperature();  
-    float hum = sensors[i].readHumidity();     
-
-    
     if (isnan(temp) || isnan(hum)) {
-      // Ak je hodnota NaN, pošlite špeciálny kód chyby
-      int errorCode = -999;  // Код помилки
-      Wire.write((byte*)&errorCode, 2);  
-      Wire.write((byte*)&errorCode, 2);  
+      // Chybové hodnoty ostávajú kvôli čitateľnosti, rozhoduje stav senzora
+      temperatureInts[i] = ERROR_CODE;
+      humidityInts[i] = ERROR_CODE;
+      sensorStatus[i] = STATUS_READ_ERROR;
     } else {
-      // Якщо значення коректне, відправляємо їх
-      temperatureInts[i] = (int)(temp * 100);  
-      humidityInts[i] = (int)(hum * 100);      
+      temperatureInts[i] = (int16_t)(temp * 100);
+      humidityInts[i] = (int16_t)(hum * 100);
+      sensorStatus[i] = STATUS_OK;
+    }
+  }
+}
 
-      Wire.write((byte*)&temperatureInts[i], 2);  
-      Wire.write((byte*)&humidityInts[i], 2);     
+uint8_t crc8(const uint8_t *data, uint8_t length) {
+  uint8_t crc = 0;
+  for (uint8_t i = 0; i < length; i++) {
+    crc ^= data[i];
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0x07) : (uint8_t)(crc << 1);
     }
   }
+  return crc;
 }
 
+void buildFrame() {
+  uint8_t next[FRAME_SIZE];
+  next[0] = FRAME_VERSION;
+  next[1] = NUM_SENSORS;
+  next[2] = sequence & 0xFF;
+  next[3] = sequence >> 8;
+  for (int i = 0; i < NUM_SENSORS; i++) {
+    uint8_t *block = next + HEADER_SIZE + i * SENSOR_BLOCK_SIZE;
+    block[0] = temperatureInts[i] & 0xFF;
+    block[1] = (temperatureInts[i] >> 8) & 0xFF;
+    block[2] = humidityInts[i] & 0xFF;
+    block[3] = (humidityInts[i] >> 8) & 0xFF;
+    block[4] = sensorStatus[i];
+  }
+  next[FRAME_SIZE - 1] = crc8(next, FRAME_SIZE - 1);
+
+  // Výmena rámca bez prerušení, master nikdy nedostane polovicu starého a nového
+  noInterrupts();
+  memcpy(frame, next, FRAME_SIZE);
+  interrupts();
+}
+
+void sendData() {
+  // Obsluha prerušenia: žiadne čítanie DHT22, iba odoslanie hotového rámca
+  Wire.write(frame, FRAME_SIZE);
+}
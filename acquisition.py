@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from metrics import SWEEP_JITTER_SECONDS, SWEEP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Nemenný výsledok jedného cyklu zberu údajov."""
+    sequence: int
+    timestamp: Optional[datetime]
+    readings: Tuple[Mapping, ...] = ()
+
+    @classmethod
+    def from_data(cls, sequence: int, data: List[Dict]) -> 'Snapshot':
+        return cls(
+            sequence=sequence,
+            timestamp=datetime.now(),
+            readings=tuple(MappingProxyType(dict(item)) for item in data)
+        )
+
+    def to_list(self) -> List[Dict]:
+        # Kópia pre jsonify / šablónu, samotný snapshot ostáva nemenný
+        return [dict(item) for item in self.readings]
+
+
+class AcquisitionLoop:
+    """Samostatné vlákno, ktoré jediné pristupuje k I2C zbernici.
+
+    Každých `period` sekúnd vykoná jeden zber cez `SensorDataManager`
+    (ten zároveň raz zapíše údaje do logu) a výsledok zverejní ako
+    nemenný `Snapshot`. HTTP cesty čítajú iba posledný snapshot.
+    """
+
+    def __init__(self, sensor_manager, period: float = 5.0, publisher=None):
+        self.sensor_manager = sensor_manager
+        self.period = period
+        # Voliteľný SharedSnapshotWriter pre webové procesy (pozri shared_snapshot.py)
+        self.publisher = publisher
+        self._latest = Snapshot(sequence=0, timestamp=None)
+        self._updated = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def alarms(self):
+        return self.sensor_manager.alarms
+
+    def latest(self) -> Snapshot:
+        # Priradenie referencie je atomické, zámok nie je potrebný
+        return self._latest
+
+    def wait_for_update(self, after_sequence: int, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """Počká na snapshot novší ako `after_sequence` (None po uplynutí timeoutu).
+
+        Všetci čakajúci odberatelia sa zobudia naraz, každý dostane nový
+        snapshot práve raz.
+        """
+        with self._updated:
+            if self._updated.wait_for(lambda: self._latest.sequence > after_sequence, timeout):
+                return self._latest
+            return None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='acquisition', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> Snapshot:
+        with SWEEP_SECONDS.time():
+            data = self.sensor_manager.generate_sensor_data()
+        snapshot = Snapshot.from_data(self._latest.sequence + 1, data)
+        with self._updated:
+            self._latest = snapshot
+            self._updated.notify_all()
+        if self.publisher is not None:
+            self.publisher.publish(snapshot, self.sensor_manager.alarms.state())
+        return snapshot
+
+    def _run(self) -> None:
+        next_run = time.monotonic()
+        last_start = None
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            if last_start is not None:
+                SWEEP_JITTER_SECONDS.observe(abs(started - last_start - self.period))
+            last_start = started
+            try:
+                self.run_once()
+            except StopIteration:
+                # Zdroj zberov skončil (prehrávanie logov)
+                logger.info("Zdroj údajov sa skončil, zber sa zastavuje")
+                break
+            except Exception as e:
+                logger.error(f"Chyba v cykle zberu údajov: {e}")
+
+            next_run += self.period
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                # Cyklus trval dlhšie ako perióda, nedobiehame zmeškané cykly
+                next_run = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
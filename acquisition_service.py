@@ -0,0 +1,104 @@
+"""Samostatný proces zberu údajov pre nasadenie s viacerými webovými procesmi.
+
+Jediný proces otvára zbernice I2C, zapisuje log, vyhodnocuje alarmy, robí
+údržbu logov a každý snapshot zverejní v zdieľanej pamäti. Webové procesy
+(config.ini: [Serving] mode = shared) zbernicu neotvárajú a snapshot čítajú
+zo segmentu, takže ich môže byť ľubovoľný počet:
+
+    python acquisition_service.py
+    gunicorn -w 4 -b 0.0.0.0:5000 --threads 8 'app:create_app()'
+"""
+import logging
+import signal
+import sys
+import threading
+
+from acquisition import AcquisitionLoop
+from i2c_topology import BusTopology
+from log_maintenance import LogMaintenance
+from sensor_manager import SensorDataManager, Config
+from sim_bus import SimulatedBus
+
+try:
+    import smbus
+except ImportError:  # vývojový počítač bez I2C, použiteľný iba so simulate = true
+    smbus = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT = 'sensor_snapshot'
+
+
+def open_buses(config, topology):
+    """Skutočné zbernice SMBus, alebo simulované pri [Acquisition] simulate = true."""
+    if config.config.getboolean('Acquisition', 'simulate', fallback=False):
+        # Verzia rámca podľa slave na zbernici, ako pri skutočnom firmvéri
+        versions = {slave.bus: slave.frame_version for slave in topology.slaves}
+        return {
+            number: SimulatedBus(
+                latency=config.config.getfloat('Simulation', 'latency', fallback=0.002),
+                error_rate=config.config.getfloat('Simulation', 'error_rate', fallback=0.0),
+                corrupt_rate=config.config.getfloat('Simulation', 'corrupt_rate', fallback=0.0),
+                update_interval=config.config.getfloat('Simulation', 'update_interval', fallback=2.0),
+                frame_version=versions[number]
+            )
+            for number in topology.buses
+        }
+    if smbus is None:
+        raise RuntimeError("Modul smbus nie je nainštalovaný, nastavte [Acquisition] simulate = true")
+    return {number: smbus.SMBus(number) for number in topology.buses}
+
+
+def start_acquisition(config, publisher_name=None):
+    """Spustí zber a údržbu logov, vráti (SensorDataManager, AcquisitionLoop, LogMaintenance).
+
+    S `publisher_name` sa každý snapshot zapíše aj do zdieľanej pamäte.
+    """
+    # Inicializácia I2C zberníc podľa sekcií [Bus N] v config.ini
+    topology = BusTopology.from_config(config.config)
+    sensor_manager = SensorDataManager(config, open_buses(config, topology), topology=topology)
+    publisher = None
+    if publisher_name is not None:
+        from shared_snapshot import SharedSnapshotWriter
+        publisher = SharedSnapshotWriter(publisher_name, sensor_manager.decoder.sensor_ids)
+    # Zber údajov beží v samostatnom vlákne, cesty čítajú iba posledný snapshot
+    acquisition = AcquisitionLoop(
+        sensor_manager,
+        period=config.config.getfloat('Acquisition', 'period', fallback=5.0),
+        publisher=publisher
+    )
+    acquisition.start()
+    # Kompresia uzavretých dní a retencia podľa sekcie [Maintenance]
+    maintenance = LogMaintenance.from_config(sensor_manager.logger, config.config)
+    maintenance.start()
+    return sensor_manager, acquisition, maintenance
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Proces zberu údajov so snapshotom v zdieľanej pamäti")
+    parser.add_argument('--config', default='config.ini')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    config = Config(args.config)
+    name = config.config.get('Serving', 'segment', fallback=DEFAULT_SEGMENT)
+    sensor_manager, acquisition, maintenance = start_acquisition(config, name)
+    logger.info(f"Zber beží, snapshot sa zverejňuje v segmente {name}")
+
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    stopped.wait()
+
+    # Najprv zastaví zber a údržbu, potom zapíše buffer logu
+    acquisition.stop()
+    maintenance.stop()
+    sensor_manager.close()
+    acquisition.publisher.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from frame_decoder import DecodedSweep
+from metrics import ALARM_TRANSITIONS, ALARMS_ACTIVE
+
+logger = logging.getLogger(__name__)
+
+# Poradie riadkov v stavových poliach
+ALARM_KINDS = ('temperature_high', 'temperature_low', 'humidity_high', 'humidity_low',
+               'temperature_rate', 'humidity_rate', 'stuck', 'fault')
+ALARM_LOG_FILE = 'alarms.log'
+
+
+@dataclass(frozen=True)
+class AlarmEvent:
+    """Zmena stavu jedného alarmu (zapnutie alebo vypnutie)."""
+    timestamp: datetime
+    sensor_id: str
+    kind: str
+    active: bool
+    value: float
+
+    def to_line(self) -> str:
+        # Jeden krátky riadok na zmenu, v rovnakom tvare ako CSV log
+        state = 'on' if self.active else 'off'
+        return f"{self.timestamp.strftime('%Y-%m-%d %H:%M:%S')};{self.sensor_id};{self.kind};{state};{self.value:g}\n"
+
+
+def active_alarms(sensor_ids: Sequence[str], active: np.ndarray, since: np.ndarray,
+                  values: np.ndarray) -> List[Dict]:
+    """Zoznam aktívnych alarmov zo stavových polí (druh × senzor), najstaršie prvé."""
+    alarms = [{
+        'sensor_id': sensor_ids[sensor_index],
+        'kind': ALARM_KINDS[kind_index],
+        'since': datetime.fromtimestamp(since[kind_index, sensor_index]).strftime('%Y-%m-%d %H:%M:%S'),
+        'value': None if np.isnan(values[kind_index, sensor_index])
+        else round(float(values[kind_index, sensor_index]), 2)
+    } for kind_index, sensor_index in zip(*np.nonzero(active))]
+    return sorted(alarms, key=lambda alarm: alarm['since'])
+
+
+class AlarmEngine:
+    """Online vyhodnocovanie alarmov pri každom zbere, O(1) na meranie.
+
+    Stav je v poliach numpy (riadok = druh alarmu, stĺpec = senzor) a celý
+    zber sa vyhodnotí naraz, podobne ako vo `FrameDecoder`:
+
+    - limity z [Sensors] s hysterézou (alarm sa vypne až `hysteresis` pod limitom),
+    - rýchlosť zmeny za minútu z rozdielu rýchlej a pomalej EWMA s časovými
+      konštantami v sekundách - nezávisí od rozostupu zberov a potláča šum
+      (vypne sa pod polovicou limitu),
+    - zaseknutý senzor: teplota aj vlhkosť rovnaká `stuck_samples` zberov po sebe,
+    - porucha: firmvér poslal ERROR_SENTINEL.
+
+    Limity z [Sensors] sa uplatňujú iba tu (`limit_masks`); dekodér aj log
+    berú meranie mimo limitov ako platné - práve to sú výkyvy. Teplota
+    a vlhkosť sa vyhodnocujú zvlášť, kanál, ktorý v zbere chýba alebo nie je
+    platný, svoj stav nemení. Do logu alarmov sa zapisujú iba zmeny stavu.
+    """
+
+    def __init__(self, sensor_ids: Sequence[str],
+                 min_temp: float = -50.0, max_temp: float = 100.0,
+                 min_humidity: float = 0.0, max_humidity: float = 100.0,
+                 temp_hysteresis: float = 0.5, humidity_hysteresis: float = 2.0,
+                 max_temp_rate: float = 1.0, max_humidity_rate: float = 5.0,
+                 rate_fast_seconds: float = 30.0, rate_slow_seconds: float = 120.0,
+                 stuck_samples: int = 120,
+                 log_path: Optional[Path] = None):
+        self.sensor_ids = list(sensor_ids)
+        self.rate_fast_seconds = rate_fast_seconds
+        self.rate_slow_seconds = rate_slow_seconds
+        self.stuck_samples = stuck_samples
+        self.log_path = Path(log_path) if log_path is not None else None
+        # Stĺpce (2, 1): teplota, vlhkosť
+        self._upper = np.array([[max_temp], [max_humidity]])
+        self._lower = np.array([[min_temp], [min_humidity]])
+        self._hysteresis = np.array([[temp_hysteresis], [humidity_hysteresis]])
+        self._max_rate = np.array([[max_temp_rate], [max_humidity_rate]])
+
+        count = len(self.sensor_ids)
+        self._fast = np.full((2, count), np.nan)
+        self._slow = np.full((2, count), np.nan)
+        self._last_values = np.full((2, count), np.nan)
+        self._last_time = np.full((2, count), np.nan)
+        self._stuck_count = np.zeros(count, dtype=int)
+        self._active = np.zeros((len(ALARM_KINDS), count), dtype=bool)
+        self._values = np.full((len(ALARM_KINDS), count), np.nan)
+        self._since = np.full((len(ALARM_KINDS), count), np.nan)
+        self._lock = threading.Lock()
+        self.version = 0
+
+    @classmethod
+    def from_config(cls, sensor_ids: Sequence[str], config, log_path: Optional[Path] = None) -> 'AlarmEngine':
+        """Limity zo sekcie [Sensors], ostatné nastavenia zo sekcie [Alarms]."""
+        return cls(
+            sensor_ids,
+            min_temp=config.getfloat('Sensors', 'min_temp', fallback=-50.0),
+            max_temp=config.getfloat('Sensors', 'max_temp', fallback=100.0),
+            min_humidity=config.getfloat('Sensors', 'min_humidity', fallback=0.0),
+            max_humidity=config.getfloat('Sensors', 'max_humidity', fallback=100.0),
+            temp_hysteresis=config.getfloat('Alarms', 'temp_hysteresis', fallback=0.5),
+            humidity_hysteresis=config.getfloat('Alarms', 'humidity_hysteresis', fallback=2.0),
+            max_temp_rate=config.getfloat('Alarms', 'max_temp_rate', fallback=1.0),
+            max_humidity_rate=config.getfloat('Alarms', 'max_humidity_rate', fallback=5.0),
+            rate_fast_seconds=config.getfloat('Alarms', 'rate_fast_seconds', fallback=30.0),
+            rate_slow_seconds=config.getfloat('Alarms', 'rate_slow_seconds', fallback=120.0),
+            stuck_samples=config.getint('Alarms', 'stuck_samples', fallback=120),
+            log_path=log_path
+        )
+
+    def update(self, sweep: DecodedSweep, timestamp: Optional[datetime] = None) -> List[AlarmEvent]:
+        """Vyhodnotí jeden zber a vráti zmeny stavu alarmov."""
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Rámec s nezmeneným poradovým číslom nie je nové meranie (nepočíta sa ani do „stuck“);
+        # riadky (2, senzory): teplota, vlhkosť
+        channels = np.stack([sweep.temperature_valid, sweep.humidity_valid]) & sweep.fresh
+        measured = channels.any(axis=0)
+        values = np.stack([sweep.temperature, sweep.humidity]).astype(float)
+        now = timestamp.timestamp()
+
+        with self._lock:
+            old = self._active
+            new = old.copy()
+
+            # Váha EWMA podľa času od posledného merania; prvé meranie iba nastaví priemery.
+            # Pri lineárnej zmene je rýchla EWMA pred pomalou o sklon × rozdiel konštánt.
+            known = ~np.isnan(self._fast)
+            elapsed = np.where(known, now - self._last_time, 0.0)
+            fast_weight = 1.0 - np.exp(-elapsed / self.rate_fast_seconds)
+            slow_weight = 1.0 - np.exp(-elapsed / self.rate_slow_seconds)
+            fast = np.where(known, self._fast + fast_weight * (values - self._fast), values)
+            slow = np.where(known, self._slow + slow_weight * (values - self._slow), values)
+            rate = (fast - slow) / (self.rate_slow_seconds - self.rate_fast_seconds) * 60.0
+
+            above, below = self.limit_masks(values, old)
+            too_fast = np.where(old[[4, 5]], np.abs(rate) > self._max_rate / 2, np.abs(rate) > self._max_rate)
+            too_fast &= self._max_rate > 0
+
+            unchanged = ((values == self._last_values) | ~channels).all(axis=0)
+            stuck_count = np.where(unchanged, self._stuck_count + 1, 0)
+            stuck = (stuck_count >= self.stuck_samples) if self.stuck_samples > 0 else np.zeros_like(unchanged)
+
+            evaluated = np.stack([above[0], below[0], above[1], below[1], too_fast[0], too_fast[1], stuck])
+            # Ktorý kanál rozhoduje o danom druhu alarmu (stuck a porucha podľa celého senzora)
+            decided = np.stack([channels[0], channels[0], channels[1], channels[1], channels[0], channels[1],
+                                measured, measured])
+            new[:7] = np.where(decided[:7], evaluated, old[:7])
+            # Porucha trvá, kým senzor znova nepošle meranie
+            new[7] = np.where(sweep.sensor_error & sweep.fresh, True, np.where(measured, False, old[7]))
+
+            current = np.stack([values[0], values[0], values[1], values[1], rate[0], rate[1],
+                                values[0], np.full(len(self.sensor_ids), np.nan)])
+            self._values = np.where(decided, current, self._values)
+            self._fast = np.where(channels, fast, self._fast)
+            self._slow = np.where(channels, slow, self._slow)
+            self._last_values = np.where(channels, values, self._last_values)
+            self._last_time = np.where(channels, now, self._last_time)
+            self._stuck_count = np.where(measured, stuck_count, self._stuck_count)
+            self._active = new
+
+            events = []
+            for kind_index, sensor_index in zip(*np.nonzero(new != old)):
+                active = bool(new[kind_index, sensor_index])
+                self._since[kind_index, sensor_index] = now if active else np.nan
+                events.append(AlarmEvent(timestamp, self.sensor_ids[sensor_index], ALARM_KINDS[kind_index],
+                                         active, float(self._values[kind_index, sensor_index])))
+            if events:
+                self.version += 1
+                counts = new.sum(axis=1)
+                for kind_index, kind in enumerate(ALARM_KINDS):
+                    ALARMS_ACTIVE.set(int(counts[kind_index]), kind=kind)
+
+        if events:
+            self._record(events)
+        return events
+
+    def limit_masks(self, values: np.ndarray, active: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Masky (teplota, vlhkosť) × senzor nad a pod limitmi [Sensors].
+
+        S `active` (stav alarmov) platí hysterézia: aktívny alarm sa vypne až
+        `hysteresis` za limitom. NaN (neplatný kanál) nie je mimo limitov.
+        """
+        if active is None:
+            return values > self._upper, values < self._lower
+        above = np.where(active[[0, 2]], values > self._upper - self._hysteresis, values > self._upper)
+        below = np.where(active[[1, 3]], values < self._lower + self._hysteresis, values < self._lower)
+        return above, below
+
+    def active(self) -> List[Dict]:
+        """Aktívne alarmy pre dashboard, najstaršie prvé."""
+        return active_alarms(self.sensor_ids, *self.state()[1:])
+
+    def state(self) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """Kópia stavu (verzia, aktívne, začiatok ako epoch, hodnota) napr. pre zdieľanú pamäť."""
+        with self._lock:
+            return self.version, self._active.copy(), self._since.copy(), self._values.copy()
+
+    def _record(self, events: List[AlarmEvent]) -> None:
+        for event in events:
+            ALARM_TRANSITIONS.inc(kind=event.kind, state='on' if event.active else 'off')
+            if event.active:
+                logger.warning(f"Alarm {event.kind} senzora {event.sensor_id} (hodnota {event.value:g})")
+            else:
+                logger.info(f"Alarm {event.kind} senzora {event.sensor_id} skončil")
+        if self.log_path is None:
+            return
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as file:
+                file.write(''.join(event.to_line() for event in events))
+        except OSError as e:
+            logger.error(f"Chyba pri zápise logu alarmov {self.log_path}: {e}")
@@ -1,21 +1,35 @@
-import smbus
+import atexit
 from flask import Flask
 from sensor_manager import SensorDataManager, Config
+from acquisition_service import DEFAULT_SEGMENT, start_acquisition
 from routes import create_routes
 
+
 def create_app():
     app = Flask(__name__)
     # Inicializácia konfigurácie
     config = Config()
-    # Inicializácia I2C zbernice
-    i2c_bus = smbus.SMBus(1)  # Použite správnu zbernicu pre váš hardvér
-    # Inicializácia správcu senzorov
-    sensor_manager = SensorDataManager(config, i2c_bus, address=[8, 9])
+    if config.config.get('Serving', 'mode', fallback='standalone') == 'shared':
+        # Zber beží v acquisition_service.py, tento proces zbernicu neotvára a nič nezapisuje;
+        # snapshot číta zo zdieľanej pamäte, takže webových procesov môže byť viac
+        from shared_snapshot import SharedSnapshotReader
+        sensor_manager = SensorDataManager(config, None)
+        acquisition = SharedSnapshotReader(config.config.get('Serving', 'segment', fallback=DEFAULT_SEGMENT),
+                                           sensor_manager.decoder.sensor_ids)
+        atexit.register(acquisition.stop)
+    else:
+        # Jeden proces: zber, údržba logov aj web
+        sensor_manager, acquisition, maintenance = start_acquisition(config)
+        # atexit volá v opačnom poradí: najprv zastaví zber a údržbu, potom zapíše buffer logu
+        atexit.register(sensor_manager.close)
+        atexit.register(maintenance.stop)
+        atexit.register(acquisition.stop)
     # Registrácia ciest
-    routes = create_routes(sensor_manager)
+    routes = create_routes(sensor_manager, acquisition)
     app.register_blueprint(routes)
     return app
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Reloader by spustil druhý proces s vlastným vláknom zberu na tej istej zbernici
+    app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
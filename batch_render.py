@@ -0,0 +1,235 @@
+"""Dávkové vykreslenie celého merania bez GUI.
+
+Každý snapshot z logu sa interpoluje do 3D mriežky (práca je rozdelená do
+procesov), výsledok sa uloží ako komprimovaný `volume.npz` s mriežkami
+float16 indexovanými časom a ako animovaný `volume.html` s časovým posuvníkom.
+Hotové časti sa priebežne ukladajú do `chunks/`, takže prerušený beh
+pokračuje s `--resume` tam, kde skončil.
+
+    python batch_render.py sensor_logs/sensor_log_2024_05_01.bin -o render/2024_05_01
+    python batch_render.py --start "2024-05-01 08:00" --end "2024-05-01 18:00" -o render/skuska --resume
+"""
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+from sensor_visualizer import PLOT_CONFIG, SensorVisualizer
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+CHUNKS_DIR = 'chunks'
+
+_visualizer: Optional[SensorVisualizer] = None
+
+
+def load_snapshots(visualizer: SensorVisualizer, sources: List[Path],
+                   start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Časy a hodnoty (snapshoty × senzory) zo zadaných logov, voliteľne obmedzené na rozsah."""
+    snapshot_log = visualizer.load_snapshots(sources).between(start, end)
+    num_sensors = len(visualizer.x_coords)
+    return (snapshot_log.timestamps, snapshot_log.values('temperature', num_sensors),
+            snapshot_log.values('humidity', num_sensors))
+
+
+def _init_worker(grid_points: int) -> None:
+    global _visualizer
+    _visualizer = SensorVisualizer()
+    # Operátor je už na disku z hlavného procesu, tu sa iba načíta
+    _visualizer.interpolation_engine(grid_points)
+
+
+def _render_chunk(chunk_index: int, values: np.ndarray, grid_points: int, path: str) -> int:
+    grids = _visualizer.interpolation_engine(grid_points).interpolate_many(values)
+    grids[:, ~_visualizer.grid(grid_points)[3]] = np.nan
+    # Zápis cez dočasný súbor, nedokončená časť sa pri --resume neberie do úvahy
+    tmp_path = path[:-len('.npz')] + '.tmp.npz'
+    np.savez_compressed(tmp_path, grids=grids.astype(np.float16))
+    os.replace(tmp_path, path)
+    return chunk_index
+
+
+def _chunk_path(output: Path, chunk_index: int) -> Path:
+    return output / CHUNKS_DIR / f'chunk_{chunk_index:05d}.npz'
+
+
+def _prepare_output(output: Path, manifest: dict, resume: bool) -> None:
+    manifest_path = output / MANIFEST_FILE
+    chunks = output / CHUNKS_DIR
+    if resume and manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            previous = json.load(file)
+        if previous != manifest:
+            raise ValueError(f"Parametre sa líšia od rozpracovaného behu v {output}, spustite bez --resume")
+        return
+    chunks.mkdir(parents=True, exist_ok=True)
+    for path in chunks.glob('chunk_*.npz'):
+        path.unlink()
+    with open(manifest_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+
+
+def render_volume(timestamps: np.ndarray, values: np.ndarray, output: Path, mode: str = 'temperature',
+                  grid_points: int = 30, chunk_size: int = 64, workers: Optional[int] = None,
+                  resume: bool = False, manifest: Optional[dict] = None,
+                  progress: Optional[Callable[[int, int], None]] = None) -> Path:
+    """Interpoluje všetky snapshoty v procesoch a zloží ich do `output/volume.npz`."""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest = dict(manifest or {}, mode=mode, grid_points=grid_points, chunk_size=chunk_size,
+                    snapshots=len(values))
+    _prepare_output(output, manifest, resume)
+
+    visualizer = SensorVisualizer()
+    # Operátor sa vypočíta raz tu a procesy ho načítajú z diskovej cache
+    visualizer.interpolation_engine(grid_points)
+
+    num_chunks = (len(values) + chunk_size - 1) // chunk_size
+    pending = [i for i in range(num_chunks) if not _chunk_path(output, i).exists()]
+    done = len(values) - sum(len(values[i * chunk_size:(i + 1) * chunk_size]) for i in pending)
+    if progress:
+        progress(done, len(values))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(grid_points,)) as pool:
+            futures = [pool.submit(_render_chunk, i, values[i * chunk_size:(i + 1) * chunk_size],
+                                   grid_points, str(_chunk_path(output, i)))
+                       for i in pending]
+            for future in as_completed(futures):
+                chunk_index = future.result()
+                done += len(values[chunk_index * chunk_size:(chunk_index + 1) * chunk_size])
+                if progress:
+                    progress(done, len(values))
+
+    grids = np.empty((len(values),) + (grid_points,) * 3, dtype=np.float16)
+    for i in range(num_chunks):
+        with np.load(_chunk_path(output, i)) as chunk:
+            grids[i * chunk_size:(i + 1) * chunk_size] = chunk['grids']
+
+    xi, yi, zi = visualizer.grid_axes(grid_points)
+    volume_path = output / 'volume.npz'
+    np.savez_compressed(volume_path, timestamps=timestamps, grids=grids, values=values,
+                        x=xi, y=yi, z=zi, mode=mode)
+    return volume_path
+
+
+def write_animation(path: Path, timestamps: np.ndarray, temperature: np.ndarray, humidity: np.ndarray,
+                    mode: str = 'temperature', grid_points: int = 20, max_frames: int = 200) -> Path:
+    """Animovaný 3D graf s posuvníkom; mriežka a počet snímok sú menšie ako v .npz kvôli veľkosti HTML."""
+    visualizer = SensorVisualizer()
+    values = temperature if mode == 'temperature' else humidity
+    frame_indices = np.unique(np.linspace(0, len(values) - 1, min(max_frames, len(values))).astype(int))
+    labels = [str(timestamp).replace('T', ' ') for timestamp in timestamps[frame_indices]]
+
+    first = pd.DataFrame({'temperature': temperature[frame_indices[0]],
+                          'humidity': humidity[frame_indices[0]]})
+    fig = go.Figure()
+    fig.add_trace(visualizer.volume_trace(visualizer.interpolate_grid(values[frame_indices[0]], grid_points),
+                                          mode, grid_points))
+    visualizer.add_room_traces(fig, first)
+    visualizer.apply_layout(fig, PLOT_CONFIG[mode]['title'])
+
+    # Snímky menia iba hodnoty objemu (stopa 0), súradnice mriežky sú v prvej stope;
+    # float32 sa v HTML kóduje ako binárne pole s polovičnou veľkosťou
+    fig.frames = [go.Frame(data=[go.Volume(value=visualizer.interpolate_grid(values[i], grid_points)
+                                           .astype(np.float32).flatten())],
+                           traces=[0], name=label)
+                  for i, label in zip(frame_indices, labels)]
+    animation = dict(mode='immediate', frame=dict(duration=300, redraw=True), transition=dict(duration=0))
+    fig.update_layout(
+        updatemenus=[dict(type='buttons', showactive=False, x=0.05, y=0.05, buttons=[
+            dict(label='▶', method='animate', args=[None, dict(animation, fromcurrent=True)]),
+            dict(label='❚❚', method='animate', args=[[None], dict(animation, frame=dict(duration=0))])
+        ])],
+        sliders=[dict(active=0, x=0.15, len=0.8, currentvalue=dict(prefix='Čas: '), steps=[
+            dict(label=label, method='animate', args=[[label], animation]) for label in labels
+        ])]
+    )
+    fig.write_html(str(path))
+    return path
+
+
+def _print_progress(started: float):
+    # Rýchlosť sa počíta iba z tohto behu, nie z častí hotových pred --resume
+    initial = []
+
+    def report(done: int, total: int) -> None:
+        if not initial:
+            initial.append(done)
+        elapsed = time.monotonic() - started
+        rate = (done - initial[0]) / elapsed if elapsed > 0 else 0.0
+        remaining = (total - done) / rate if rate > 0 else float('nan')
+        print(f"\r{done}/{total} snapshotov ({100 * done / max(total, 1):.0f} %), "
+              f"{rate:.1f}/s, zostáva ~{remaining:.0f} s", end='', file=sys.stderr, flush=True)
+    return report
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dávkové vykreslenie snapshotov do .npz a animovaného HTML")
+    parser.add_argument('logs', nargs='*', type=Path, help="denné súbory logu (.csv, .bin, aj .gz/.zst) alebo databáza .sqlite")
+    parser.add_argument('--start', type=datetime.fromisoformat, help="začiatok rozsahu, napr. '2024-05-01 08:00'")
+    parser.add_argument('--end', type=datetime.fromisoformat, help="koniec rozsahu")
+    parser.add_argument('--config', default='config.ini', help="config.ini pre nájdenie logov podľa rozsahu")
+    parser.add_argument('-o', '--output', type=Path, required=True, help="výstupný adresár")
+    parser.add_argument('--mode', choices=sorted(PLOT_CONFIG), default='temperature')
+    parser.add_argument('--grid', type=int, default=30, help="body mriežky na os v .npz")
+    parser.add_argument('--html-grid', type=int, default=20, help="body mriežky na os v HTML")
+    parser.add_argument('--max-frames', type=int, default=200, help="najviac snímok v HTML")
+    parser.add_argument('--chunk-size', type=int, default=64, help="snapshoty v jednej časti (checkpointe)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--resume', action='store_true', help="pokračovať v rozpracovanom behu")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    sources = list(args.logs)
+    if not sources:
+        if args.start is None or args.end is None:
+            parser.error("zadajte súbory logu alebo --start a --end")
+        from sensor_manager import Config
+        from sensor_logger import LogFormat, SensorLogger
+
+        config = Config(args.config)
+        log_format = LogFormat(config.config.get('Logging', 'log_format', fallback='csv'))
+        sensor_logger = SensorLogger(config.config.get('Logging', 'log_path', fallback='sensor_logs'), log_format)
+        sources = sensor_logger.existing_log_files(args.start, args.end)
+    sources = [path.resolve() for path in sources]
+
+    visualizer = SensorVisualizer()
+    timestamps, temperature, humidity = load_snapshots(visualizer, sources, args.start, args.end)
+    if len(timestamps) == 0:
+        print("Žiadne snapshoty na vykreslenie.", file=sys.stderr)
+        return 1
+    values = temperature if args.mode == 'temperature' else humidity
+
+    manifest = {'sources': [str(path) for path in sources],
+                'start': args.start.isoformat() if args.start else None,
+                'end': args.end.isoformat() if args.end else None}
+    try:
+        volume_path = render_volume(timestamps, values, args.output, args.mode, args.grid, args.chunk_size,
+                                    args.workers, args.resume, manifest, _print_progress(time.monotonic()))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    html_path = write_animation(args.output / 'volume.html', timestamps, temperature, humidity,
+                                args.mode, args.html_grid, args.max_frames)
+    print(volume_path)
+    print(html_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
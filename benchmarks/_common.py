@@ -0,0 +1,48 @@
+"""Spoločné pomôcky pre benchmarky (spúšťajú sa z koreňa repozitára)."""
+import configparser
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sensor_manager import Config  # noqa: E402
+
+
+def make_config(directory, log_format='csv', buses=None, sensors_per_slave=5, **logging_options):
+    """Zapíše dočasný config.ini s topológiou `buses` = {číslo: [adresy]} a vráti Config."""
+    buses = buses or {1: [8, 9]}
+    parser = configparser.ConfigParser()
+    parser['Sensors'] = {
+        'num_sensors': str(sum(len(addresses) for addresses in buses.values()) * sensors_per_slave),
+        'min_temp': '-15.0', 'max_temp': '50.0', 'min_humidity': '0', 'max_humidity': '100'
+    }
+    parser['Logging'] = {'log_format': log_format, 'log_path': str(Path(directory) / 'logs'),
+                         **{key: str(value) for key, value in logging_options.items()}}
+    parser['Acquisition'] = {'period': '5.0', 'simulate': 'true'}
+    for number, addresses in buses.items():
+        parser[f'Bus {number}'] = {'addresses': ', '.join(map(str, addresses)),
+                                   'sensors_per_slave': str(sensors_per_slave)}
+    config_file = Path(directory) / 'config.ini'
+    with open(config_file, 'w') as file:
+        parser.write(file)
+    return Config(str(config_file))
+
+
+def measure(function, repeat):
+    """Časy jednotlivých volaní v sekundách."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarize(times):
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"priemer {statistics.mean(times) * 1e3:9.2f} ms   p95 {p95 * 1e3:9.2f} ms"
@@ -0,0 +1,72 @@
+"""Studený štart vykreslenia jedného snapshotu z príkazového riadku (nový proces pri každom behu).
+
+Meria import `sensor_visualizer` a celý beh `sensor_visualizer.py LOG --at ...`
+pre výstupy npz, json a html nad denným súborom so 100 000 riadkami.
+Operátor interpolácie je už v diskovej cache (prvý beh sa nemeria).
+
+    python benchmarks/bench_cold_start.py [--repeat 5] [--formats csv bin]
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import ROOT, make_config, summarize
+from bench_history import DAY, write_day_file
+from sensor_logger import LogFormat, SensorLogger
+
+HEAVY_MODULES = ('pandas', 'scipy', 'plotly')
+
+
+def timed_run(args, cwd):
+    """Trvanie celého procesu v sekundách vrátane štartu interpretera."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=cwd, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def import_time(cwd):
+    code = (f"import sys, time; sys.path.insert(0, {str(ROOT)!r}); start = time.perf_counter(); "
+            "import sensor_visualizer; elapsed = time.perf_counter() - start; "
+            f"print(elapsed, ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True)
+    elapsed, loaded = (result.stdout.strip().split(' ') + [''])[:2]
+    return float(elapsed), loaded or '-'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--formats', nargs='+', default=['csv', 'bin'])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        times = []
+        loaded = '-'
+        for _ in range(args.repeat):
+            elapsed, loaded = import_time(directory)
+            times.append(elapsed)
+        print(f"import sensor_visualizer: {summarize(times)}   ťažké moduly: {loaded}")
+
+        at = DAY.replace(hour=12).isoformat(sep=' ')
+        script = str(ROOT / 'sensor_visualizer.py')
+        for log_format in args.formats:
+            (Path(directory) / log_format).mkdir()
+            config = make_config(Path(directory) / log_format, log_format, {1: [8, 9, 10, 11]})
+            sensor_logger = SensorLogger(config.config['Logging']['log_path'], LogFormat(log_format))
+            log_path = sensor_logger._get_log_file_path(DAY)
+            write_day_file(log_path, log_format, args.rows)
+            print(f"{log_format}, {args.rows} riadkov")
+            for output_format in ('npz', 'json', 'html'):
+                command = [script, str(log_path), '--at', at, '-o', str(Path(directory) / f'out.{output_format}')]
+                # Prvý beh vytvorí index logu a operátor interpolácie
+                timed_run(command, directory)
+                times = [timed_run(command, directory) for _ in range(args.repeat)]
+                print(f"  {output_format:<4} {summarize(times)}")
+
+
+if __name__ == '__main__':
+    main()
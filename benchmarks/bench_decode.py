@@ -0,0 +1,91 @@
+"""Mikrobenchmark dekódovania rámcov: pôvodný postup po senzoroch vs. dávkový FrameDecoder.
+
+Dávkový FrameDecoder sa meria s pôvodným rámcom (verzia 0) aj s rámcom
+verzie 1 (hlavička, stav senzora, CRC-8).
+
+Spustenie z koreňa repozitára:
+    python benchmarks/bench_decode.py [počet_slave ...]
+"""
+import random
+import struct
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from frame_decoder import FrameDecoder, build_frame  # noqa: E402
+
+
+def make_frames(num_slaves):
+    frames = []
+    for _ in range(num_slaves):
+        values = []
+        for _ in range(5):
+            if random.random() < 0.02:
+                values += [-999, -999]
+            else:
+                values += [random.randint(1500, 3000), random.randint(3000, 6000)]
+        frames.append(list(struct.pack('<10h', *values)))
+    return frames
+
+
+def to_v1(frames):
+    # Rovnaké hodnoty v rámci verzie 1
+    converted = []
+    for sequence, frame in enumerate(frames):
+        values = struct.unpack('<10h', bytes(frame))
+        statuses = [1 if value == -999 else 0 for value in values[::2]]
+        converted.append(list(build_frame(sequence, values[::2], values[1::2], statuses)))
+    return converted
+
+
+def legacy_decode(addresses, frames):
+    # Pôvodný postup z generate_sensor_data (bez zápisu do logu)
+    data = []
+    for slave_addr, raw_data in zip(addresses, frames):
+        for i in range(5):
+            temp = struct.unpack('h', bytes(raw_data[i * 4:i * 4 + 2]))[0]
+            hum = struct.unpack('h', bytes(raw_data[i * 4 + 2:i * 4 + 4]))[0]
+            temperature, humidity = temp / 100.0, hum / 100.0
+            if 0 <= humidity <= 100 and -50 <= temperature <= 100:
+                data.append({
+                    'Sensor': f"Sensor_{slave_addr}_{i + 1}",
+                    'Temperature': temperature,
+                    'Humidity': humidity,
+                    'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                })
+    return data
+
+
+def batch_decode(decoder, frames):
+    sweep = decoder.decode(frames)
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    temperatures = sweep.temperature.tolist()
+    humidities = sweep.humidity.tolist()
+    return [{'Sensor': sensor_id, 'Temperature': temperatures[i], 'Humidity': humidities[i],
+             'Timestamp': timestamp}
+            for i, sensor_id in enumerate(sweep.sensor_ids) if sweep.valid[i]]
+
+
+def main(argv=None):
+    sizes = [int(arg) for arg in (sys.argv[1:] if argv is None else argv)] or [2, 10, 100, 500]
+    print(f"{'slave':>6} {'senzory':>8} {'pôvodný [µs]':>14} {'dávkový [µs]':>14} {'zrýchlenie':>11} "
+          f"{'v1+CRC [µs]':>12}")
+    for num_slaves in sizes:
+        addresses = list(range(8, 8 + num_slaves))
+        frames = make_frames(num_slaves)
+        frames_v1 = to_v1(frames)
+        decoder = FrameDecoder(addresses, frame_versions=0)
+        decoder_v1 = FrameDecoder(addresses)
+        repeat = max(20, 20000 // num_slaves)
+        legacy = min(timeit.repeat(lambda: legacy_decode(addresses, frames), number=repeat, repeat=3)) / repeat
+        batch = min(timeit.repeat(lambda: batch_decode(decoder, frames), number=repeat, repeat=3)) / repeat
+        batch_v1 = min(timeit.repeat(lambda: batch_decode(decoder_v1, frames_v1), number=repeat, repeat=3)) / repeat
+        print(f"{num_slaves:>6} {num_slaves * 5:>8} {legacy * 1e6:>14.1f} {batch * 1e6:>14.1f} "
+              f"{legacy / batch:>10.1f}x {batch_v1 * 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
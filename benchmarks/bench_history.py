@@ -0,0 +1,96 @@
+"""Latencia /historical_data nad denným súborom s 10^5 až 10^7 riadkami.
+
+    python benchmarks/bench_history.py [--rows 100000 1000000] [--formats csv bin]
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from flask import Flask
+
+from _common import make_config, measure, summarize
+from acquisition import AcquisitionLoop
+from routes import create_routes
+from sensor_logger import BINARY_DTYPE, save_sensor_ids
+from sensor_manager import SensorDataManager
+from sim_bus import simulated_buses
+
+DAY = datetime(2026, 1, 1)
+SENSOR_IDS = [f"Sensor_{address}_{i + 1}" for address in range(8, 12) for i in range(5)]
+
+
+def write_day_file(path, log_format, rows):
+    """Rýchlo vygeneruje denný súbor s `rows` meraniami rovnomerne cez celý deň."""
+    start = int(DAY.timestamp())
+    epochs = start + (np.arange(rows) // len(SENSOR_IDS)) * 86400 * len(SENSOR_IDS) // max(rows, 1)
+    sensors = np.arange(rows) % len(SENSOR_IDS)
+    temperatures = 2150 + (np.arange(rows) % 300)
+    if log_format == 'bin':
+        records = np.empty(rows, dtype=BINARY_DTYPE)
+        records['timestamp'] = epochs
+        records['sensor'] = sensors
+        records['temperature'] = temperatures
+        records['humidity'] = 4520
+        records.tofile(path)
+        save_sensor_ids(path.parent, SENSOR_IDS)
+        return
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        file.write('timestamp;sensor_id;temperature;humidity\r\n')
+        chunk = 200000
+        for offset in range(0, rows, chunk):
+            lines = []
+            for epoch, sensor, temperature in zip(epochs[offset:offset + chunk].tolist(),
+                                                  sensors[offset:offset + chunk].tolist(),
+                                                  temperatures[offset:offset + chunk].tolist()):
+                lines.append(f"{datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S')};"
+                             f"{SENSOR_IDS[sensor]};{temperature / 100};45.2\r\n")
+            file.write(''.join(lines))
+
+
+def run(log_format, rows, repeat):
+    with tempfile.TemporaryDirectory() as directory:
+        config = make_config(directory, log_format, {1: [8, 9, 10, 11]})
+        manager = SensorDataManager(config, simulated_buses([1]))
+        write_day_file(manager.logger._get_log_file_path(DAY), log_format, rows)
+
+        app = Flask(__name__)
+        app.register_blueprint(create_routes(manager, AcquisitionLoop(manager)))
+        client = app.test_client()
+
+        def get(url):
+            return lambda: client.get(url).get_data()
+
+        day_url = f"/historical_data?date={DAY.strftime('%Y-%m-%d')}"
+        range_url = "/historical_data?start=2026-01-01T14:00&end=2026-01-01T15:00&sensor_id=Sensor_9_3"
+        start = time.perf_counter()
+        get(range_url)()  # prvý dotaz vytvorí riedky index
+        first = time.perf_counter() - start
+        results = {
+            'celý deň': measure(get(day_url), max(1, repeat // 5)),
+            'celý deň gzip': measure(lambda: client.get(day_url, headers={'Accept-Encoding': 'gzip'}).get_data(),
+                                     max(1, repeat // 5)),
+            '1 h, 1 senzor': measure(get(range_url), repeat)
+        }
+        manager.close()
+        return first, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--formats', nargs='+', default=['csv', 'bin'])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    for log_format in args.formats:
+        for rows in args.rows:
+            first, results = run(log_format, rows, args.repeat)
+            print(f"/historical_data {log_format}, {rows} riadkov (prvý dotaz s indexom {first * 1e3:.1f} ms)")
+            for name, times in results.items():
+                print(f"  {name:>14}: {summarize(times)}")
+
+
+if __name__ == '__main__':
+    main()
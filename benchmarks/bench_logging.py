@@ -0,0 +1,45 @@
+"""Počet uložených meraní za sekundu pre jednotlivé formáty logu a režimy zápisu.
+
+    python benchmarks/bench_logging.py [--readings 20000]
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from _common import ROOT  # noqa: F401  (nastaví sys.path)
+from sensor_logger import LogFormat, SensorLogger, SensorReading
+
+
+def run(log_format, buffer_size, readings):
+    start_time = datetime(2026, 1, 1)
+    batch = [SensorReading(f"Sensor_{8 + i % 20 // 5}_{i % 5 + 1}", 21.5, 45.0,
+                           start_time + timedelta(seconds=i // 20 * 5))
+             for i in range(readings)]
+    with tempfile.TemporaryDirectory() as directory:
+        sensor_logger = SensorLogger(directory, log_format, buffer_size=buffer_size, flush_interval=60)
+        start = time.perf_counter()
+        for reading in batch:
+            sensor_logger.save_reading(reading)
+        sensor_logger.close()
+        return readings / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readings', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(f"Zápis {args.readings} meraní")
+    for log_format in (LogFormat.CSV, LogFormat.JSONL, LogFormat.BINARY, LogFormat.SQLITE, LogFormat.JSON):
+        # Pôvodný JSON prepisuje celý súbor pri každom meraní (O(n^2)), preto menšia vzorka
+        readings = min(args.readings, 2000) if log_format == LogFormat.JSON else args.readings
+        modes = [0] if log_format == LogFormat.JSON else [0, 100]
+        for buffer_size in modes:
+            rate = run(log_format, buffer_size, readings)
+            mode = f"dávka {buffer_size}" if buffer_size else "po jednom"
+            print(f"  {log_format.value:>6} {mode:>10}: {rate:12.0f} meraní/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Prehrávanie denného CSV logu cez SensorDataManager: maximálna rýchlosť a presnosť tempa.
+
+Pri maximálnej rýchlosti sa log prepočíta do cieľových formátov (s agregátmi),
+pri zrýchlenom tempe sa porovná skutočné trvanie s očakávaným.
+
+    python benchmarks/bench_replay.py [--rows 100000] [--targets csv bin sqlite] [--speed 1000]
+"""
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from _common import make_config
+from bench_history import DAY, write_day_file
+from replay import LogReplay
+from sensor_logger import LogFormat, SensorLogger
+from sensor_manager import SensorDataManager
+
+
+def replay_all(source, config, speed=None, end=None):
+    replay = LogReplay(SensorLogger(source, LogFormat.CSV), end=end, speed=speed)
+    manager = SensorDataManager(config, replay)
+    readings = 0
+    start = time.perf_counter()
+    first = last = None
+    while True:
+        try:
+            readings += len(manager.generate_sensor_data())
+        except StopIteration:
+            break
+        last = time.perf_counter()
+        first = first or last
+    manager.close()
+    # Celkové trvanie a čas od prvého po posledný zber (tempo, bez čítania dňa a zatvorenia)
+    return replay.sweeps, readings, time.perf_counter() - start, last - first
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--targets', nargs='+', default=['csv', 'jsonl', 'bin', 'sqlite'])
+    parser.add_argument('--speed', type=float, default=1000.0)
+    parser.add_argument('--sweeps', type=int, default=100, help="počet zberov pri meraní tempa")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / 'source'
+        source.mkdir()
+        write_day_file(SensorLogger(str(source), LogFormat.CSV)._get_log_file_path(DAY), 'csv', args.rows)
+        print(f"zdroj csv, {args.rows} riadkov")
+
+        for target in args.targets:
+            (Path(directory) / target).mkdir()
+            config = make_config(Path(directory) / target, target, {1: [8, 9, 10, 11]},
+                                 buffer_size=5000, rollups='true')
+            sweeps, readings, elapsed, _ = replay_all(str(source), config)
+            print(f"  max -> {target:<6} {elapsed:7.2f} s  {sweeps / elapsed:8.0f} zberov/s  "
+                  f"{readings / elapsed:9.0f} meraní/s")
+
+        (Path(directory) / 'paced').mkdir()
+        config = make_config(Path(directory) / 'paced', 'csv', {1: [8, 9, 10, 11]})
+        # Zbery v generovanom logu sú rovnomerne rozložené cez deň
+        interval = 86400 / (args.rows // 20)
+        end = DAY + timedelta(seconds=interval * (args.sweeps - 1))
+        sweeps, _, _, elapsed = replay_all(str(source), config, speed=args.speed, end=end)
+        expected = (sweeps - 1) * interval / args.speed
+        print(f"  ×{args.speed:g}: {sweeps} zberov za {elapsed:.2f} s (očakávané {expected:.2f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Čítanie posledného snapshotu zo zdieľanej pamäte v jednom a viacerých procesoch.
+
+Meria zápis snapshotu (proces zberu), čítanie v procese webu a priepustnosť
+odpovede /get_sensor_data (snapshot -> JSON) pri 1, 2, 4 ... procesoch.
+
+    python benchmarks/bench_serving.py [--sensors 20] [--seconds 2]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from _common import ROOT  # noqa: F401  (nastaví sys.path)
+from acquisition import Snapshot
+from shared_snapshot import SharedSnapshotReader, SharedSnapshotWriter
+
+SEGMENT = f'bench_snapshot_{os.getpid()}'
+
+
+def make_snapshot(sensor_ids, sequence):
+    return Snapshot.from_data(sequence, [{'Sensor': sensor_id, 'Temperature': 21.5 + i / 100,
+                                          'Humidity': 45.0, 'Timestamp': '2026-01-01 12:00:00'}
+                                         for i, sensor_id in enumerate(sensor_ids)])
+
+
+def _serve(sensor_ids, seconds, results):
+    reader = SharedSnapshotReader(SEGMENT, sensor_ids)
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        json.dumps(reader.latest().to_list())
+        count += 1
+    reader.stop()
+    results.put(count)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sensors', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    sensor_ids = [f"Sensor_{8 + i // 5}_{i % 5 + 1}" for i in range(args.sensors)]
+    writer = SharedSnapshotWriter(SEGMENT, sensor_ids)
+    try:
+        snapshots = [make_snapshot(sensor_ids, sequence) for sequence in range(1, 1001)]
+        start = time.perf_counter()
+        for snapshot in snapshots:
+            writer.publish(snapshot)
+        print(f"Zápis snapshotu:          {(time.perf_counter() - start) / len(snapshots) * 1e6:8.1f} µs")
+
+        reader = SharedSnapshotReader(SEGMENT, sensor_ids)
+        start = time.perf_counter()
+        for _ in range(10000):
+            reader.latest()
+        print(f"latest() bez zmeny:       {(time.perf_counter() - start) / 10000 * 1e6:8.2f} µs")
+        start = time.perf_counter()
+        for snapshot in snapshots:
+            writer.publish(snapshot)
+            reader.latest()
+        print(f"zápis + nové čítanie:     {(time.perf_counter() - start) / len(snapshots) * 1e6:8.1f} µs")
+        reader.stop()
+
+        print(f"Odpovede /get_sensor_data za sekundu ({args.sensors} senzorov):")
+        context = multiprocessing.get_context('fork' if os.name == 'posix' else 'spawn')
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            results = context.Queue()
+            processes = [context.Process(target=_serve, args=(sensor_ids, args.seconds, results))
+                         for _ in range(workers)]
+            for process in processes:
+                process.start()
+            total = sum(results.get() for _ in processes)
+            for process in processes:
+                process.join()
+            print(f"  {workers:>3} procesov: {total / args.seconds:12.0f}")
+            workers *= 2
+    finally:
+        writer.close()
+        SharedSnapshotWriter.unlink(SEGMENT)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Latencia jedného zberu (čítanie zberníc + dekódovanie + zápis do logu) so simulovanou zbernicou.
+
+    python benchmarks/bench_sweep.py [--latency 0.001] [--repeat 20]
+"""
+import argparse
+import tempfile
+
+from _common import make_config, measure, summarize
+from sensor_manager import SensorDataManager
+from sim_bus import simulated_buses
+
+
+def run(num_slaves, num_buses, latency, repeat, error_rate=0.0):
+    addresses = list(range(8, 8 + num_slaves))
+    buses = {number + 1: addresses[number::num_buses] for number in range(num_buses)}
+    with tempfile.TemporaryDirectory() as directory:
+        config = make_config(directory, 'csv', buses, buffer_size=1000)
+        sim = simulated_buses(buses, latency=latency, error_rate=error_rate, seed=1)
+        manager = SensorDataManager(config, sim)
+        try:
+            manager.generate_sensor_data()  # zahriatie (otvorenie súborov, vlákna)
+            return measure(manager.generate_sensor_data, repeat)
+        finally:
+            manager.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.001, help="oneskorenie jedného čítania slave [s]")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"Zber, oneskorenie čítania {args.latency * 1e3:.1f} ms")
+    for num_slaves, num_buses in [(2, 1), (20, 1), (20, 4), (100, 1), (100, 4), (100, 8)]:
+        times = run(num_slaves, num_buses, args.latency, args.repeat)
+        print(f"  {num_slaves:>4} slave / {num_buses} zbernice: {summarize(times)}")
+
+
+if __name__ == '__main__':
+    main()
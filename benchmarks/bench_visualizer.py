@@ -0,0 +1,43 @@
+"""Čas vykreslenia jedného snapshotu v SensorVisualizer (interpolácia + zostavenie grafu).
+
+    python benchmarks/bench_visualizer.py [--repeat 3]
+"""
+import argparse
+
+import numpy as np
+
+from _common import measure, summarize
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    try:
+        from sensor_visualizer import SensorVisualizer
+    except ImportError as e:
+        print(f"Vizualizácia preskočená, chýba závislosť: {e}")
+        return
+    import pandas as pd
+
+    visualizer = SensorVisualizer()
+    rng = np.random.default_rng(1)
+    data = pd.DataFrame({'temperature': 22 + rng.normal(0, 1.5, 20),
+                         'humidity': 45 + rng.normal(0, 5, 20)})
+
+    print("Vizualizácia 20 senzorov")
+    # figure_3d je plot_3d bez otvárania prehliadača
+    print(f"  plot_3d (teplota): {summarize(measure(lambda: visualizer.figure_3d(data, 'temperature'), args.repeat))}")
+    # Úrovne detailu: interpolácia samotná a celý graf pre každé rozlíšenie
+    from interpolation import LOD_LEVELS
+    values = data['temperature'].to_numpy()
+    for grid_points in LOD_LEVELS:
+        visualizer.interpolation_engine(grid_points)
+        interpolate = summarize(measure(lambda: visualizer.interpolate_grid(values, grid_points), args.repeat))
+        figure = summarize(measure(lambda: visualizer.figure_3d(data, 'temperature', grid_points), args.repeat))
+        print(f"  {grid_points:>2}³ interpolácia: {interpolate}   graf: {figure}")
+
+
+if __name__ == '__main__':
+    main()
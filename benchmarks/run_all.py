@@ -0,0 +1,24 @@
+"""Spustí všetky benchmarky s predvolenými parametrami.
+
+    python benchmarks/run_all.py
+"""
+import bench_cold_start
+import bench_decode
+import bench_history
+import bench_logging
+import bench_replay
+import bench_serving
+import bench_sweep
+import bench_visualizer
+
+
+def main():
+    for module in (bench_decode, bench_sweep, bench_logging, bench_history, bench_serving, bench_visualizer,
+                   bench_cold_start, bench_replay):
+        print(f"== {module.__name__} ==")
+        module.main([])
+        print()
+
+
+if __name__ == '__main__':
+    main()
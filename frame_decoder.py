@@ -0,0 +1,211 @@
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from metrics import I2C_FRAME_ERRORS, I2C_FRAMES_UNCHANGED
+
+logger = logging.getLogger(__name__)
+
+# Kód, ktorý firmvér slave posiela namiesto hodnoty pri chybe DHT22 (NaN)
+ERROR_SENTINEL = -999
+SENSORS_PER_SLAVE = 5
+
+# Rámec verzie 1: verzia, počet senzorov, poradové číslo (uint16), bloky senzorov, CRC-8.
+# Verzia 0 je pôvodný rámec bez hlavičky (iba teplota a vlhkosť int16 na senzor).
+FRAME_VERSION = 1
+FRAME_HEADER_SIZE = 4
+SENSOR_BLOCK_SIZE = 5
+
+# Stav senzora v rámci verzie 1
+STATUS_OK = 0
+STATUS_READ_ERROR = 1
+STATUS_NO_DATA = 2
+
+# Fyzický rozsah senzora v stotinách (rovnaký ako SensorReading.validate). Limity
+# z [Sensors] sú prahy alarmov, meranie mimo nich je platné a zapisuje sa.
+TEMPERATURE_RANGE = (-5000, 10000)
+HUMIDITY_RANGE = (0, 10000)
+
+_SENSOR_DTYPE = np.dtype([('temperature', '<i2'), ('humidity', '<i2'), ('status', 'u1')])
+
+
+def _crc8_entry(value: int) -> int:
+    for _ in range(8):
+        value = ((value << 1) ^ 0x07) & 0xFF if value & 0x80 else (value << 1) & 0xFF
+    return value
+
+
+_CRC8_TABLE = bytes(_crc8_entry(value) for value in range(256))
+
+
+def crc8(data: bytes) -> int:
+    """CRC-8 s polynómom 0x07 (rovnaký ako SMBus PEC), rovnako ako `crc8` vo firmvéri."""
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def frame_size(sensors: int, version: int = FRAME_VERSION) -> int:
+    """Dĺžka rámca v bajtoch; SMBus prečíta najviac 32, pri verzii 1 teda najviac 5 senzorov."""
+    if version == 0:
+        return sensors * 4
+    return FRAME_HEADER_SIZE + sensors * SENSOR_BLOCK_SIZE + 1
+
+
+def build_frame(sequence: int, temperatures: Sequence[int], humidities: Sequence[int],
+                statuses: Sequence[int]) -> bytes:
+    """Rámec verzie 1 z hodnôt v stotinách (ako ho zostaví firmvér)."""
+    blocks = np.zeros(len(temperatures), dtype=_SENSOR_DTYPE)
+    blocks['temperature'] = temperatures
+    blocks['humidity'] = humidities
+    blocks['status'] = statuses
+    body = bytes([FRAME_VERSION, len(temperatures), sequence & 0xFF, (sequence >> 8) & 0xFF]) + blocks.tobytes()
+    return body + bytes([crc8(body)])
+
+
+@dataclass
+class DecodedSweep:
+    """Výsledok dekódovania jedného zberu, jeden prvok poľa na senzor."""
+    sensor_ids: List[str]
+    temperature: np.ndarray  # °C, NaN ak kanál nie je platný
+    humidity: np.ndarray     # %, NaN ak kanál nie je platný
+    present: np.ndarray      # slave odpovedal platným rámcom
+    sensor_error: np.ndarray  # firmvér hlási chybu DHT22 (stav alebo ERROR_SENTINEL)
+    valid: np.ndarray        # aspoň jeden kanál je platný
+    fresh: np.ndarray        # nové meranie (iné poradové číslo rámca ako v minulom zbere)
+    temperature_valid: np.ndarray  # teplota bez chyby a vo fyzickom rozsahu senzora
+    humidity_valid: np.ndarray     # vlhkosť bez chyby a vo fyzickom rozsahu senzora
+
+
+class FrameDecoder:
+    """Dávkové dekódovanie rámcov zo všetkých slave zariadení naraz.
+
+    Rámec verzie 1 má hlavičku (verzia, počet senzorov, poradové číslo),
+    pre každý senzor teplotu a vlhkosť v stotinách (int16, little-endian)
+    a stav, na konci CRC-8. Rámec s chybným CRC, inou verziou alebo počtom
+    senzorov sa zahodí, akoby slave neodpovedal. Ak má rámec rovnaké
+    poradové číslo ako v predchádzajúcom zbere, slave odvtedy nemeral
+    a merania sa označia ako nie `fresh`. Verzia 0 je pôvodný rámec bez
+    hlavičky. Počet senzorov aj verzia môžu byť pre každý slave iné.
+    Identifikátory senzorov sa vytvoria raz pri inicializácii.
+
+    Teplota a vlhkosť sa posudzujú zvlášť: kanál je platný, ak nie je
+    ERROR_SENTINEL a je vo fyzickom rozsahu senzora, takže chybná vlhkosť
+    nezahodí dobrú teplotu. Limity alarmov tu nehrajú rolu (`AlarmEngine`).
+    """
+
+    def __init__(self, addresses: Sequence[int],
+                 sensors_per_slave: Union[int, Sequence[int]] = SENSORS_PER_SLAVE,
+                 frame_versions: Union[int, Sequence[int]] = FRAME_VERSION):
+        self.addresses = list(addresses)
+        if isinstance(sensors_per_slave, int):
+            sensors_per_slave = [sensors_per_slave] * len(self.addresses)
+        if isinstance(frame_versions, int):
+            frame_versions = [frame_versions] * len(self.addresses)
+        self.sensor_counts = np.array(sensors_per_slave, dtype=int)
+        self.frame_versions = list(frame_versions)
+        self.frame_sizes = [frame_size(count, version)
+                            for count, version in zip(sensors_per_slave, self.frame_versions)]
+        self.sensor_ids = [f"Sensor_{address}_{i + 1}"
+                           for address, count in zip(self.addresses, sensors_per_slave) for i in range(count)]
+        # Bloky senzorov z rámcov rovnakej verzie sa spoja do jedného buffera;
+        # pre každú verziu indexy jej senzorov v poradí sensor_ids
+        self._payload_sizes = [count * (4 if version == 0 else SENSOR_BLOCK_SIZE)
+                               for count, version in zip(sensors_per_slave, self.frame_versions)]
+        offsets = np.concatenate([[0], np.cumsum(self.sensor_counts)])
+        self._groups = {}
+        for version in sorted(set(self.frame_versions)):
+            self._groups[version] = np.concatenate(
+                [np.arange(offsets[i], offsets[i + 1]) for i, v in enumerate(self.frame_versions) if v == version]
+            ).astype(int)
+        self._last_sequence: List[Optional[int]] = [None] * len(self.addresses)
+
+    def decode(self, frames: Sequence[Optional[Sequence[int]]]) -> DecodedSweep:
+        """`frames[i]` je odpoveď slave `addresses[i]` alebo None, ak čítanie zlyhalo."""
+        payloads = {version: [] for version in self._groups}
+        ok = np.zeros(len(self.addresses), dtype=bool)
+        fresh = np.zeros(len(self.addresses), dtype=bool)
+        for i, frame in enumerate(frames):
+            version = self.frame_versions[i]
+            payload = self._check(i, frame)
+            if payload is None:
+                payloads[version].append(bytes(self._payload_sizes[i]))
+                continue
+            payloads[version].append(payload)
+            ok[i] = True
+            if version == 0:
+                fresh[i] = True
+            else:
+                sequence = frame[2] | (frame[3] << 8)
+                fresh[i] = sequence != self._last_sequence[i]
+                if not fresh[i]:
+                    I2C_FRAMES_UNCHANGED.inc(address=self.addresses[i])
+                self._last_sequence[i] = sequence
+
+        if len(self._groups) == 1:
+            temperature, humidity, status = self._unpack(*payloads.popitem())
+        else:
+            count = len(self.sensor_ids)
+            temperature = np.empty(count, dtype='<i2')
+            humidity = np.empty(count, dtype='<i2')
+            status = np.empty(count, dtype='u1')
+            for version, indices in self._groups.items():
+                temperature[indices], humidity[indices], status[indices] = self._unpack(version, payloads[version])
+        present = np.repeat(ok, self.sensor_counts) & (status != STATUS_NO_DATA)
+        sensor_error = present & ((status == STATUS_READ_ERROR) |
+                                  (temperature == ERROR_SENTINEL) | (humidity == ERROR_SENTINEL))
+
+        # Každý kanál zvlášť, porovnáva sa priamo s celými číslami z rámca
+        readable = present & (status != STATUS_READ_ERROR)
+        temperature_valid = (readable & (temperature != ERROR_SENTINEL) &
+                             (temperature >= TEMPERATURE_RANGE[0]) & (temperature <= TEMPERATURE_RANGE[1]))
+        humidity_valid = (readable & (humidity != ERROR_SENTINEL) &
+                          (humidity >= HUMIDITY_RANGE[0]) & (humidity <= HUMIDITY_RANGE[1]))
+
+        return DecodedSweep(
+            sensor_ids=self.sensor_ids,
+            temperature=np.where(temperature_valid, temperature / 100.0, np.nan),
+            humidity=np.where(humidity_valid, humidity / 100.0, np.nan),
+            present=present,
+            sensor_error=sensor_error,
+            valid=temperature_valid | humidity_valid,
+            fresh=present & np.repeat(fresh, self.sensor_counts),
+            temperature_valid=temperature_valid,
+            humidity_valid=humidity_valid
+        )
+
+    @staticmethod
+    def _unpack(version: int, payloads: List[bytes]):
+        buffer = b''.join(payloads)
+        if version == 0:
+            raw = np.frombuffer(buffer, dtype='<i2').reshape(-1, 2)
+            return raw[:, 0], raw[:, 1], np.zeros(len(raw), dtype='u1')
+        records = np.frombuffer(buffer, dtype=_SENSOR_DTYPE)
+        return records['temperature'], records['humidity'], records['status']
+
+    def _check(self, index: int, frame: Optional[Sequence[int]]) -> Optional[bytes]:
+        """Bloky senzorov z rámca, alebo None pre chýbajúci či poškodený rámec."""
+        size = self.frame_sizes[index]
+        if frame is None:
+            return None
+        if len(frame) < size:
+            self._reject(index, 'length')
+            return None
+        data = bytes(frame[:size])
+        if self.frame_versions[index] == 0:
+            return data
+        if crc8(data[:-1]) != data[-1]:
+            self._reject(index, 'crc')
+            return None
+        if data[0] != self.frame_versions[index] or data[1] != self.sensor_counts[index]:
+            self._reject(index, 'format')
+            return None
+        return data[FRAME_HEADER_SIZE:-1]
+
+    def _reject(self, index: int, reason: str) -> None:
+        address = self.addresses[index]
+        I2C_FRAME_ERRORS.inc(address=address, reason=reason)
+        logger.error(f"Neplatný rámec zo slave {address} ({reason})")
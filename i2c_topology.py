@@ -0,0 +1,195 @@
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from frame_decoder import FRAME_VERSION, SENSORS_PER_SLAVE, frame_size
+from metrics import I2C_READ_ERRORS, I2C_READ_RETRIES, I2C_READ_SECONDS, I2C_READ_TIMEOUTS
+
+logger = logging.getLogger(__name__)
+
+BUS_SECTION_PREFIX = 'Bus '
+
+
+@dataclass(frozen=True)
+class SlaveConfig:
+    bus: int
+    address: int
+    sensors: int = SENSORS_PER_SLAVE
+    frame_version: int = FRAME_VERSION
+
+    @property
+    def frame_size(self) -> int:
+        return frame_size(self.sensors, self.frame_version)
+
+
+class BusTopology:
+    """Zbernice -> adresy slave -> počet senzorov na slave, podľa config.ini.
+
+    Každá zbernica má vlastnú sekciu, napr.::
+
+        [Bus 1]
+        addresses = 8, 9
+        sensors_per_slave = 5
+        frame_version = 1
+
+    `frame_version = 0` je pôvodný firmvér bez poradového čísla a CRC.
+    """
+
+    def __init__(self, slaves: List[SlaveConfig]):
+        addresses = [slave.address for slave in slaves]
+        duplicates = sorted({address for address in addresses if addresses.count(address) > 1})
+        if duplicates:
+            # Identifikátor senzora obsahuje iba adresu, musí byť jedinečná naprieč zbernicami
+            raise ValueError(f"Adresy slave sa opakujú na viacerých zberniciach: {duplicates}")
+        self.slaves = slaves
+
+    @property
+    def buses(self) -> List[int]:
+        return sorted({slave.bus for slave in self.slaves})
+
+    @property
+    def num_sensors(self) -> int:
+        return sum(slave.sensors for slave in self.slaves)
+
+    @classmethod
+    def from_config(cls, config) -> 'BusTopology':
+        slaves = []
+        for section in config.sections():
+            if not section.startswith(BUS_SECTION_PREFIX):
+                continue
+            bus = int(section[len(BUS_SECTION_PREFIX):])
+            sensors = config.getint(section, 'sensors_per_slave', fallback=SENSORS_PER_SLAVE)
+            version = config.getint(section, 'frame_version', fallback=FRAME_VERSION)
+            for address in config.get(section, 'addresses', fallback='').split(','):
+                if address.strip():
+                    slaves.append(SlaveConfig(bus, int(address, 0), sensors, version))
+        if not slaves:
+            # Pôvodné zapojenie: jedna zbernica 1 so slave 8 a 9
+            slaves = [SlaveConfig(1, 8), SlaveConfig(1, 9)]
+
+        topology = cls(slaves)
+        expected = config.getint('Sensors', 'num_sensors', fallback=topology.num_sensors)
+        if expected != topology.num_sensors:
+            logger.warning(f"num_sensors = {expected}, ale topológia zberníc obsahuje "
+                           f"{topology.num_sensors} senzorov")
+        return topology
+
+    @classmethod
+    def single_bus(cls, addresses: List[int], bus: int = 1) -> 'BusTopology':
+        return cls([SlaveConfig(bus, address) for address in addresses])
+
+
+class _SlaveState:
+    __slots__ = ('failures', 'skip')
+
+    def __init__(self):
+        self.failures = 0
+        self.skip = 0
+
+
+class SweepScheduler:
+    """Paralelný zber cez všetky zbernice, sériovo v rámci jednej zbernice.
+
+    Každá zbernica má vlastné jednovláknové vykonávanie, takže na jednu
+    zbernicu ide vždy iba jedna transakcia. Čítanie slave má časový limit
+    `read_timeout`, pri chybe sa opakuje najviac `retries`-krát s rastúcim
+    oneskorením a slave, ktorý opakovane zlyháva, sa vynechá na 1, 2, 4 ...
+    (najviac `max_skip_cycles`) nasledujúcich zberov. Čas zberu je tak
+    ohraničený najpomalšou zbernicou, nie súčtom všetkých slave.
+    """
+
+    def __init__(self, buses: Dict[int, object], topology: BusTopology,
+                 read_timeout: float = 0.5, retries: int = 2, retry_backoff: float = 0.05,
+                 max_skip_cycles: int = 32):
+        self.buses = buses
+        self.topology = topology
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.max_skip_cycles = max_skip_cycles
+
+        self._slaves_by_bus: Dict[int, List[Tuple[int, SlaveConfig]]] = {}
+        for index, slave in enumerate(topology.slaves):
+            self._slaves_by_bus.setdefault(slave.bus, []).append((index, slave))
+        self._states = [_SlaveState() for _ in topology.slaves]
+        self._bus_executors = {bus: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'i2c-bus-{bus}')
+                               for bus in self._slaves_by_bus}
+        self._pool = ThreadPoolExecutor(max_workers=max(len(self._slaves_by_bus), 1),
+                                        thread_name_prefix='i2c-sweep')
+        # Čítanie, ktoré prekročilo časový limit a stále blokuje zbernicu
+        self._stuck: Dict[int, Future] = {}
+
+    def sweep(self) -> List[Optional[list]]:
+        """Rámce všetkých slave v poradí `topology.slaves` (None pri chybe alebo vynechaní)."""
+        frames: List[Optional[list]] = [None] * len(self.topology.slaves)
+        futures = [self._pool.submit(self._sweep_bus, bus) for bus in self._slaves_by_bus]
+        for future in futures:
+            for index, frame in future.result():
+                frames[index] = frame
+        return frames
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        for executor in self._bus_executors.values():
+            executor.shutdown(wait=False)
+
+    def _sweep_bus(self, bus_number: int) -> List[Tuple[int, list]]:
+        stuck = self._stuck.get(bus_number)
+        if stuck is not None:
+            if not stuck.done():
+                logger.error(f"Zbernica {bus_number} je stále blokovaná predchádzajúcim čítaním")
+                return []
+            del self._stuck[bus_number]
+
+        bus = self.buses[bus_number]
+        executor = self._bus_executors[bus_number]
+        results = []
+        for index, slave in self._slaves_by_bus[bus_number]:
+            state = self._states[index]
+            if state.skip > 0:
+                state.skip -= 1
+                continue
+
+            frame = None
+            for attempt in range(self.retries + 1):
+                future = executor.submit(self._timed_read, bus, slave)
+                try:
+                    frame = future.result(timeout=self.read_timeout)
+                    break
+                except FutureTimeout:
+                    # Čítanie sa nedá prerušiť, ďalšie slave na tejto zbernici by čakali za ním
+                    self._stuck[bus_number] = future
+                    I2C_READ_TIMEOUTS.inc(bus=bus_number, address=slave.address)
+                    logger.error(f"Časový limit čítania zo slave {slave.address} na zbernici {bus_number}")
+                    self._record_failure(slave, state)
+                    return results
+                except Exception as e:
+                    I2C_READ_ERRORS.inc(bus=bus_number, address=slave.address)
+                    logger.error(f"Chyba pri čítaní z adresy {slave.address} (pokus {attempt + 1}): {e}")
+                    if attempt < self.retries:
+                        I2C_READ_RETRIES.inc(bus=bus_number, address=slave.address)
+                        time.sleep(self.retry_backoff * 2 ** attempt)
+
+            if frame is None:
+                self._record_failure(slave, state)
+            else:
+                state.failures = 0
+                results.append((index, frame))
+        return results
+
+    @staticmethod
+    def _timed_read(bus, slave: SlaveConfig) -> list:
+        start = time.perf_counter()
+        try:
+            return bus.read_i2c_block_data(slave.address, 0, slave.frame_size)
+        finally:
+            I2C_READ_SECONDS.observe(time.perf_counter() - start, bus=slave.bus, address=slave.address)
+
+    def _record_failure(self, slave: SlaveConfig, state: _SlaveState) -> None:
+        state.failures += 1
+        state.skip = min(2 ** (state.failures - 1), self.max_skip_cycles)
+        if state.skip:
+            logger.warning(f"Slave {slave.address} na zbernici {slave.bus} zlyhal {state.failures}x, "
+                           f"vynecháva sa na {state.skip} zberov")
@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bázové funkcie v rovnakom tvare ako scipy.interpolate.Rbf
+RBF_FUNCTIONS = {
+    'linear': lambda r, epsilon: r,
+    'cubic': lambda r, epsilon: r ** 3,
+    'quintic': lambda r, epsilon: r ** 5,
+    'thin_plate': lambda r, epsilon: np.where(r > 0, r ** 2 * np.log(np.where(r > 0, r, 1)), 0.0),
+    'multiquadric': lambda r, epsilon: np.sqrt((r / epsilon) ** 2 + 1),
+    'inverse': lambda r, epsilon: 1.0 / np.sqrt((r / epsilon) ** 2 + 1),
+    'gaussian': lambda r, epsilon: np.exp(-(r / epsilon) ** 2)
+}
+
+GRID_CHUNK = 16384
+
+# Úrovne detailu: 2n - 1 bodov na os, uzly hrubšej mriežky sú zároveň uzlami jemnejšej,
+# takže zjemnenie nemení hodnoty v už zobrazených bodoch
+LOD_LEVELS = (15, 29, 57)
+
+
+def _distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+
+
+class RbfInterpolationEngine:
+    """RBF interpolácia s predpočítaným operátorom pre pevnú geometriu senzorov.
+
+    Interpolácia `Rbf` je lineárna v nameraných hodnotách: virtuálne body sú
+    lineárnou kombináciou senzorov (matica V), váhy uzlov sú riešením sústavy
+    s maticou A (faktorizovanou raz cez LU) a hodnoty v mriežke sú súčinom
+    vyhodnocovacej matice G s váhami. Celý reťazec sa preto zloží do jednej
+    matice ``G · A⁻¹ · V`` (body mriežky × senzory), ktorá sa uloží na disk.
+    Nový snapshot je potom jeden maticový súčin.
+    """
+
+    def __init__(self, sensor_points: np.ndarray,
+                 virtual_points: Callable[[np.ndarray, np.ndarray], tuple],
+                 grid_axes: Sequence[np.ndarray], function: str = 'quintic',
+                 epsilon: float = 0.8, smooth: float = 0.05, cache_dir: Optional[str] = 'interpolation_cache'):
+        self.sensor_points = np.asarray(sensor_points, dtype=np.float64)
+        self.grid_shape = tuple(len(axis) for axis in grid_axes)
+        self.function = function
+        self.epsilon = epsilon
+        self.smooth = smooth
+
+        num_sensors = len(self.sensor_points)
+        # Virtuálne hodnoty ako lineárna mapa: odozva na jednotkové vektory
+        self.ext_points = virtual_points(self.sensor_points, np.zeros(num_sensors))[0]
+        self.virtual_map = np.column_stack([
+            virtual_points(self.sensor_points, unit)[1] for unit in np.eye(num_sensors)
+        ])
+
+        self._grid_axes = [np.asarray(axis, dtype=np.float64) for axis in grid_axes]
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = Path(cache_dir) / f"rbf_{self._geometry_key()}.npz"
+        if cache_path is not None and cache_path.exists():
+            with np.load(cache_path) as cached:
+                self.operator = cached['operator']
+                self.lu, self.piv = cached['lu'], cached['piv']
+        else:
+            # SciPy sa načíta iba pri výpočte operátora, s cache na disku vôbec
+            from scipy.linalg import lu_factor
+            self.lu, self.piv = lu_factor(self._kernel(_distances(self.ext_points, self.ext_points))
+                                          - np.eye(len(self.ext_points)) * self.smooth)
+            self.operator = self._build_operator()
+            if cache_path is not None:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Cez dočasný súbor, súbežný proces nesmie načítať nedopísaný operátor
+                tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npz")
+                np.savez(tmp_path, operator=self.operator, lu=self.lu, piv=self.piv)
+                os.replace(tmp_path, cache_path)
+                logger.info(f"Operátor interpolácie uložený do {cache_path}")
+
+    def _kernel(self, r: np.ndarray) -> np.ndarray:
+        return RBF_FUNCTIONS[self.function](r, self.epsilon)
+
+    def _geometry_key(self) -> str:
+        digest = hashlib.sha1()
+        for array in [self.ext_points, self.virtual_map] + self._grid_axes:
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        digest.update(f"{self.function}:{self.epsilon}:{self.smooth}".encode())
+        return digest.hexdigest()[:16]
+
+    def grid_points(self) -> np.ndarray:
+        mesh = np.meshgrid(*self._grid_axes, indexing='ij')
+        return np.column_stack([axis.ravel() for axis in mesh])
+
+    def _build_operator(self) -> np.ndarray:
+        from scipy.linalg import lu_solve
+        # Váhy uzlov pre každý jednotkový vstup senzora: A⁻¹ · V
+        node_weights = lu_solve((self.lu, self.piv), self.virtual_map)
+        points = self.grid_points()
+        operator = np.empty((len(points), node_weights.shape[1]), dtype=np.float32)
+        # Po častiach, aby sa celá matica G nemusela držať v pamäti
+        for start in range(0, len(points), GRID_CHUNK):
+            chunk = points[start:start + GRID_CHUNK]
+            operator[start:start + GRID_CHUNK] = self._kernel(_distances(chunk, self.ext_points)) @ node_weights
+        return operator
+
+    def node_weights(self, values: np.ndarray) -> np.ndarray:
+        """Váhy RBF uzlov pre jeden snapshot (malá sústava s už faktorizovanou maticou)."""
+        from scipy.linalg import lu_solve
+        return lu_solve((self.lu, self.piv), self.virtual_map @ np.asarray(values, dtype=np.float64))
+
+    def interpolate(self, values: np.ndarray) -> np.ndarray:
+        """Hodnoty v mriežke pre jeden snapshot (tvar `grid_shape`)."""
+        return (self.operator @ np.asarray(values, dtype=np.float32)).reshape(self.grid_shape)
+
+    def interpolate_many(self, values: np.ndarray) -> np.ndarray:
+        """Viac snapshotov naraz, `values` má tvar (počet snapshotov, senzory)."""
+        values = np.asarray(values, dtype=np.float32)
+        return (values @ self.operator.T).reshape((len(values),) + self.grid_shape)
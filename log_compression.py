@@ -0,0 +1,101 @@
+import gzip
+import io
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd je voliteľný, predvolená kompresia je gzip zo štandardnej knižnice
+    zstandard = None
+
+# Prípona komprimovaného denného súboru podľa metódy (sensor_log_2024_05_01.csv.gz)
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def is_compressed(path: Path) -> bool:
+    return Path(path).suffix in COMPRESSION_SUFFIXES.values()
+
+
+def logical_path(path: Path) -> Path:
+    """Cesta bez prípony kompresie (`x.csv.gz` -> `x.csv`), podľa nej sa určuje formát a index."""
+    path = Path(path)
+    return path.with_suffix('') if is_compressed(path) else path
+
+
+def resolve_log_path(path: Path) -> Optional[Path]:
+    """Existujúci súbor pre cestu denného logu: nekomprimovaný, .gz alebo .zst (None, ak chýba)."""
+    path = Path(path)
+    if path.exists():
+        return path
+    for suffix in COMPRESSION_SUFFIXES.values():
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def open_log(path: Path, text: bool = False):
+    """Otvorí log na čítanie, komprimovaný sa priebežne dekomprimuje.
+
+    Textový režim používa utf-8 a `newline=''` (vhodné pre csv aj json).
+    Pozícia (`tell`, `seek`) je v nekomprimovaných bajtoch, takže offsety
+    z riedkeho indexu platia aj pre komprimovaný súbor.
+    """
+    path = Path(path)
+    if path.suffix == COMPRESSION_SUFFIXES['gzip']:
+        file = gzip.open(path, 'rb')
+    elif path.suffix == COMPRESSION_SUFFIXES['zstd']:
+        if zstandard is None:
+            raise RuntimeError(f"Súbor {path} vyžaduje balík zstandard")
+        file = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    else:
+        file = open(path, 'rb')
+    if text:
+        return io.TextIOWrapper(file, encoding='utf-8', newline='')
+    return file
+
+
+def compress_file(path: Path, method: str = 'gzip', level: Optional[int] = None) -> Path:
+    """Skomprimuje súbor do `<názov><prípona>` cez dočasný súbor; originál ostáva na mieste.
+
+    Existujúci archív sa neprepíše (FileExistsError), mohol by obsahovať
+    záznamy, ktoré v súbore nie sú.
+    """
+    path = Path(path)
+    target = path.with_name(path.name + COMPRESSION_SUFFIXES[method])
+    if target.exists():
+        raise FileExistsError(f"Archív {target} už existuje")
+    tmp_path = target.with_name(target.name + '.tmp')
+    with open(path, 'rb') as source, open(tmp_path, 'wb') as raw:
+        if method == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("Kompresia zstd vyžaduje balík zstandard")
+            compressor = zstandard.ZstdCompressor(level=level if level is not None else 10)
+            with compressor.stream_writer(raw, closefd=False) as writer:
+                shutil.copyfileobj(source, writer)
+        else:
+            # mtime=0: rovnaký obsah dáva rovnaký súbor
+            with gzip.GzipFile(filename=path.name, mode='wb', fileobj=raw,
+                               compresslevel=level if level is not None else 6, mtime=0) as writer:
+                shutil.copyfileobj(source, writer)
+        raw.flush()
+        os.fsync(raw.fileno())
+    shutil.copystat(path, tmp_path)
+    os.replace(tmp_path, target)
+    return target
+
+
+def decompress_file(path: Path) -> Path:
+    """Obnoví nekomprimovaný súbor (napr. pre neskorý zápis do uzavretého dňa) a zmaže komprimovaný."""
+    path = Path(path)
+    target = logical_path(path)
+    tmp_path = target.with_name(target.name + '.tmp')
+    with open_log(path) as source, open(tmp_path, 'wb') as file:
+        shutil.copyfileobj(source, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, target)
+    path.unlink()
+    return target
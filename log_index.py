@@ -0,0 +1,101 @@
+import bisect
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from log_compression import logical_path, open_log
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = '.idx'
+
+
+def index_path_for(log_path: Path) -> Path:
+    # Komprimovaný deň používa index pôvodného súboru (offsety sú v nekomprimovaných bajtoch)
+    log_path = logical_path(log_path)
+    return log_path.with_name(log_path.name + INDEX_SUFFIX)
+
+
+def load_index(log_path: Path) -> List[Tuple[int, int]]:
+    """Načíta riedky index (začiatok časového koša -> bajtový offset prvého riadku)."""
+    entries = []
+    idx_path = index_path_for(log_path)
+    if not idx_path.exists():
+        return entries
+    with open(idx_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) == 2:
+                entries.append((int(parts[0]), int(parts[1])))
+    return entries
+
+
+def find_offset(entries: List[Tuple[int, int]], epoch: float) -> Optional[int]:
+    """Offset koša, ktorý obsahuje `epoch` (alebo prvého koša po ňom)."""
+    if not entries:
+        return None
+    buckets = [bucket for bucket, _ in entries]
+    position = bisect.bisect_right(buckets, epoch) - 1
+    return entries[max(position, 0)][1]
+
+
+def build_index(log_path: Path, parse_timestamp: Callable[[bytes], Optional[datetime]],
+                bucket_seconds: int) -> List[Tuple[int, int]]:
+    """Vytvorí index prechodom celého súboru (pre logy bez indexu)."""
+    entries = []
+    last_bucket = None
+    offset = 0
+    with open_log(log_path) as file:
+        for line in file:
+            timestamp = parse_timestamp(line)
+            if timestamp is not None:
+                bucket = int(timestamp.timestamp()) // bucket_seconds * bucket_seconds
+                if bucket != last_bucket:
+                    entries.append((bucket, offset))
+                    last_bucket = bucket
+            offset += len(line)
+
+    with open(index_path_for(log_path), 'w', encoding='utf-8') as file:
+        for bucket, bucket_offset in entries:
+            file.write(f"{bucket} {bucket_offset}\n")
+    return entries
+
+
+class IndexWriter:
+    """Priebežne dopĺňa riedky index pri zápise riadkov do denného súboru.
+
+    Do indexu sa zapíše riadok iba vtedy, keď meranie patrí do nového
+    časového koša, takže `file.tell()` sa volá raz za `bucket_seconds`.
+    """
+
+    def __init__(self, parse_timestamp: Callable[[bytes], Optional[datetime]], bucket_seconds: int = 300):
+        self.parse_timestamp = parse_timestamp
+        self.bucket_seconds = bucket_seconds
+        self._last_bucket: Dict[Path, int] = {}
+
+    def note(self, log_path: Path, timestamp: datetime, file) -> None:
+        bucket = int(timestamp.timestamp()) // self.bucket_seconds * self.bucket_seconds
+        last_bucket = self._last_bucket.get(log_path)
+        if last_bucket is None:
+            last_bucket = self._restore(log_path, file)
+        if bucket == last_bucket:
+            return
+        self._last_bucket[log_path] = bucket
+        # Jeden zapisovaný súbor naraz, staré záznamy netreba držať v pamäti
+        for path in list(self._last_bucket):
+            if path != log_path:
+                del self._last_bucket[path]
+        try:
+            with open(index_path_for(log_path), 'a', encoding='utf-8') as idx:
+                idx.write(f"{bucket} {file.tell()}\n")
+        except OSError as e:
+            logger.error(f"Chyba pri zápise indexu {log_path}: {e}")
+
+    def _restore(self, log_path: Path, file) -> Optional[int]:
+        # Po reštarte pokračujeme v existujúcom indexe, chýbajúci index sa dobuduje
+        entries = load_index(log_path)
+        if not entries and file.tell() > 0:
+            file.flush()
+            entries = build_index(log_path, self.parse_timestamp, self.bucket_seconds)
+        return entries[-1][0] if entries else None
@@ -0,0 +1,168 @@
+import logging
+import re
+import threading
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from log_compression import compress_file, is_compressed, zstandard
+from log_index import index_path_for
+from metrics import LOG_MAINTENANCE_FILES
+from sensor_logger import LogFormat
+
+logger = logging.getLogger(__name__)
+
+
+class LogMaintenance:
+    """Údržba denných logov na pozadí: kompresia uzavretých dní a retencia.
+
+    Deň starší ako `compress_after_days` sa skomprimuje (gzip, voliteľne zstd)
+    a nekomprimovaný súbor sa zmaže. Dni staršie ako `retention_days` sa
+    zmažú, a ak súbory logu spolu presiahnu `max_total_mb`, mažú sa najstaršie
+    dni. Dnešný súbor sa nikdy nekomprimuje ani nemaže, agregáty v `rollups/`
+    ostávajú (sú malé a slúžia pre dlhé grafy). Hodnota 0 vypína danú retenciu.
+    Pri formáte sqlite sa iba mažú záznamy staršie ako `retention_days`.
+    """
+
+    def __init__(self, sensor_logger, compression: str = 'gzip', compress_after_days: int = 1,
+                 retention_days: int = 0, max_total_mb: float = 0.0, interval: float = 3600.0,
+                 level: Optional[int] = None):
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("Balík zstandard nie je nainštalovaný, logy sa komprimujú cez gzip")
+            compression = 'gzip'
+        if compression not in ('gzip', 'zstd', 'none'):
+            raise ValueError(f"Neznáma kompresia logov: {compression}")
+        self.sensor_logger = sensor_logger
+        self.compression = compression
+        self.compress_after_days = max(compress_after_days, 1)
+        self.retention_days = retention_days
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self.interval = interval
+        self.level = level
+        self._pattern = re.compile(
+            rf'sensor_log_(\d{{4}})_(\d{{2}})_(\d{{2}})\.{sensor_logger.format.value}(\.gz|\.zst)?$')
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, sensor_logger, config) -> 'LogMaintenance':
+        """Nastavenia zo sekcie [Maintenance] v config.ini."""
+        return cls(
+            sensor_logger,
+            compression=config.get('Maintenance', 'compression', fallback='gzip'),
+            compress_after_days=config.getint('Maintenance', 'compress_after_days', fallback=1),
+            retention_days=config.getint('Maintenance', 'retention_days', fallback=0),
+            max_total_mb=config.getfloat('Maintenance', 'max_total_mb', fallback=0.0),
+            interval=config.getfloat('Maintenance', 'interval', fallback=3600.0)
+        )
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='log-maintenance', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Chyba pri údržbe logov: {e}")
+            self._stop_event.wait(self.interval)
+
+    def day_files(self) -> Dict[date, List[Path]]:
+        """Súbory logu podľa dňa (nekomprimovaný aj komprimovaný, ak oba existujú)."""
+        days: Dict[date, List[Path]] = {}
+        for path in self.sensor_logger.base_path.glob('sensor_log_*'):
+            match = self._pattern.match(path.name)
+            if match:
+                day = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+                days.setdefault(day, []).append(path)
+        return dict(sorted(days.items()))
+
+    def run_once(self, today: Optional[date] = None) -> Dict[str, int]:
+        """Jeden prechod údržby, vráti počet skomprimovaných a zmazaných dní."""
+        today = today or date.today()
+        deleted = 0
+        if self.sensor_logger.format == LogFormat.SQLITE:
+            if self.retention_days > 0:
+                cutoff = datetime.combine(today - timedelta(days=self.retention_days), time.min)
+                deleted = self.sensor_logger.store.delete_before(cutoff)
+            return {'compressed': 0, 'deleted': deleted}
+        if self.retention_days > 0:
+            for day, paths in self.day_files().items():
+                if (today - day).days > self.retention_days:
+                    self._delete_day(day, paths)
+                    deleted += 1
+
+        compressed = 0
+        if self.compression != 'none':
+            for day, paths in self.day_files().items():
+                if (today - day).days < self.compress_after_days:
+                    continue
+                # Zápisy obnovia skomprimovaný deň (SensorLogger._prepare_log_file), takže archív
+                # vedľa nekomprimovaného súboru ostane iba po páde; compress_file ho neprepíše
+                plain = [path for path in paths if not is_compressed(path)]
+                if plain and self._compress(plain[0]):
+                    compressed += 1
+
+        if self.max_total_bytes > 0:
+            deleted += self._enforce_total_size(today)
+        return {'compressed': compressed, 'deleted': deleted}
+
+    def _compress(self, path: Path) -> bool:
+        stat = path.stat()
+        try:
+            target = compress_file(path, self.compression, self.level)
+        except OSError as e:
+            logger.error(f"Chyba pri kompresii logu {path}: {e}")
+            return False
+        # Komprimuje sa bez zámku, zapisovač sa zastaví iba na kontrolu a zmazanie originálu
+        with self.sensor_logger.writes_paused(path):
+            current = path.stat()
+            if (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                # Počas kompresie pribudol neskorý záznam, deň sa skomprimuje pri ďalšom prechode
+                target.unlink()
+                return False
+            path.unlink()
+        LOG_MAINTENANCE_FILES.inc(action='compressed')
+        logger.info(f"Log {path.name} skomprimovaný: {stat.st_size} -> {target.stat().st_size} B")
+        return True
+
+    def _enforce_total_size(self, today: date) -> int:
+        days = self.day_files()
+        sizes = {day: sum(self._size(path) + self._size(index_path_for(path)) for path in paths)
+                 for day, paths in days.items()}
+        total = sum(sizes.values())
+        deleted = 0
+        for day, paths in days.items():
+            if total <= self.max_total_bytes or day >= today:
+                break
+            self._delete_day(day, paths)
+            total -= sizes[day]
+            deleted += 1
+        return deleted
+
+    def _delete_day(self, day: date, paths: List[Path]) -> None:
+        for path in paths:
+            for target in (path, index_path_for(path)):
+                try:
+                    target.unlink()
+                except FileNotFoundError:
+                    pass
+        LOG_MAINTENANCE_FILES.inc(action='deleted')
+        logger.info(f"Log dňa {day.isoformat()} zmazaný podľa retencie")
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
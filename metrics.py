@@ -0,0 +1,193 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# Predvolené hranice histogramov latencie v sekundách
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple, extra: str = '') -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Histogram s pevnými hranicami, `observe` je bisect a dve sčítania."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # kľúč -> [počty v košoch (posledný je +Inf), súčet]
+        self._values: Dict[Tuple, List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Všetky metriky v textovom formáte Prometheus (verzia 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# I2C zbernica
+I2C_READ_SECONDS = REGISTRY.register(Histogram(
+    'i2c_read_seconds', 'Trvanie read_i2c_block_data', ('bus', 'address')))
+I2C_READ_ERRORS = REGISTRY.register(Counter(
+    'i2c_read_errors_total', 'Chyby čítania zo slave', ('bus', 'address')))
+I2C_READ_RETRIES = REGISTRY.register(Counter(
+    'i2c_read_retries_total', 'Opakované pokusy o čítanie zo slave', ('bus', 'address')))
+I2C_READ_TIMEOUTS = REGISTRY.register(Counter(
+    'i2c_read_timeouts_total', 'Čítania, ktoré prekročili časový limit', ('bus', 'address')))
+I2C_FRAME_ERRORS = REGISTRY.register(Counter(
+    'i2c_frame_errors_total', 'Rámce odmietnuté dekodérom (CRC, verzia, dĺžka)', ('address', 'reason')))
+I2C_FRAMES_UNCHANGED = REGISTRY.register(Counter(
+    'i2c_frames_unchanged_total', 'Rámce s rovnakým poradovým číslom ako predchádzajúci', ('address',)))
+SENSOR_ERRORS = REGISTRY.register(Counter(
+    'sensor_errors_total', 'Senzory s chybou (-999) alebo hodnotou mimo limitov', ('sensor', 'reason')))
+
+# Alarmy
+ALARM_TRANSITIONS = REGISTRY.register(Counter(
+    'alarm_transitions_total', 'Zapnutia a vypnutia alarmov', ('kind', 'state')))
+ALARMS_ACTIVE = REGISTRY.register(Gauge(
+    'alarms_active', 'Počet aktívnych alarmov podľa druhu', ('kind',)))
+
+# Cyklus zberu
+SWEEP_SECONDS = REGISTRY.register(Histogram(
+    'acquisition_sweep_seconds', 'Trvanie jedného zberu zo všetkých zberníc'))
+SWEEP_JITTER_SECONDS = REGISTRY.register(Histogram(
+    'acquisition_period_jitter_seconds', 'Odchýlka skutočného intervalu medzi zbermi od periódy',
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)))
+
+# Log
+LOG_SAVE_SECONDS = REGISTRY.register(Histogram(
+    'log_save_reading_seconds', 'Trvanie SensorLogger.save_reading', ('format',),
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)))
+LOG_ROWS_WRITTEN = REGISTRY.register(Counter(
+    'log_rows_written_total', 'Riadky zapísané do denných súborov', ('format',)))
+LOG_WRITE_ERRORS = REGISTRY.register(Counter(
+    'log_write_errors_total', 'Dávky, ktorých zápis zlyhal (riadky sa vrátia do buffera)', ('format',)))
+LOG_ROWS_DROPPED = REGISTRY.register(Counter(
+    'log_rows_dropped_total', 'Riadky zahodené po opakovaných chybách zápisu', ('format',)))
+LOG_READ_SECONDS = REGISTRY.register(Histogram(
+    'log_get_readings_seconds', 'Trvanie čítania logu (get_readings, dotaz na rozsah)', ('format', 'kind')))
+LOG_BYTES_READ = REGISTRY.register(Counter(
+    'log_bytes_read_total', 'Bajty prečítané z logov', ('format',)))
+LOG_MAINTENANCE_FILES = REGISTRY.register(Counter(
+    'log_maintenance_files_total', 'Denné logy skomprimované alebo zmazané údržbou', ('action',)))
+HISTORY_QUERIES = REGISTRY.register(Counter(
+    'history_queries_total', 'Dotazy na rozsah podľa zdroja (pamäť alebo logy)', ('source',)))
+
+# 3D vizualizácia
+VOLUME_RENDER_SECONDS = REGISTRY.register(Histogram(
+    'volume_render_seconds', 'Interpolácia a kvantizácia jednej 3D mriežky', ('grid',)))
+VOLUME_CACHE_REQUESTS = REGISTRY.register(Counter(
+    'volume_cache_requests_total', 'Požiadavky na 3D mriežku podľa výsledku v cache', ('result',)))
+
+# HTTP
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'http_request_seconds', 'Trvanie spracovania požiadavky (bez prúdového odosielania tela)',
+    ('endpoint', 'status')))
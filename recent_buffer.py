@@ -0,0 +1,155 @@
+import math
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from sensor_logger import record_value
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class RecentReadings:
+    """Posledné hodiny meraní v pamäti, bez objektov na jednotlivé merania.
+
+    Kruhový buffer s pevnou kapacitou v zberoch: čas zberu (epoch, float64)
+    a pre každý senzor jeden stĺpec teploty a vlhkosti (float64,
+    NaN ak senzor v zbere chýbal). Všetky merania zberu majú rovnaký čas,
+    preto stačí jedno pole časov pre všetky senzory.
+
+    Dotaz na rozsah, ktorý buffer celý pokrýva (`covers`), nečíta disk;
+    výsledok má rovnaký tvar ako záznamy z logu, s číselnými hodnotami.
+    S `iso_timestamps` (logy JSON) sa čas uchová so zlomkom sekundy a vráti
+    v tvare `isoformat()`, inak na sekundy ako v CSV.
+    """
+
+    def __init__(self, sensor_ids: Sequence[str], capacity: int, iso_timestamps: bool = False):
+        if capacity <= 0:
+            raise ValueError("Kapacita musí byť kladná")
+        self.sensor_ids = list(sensor_ids)
+        self.capacity = capacity
+        self.iso_timestamps = iso_timestamps
+        self._index = {sensor_id: i for i, sensor_id in enumerate(self.sensor_ids)}
+        self._times = np.zeros(capacity)
+        self._temperature = np.full((capacity, len(self.sensor_ids)), np.nan)
+        self._humidity = np.full((capacity, len(self.sensor_ids)), np.nan)
+        self._next = 0
+        self._count = 0
+        # Od tohto času (epoch) má buffer všetky zbery; None kým nie je žiadny
+        self._complete_from: Optional[float] = None
+        self._lock = threading.Lock()
+        self.version = 0
+
+    @classmethod
+    def from_config(cls, sensor_ids: Sequence[str], config,
+                    iso_timestamps: bool = False) -> Optional['RecentReadings']:
+        """Kapacita z [Logging] recent_hours a periódy zberu, None ak je vypnutý."""
+        hours = config.getfloat('Logging', 'recent_hours', fallback=6.0)
+        if hours <= 0:
+            return None
+        period = config.getfloat('Acquisition', 'period', fallback=5.0)
+        return cls(sensor_ids, math.ceil(hours * 3600 / max(period, 0.1)) + 1, iso_timestamps)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: datetime, valid: np.ndarray, temperature: np.ndarray,
+               humidity: np.ndarray) -> None:
+        """Pridá jeden zber; neplatné merania a kanály (ktoré sa nezapíšu do logu) sa uložia ako NaN."""
+        epoch = (timestamp if self.iso_timestamps else timestamp.replace(microsecond=0)).timestamp()
+        with self._lock:
+            row = self._next
+            self._times[row] = epoch
+            self._temperature[row] = np.where(valid, temperature, np.nan)
+            self._humidity[row] = np.where(valid, humidity, np.nan)
+            self._next = (row + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+                if self._complete_from is None:
+                    self._complete_from = epoch
+            else:
+                # Prepísal sa najstarší zber, úplné sú iba zbery od nasledujúceho
+                self._complete_from = float(self._times[self._next])
+            self.version += 1
+
+    def extend(self, records: Iterable[Dict]) -> None:
+        """Naplní buffer záznamami z logu (zoradenými podľa času)."""
+        count = len(self.sensor_ids)
+        timestamp = None
+        valid = temperature = humidity = None
+        for record in records:
+            i = self._index.get(record['sensor_id'])
+            if i is None:
+                continue
+            if record['timestamp'] != timestamp:
+                if timestamp is not None:
+                    self.append(datetime.fromisoformat(timestamp), valid, temperature, humidity)
+                timestamp = record['timestamp']
+                valid = np.zeros(count, dtype=bool)
+                temperature = np.full(count, np.nan)
+                humidity = np.full(count, np.nan)
+            valid[i] = True
+            temperature[i] = record_value(record['temperature'], np.nan)
+            humidity[i] = record_value(record['humidity'], np.nan)
+        if timestamp is not None:
+            self.append(datetime.fromisoformat(timestamp), valid, temperature, humidity)
+
+    def covers(self, start: datetime) -> bool:
+        """Či sú v bufferi všetky zbery od `start` (inak treba čítať logy)."""
+        with self._lock:
+            return self._complete_from is not None and start.timestamp() >= self._complete_from
+
+    def _select(self, start: datetime, end: datetime, sensor_id: Optional[str]):
+        # Kópia vybraných riadkov pod zámkom, v chronologickom poradí
+        columns = slice(None) if sensor_id is None else [self._index.get(sensor_id, -1)]
+        if sensor_id is not None and columns[0] < 0:
+            return np.zeros(0), np.zeros((0, 0)), np.zeros((0, 0)), []
+        with self._lock:
+            order = (np.arange(self._count) + self._next - self._count) % self.capacity
+            times = self._times[order]
+            # Maska namiesto binárneho vyhľadávania - čas sa môže posunúť aj dozadu
+            rows = order[(times >= start.timestamp()) & (times <= end.timestamp())]
+            temperature = self._temperature[rows][:, columns]
+            humidity = self._humidity[rows][:, columns]
+            times = self._times[rows]
+        sensor_ids = self.sensor_ids if sensor_id is None else [sensor_id]
+        return times, temperature, humidity, sensor_ids
+
+    def query(self, start: datetime, end: datetime, sensor_id: Optional[str] = None) -> List[Dict]:
+        """Záznamy v rozsahu vrátane okrajov, rovnako ako `SensorQuery.query`."""
+        times, temperature, humidity, sensor_ids = self._select(start, end, sensor_id)
+        records = []
+        temperature_rows = temperature.tolist()
+        humidity_rows = humidity.tolist()
+        for epoch, temperatures, humidities in zip(times.tolist(), temperature_rows, humidity_rows):
+            moment = datetime.fromtimestamp(epoch)
+            timestamp = moment.isoformat() if self.iso_timestamps else moment.strftime(TIMESTAMP_FORMAT)
+            for sensor, temp, hum in zip(sensor_ids, temperatures, humidities):
+                if temp == temp or hum == hum:
+                    records.append({
+                        'timestamp': timestamp,
+                        'sensor_id': sensor,
+                        'temperature': temp if temp == temp else None,
+                        'humidity': hum if hum == hum else None
+                    })
+        return records
+
+    def series(self, start: datetime, end: datetime, points: Optional[int] = None,
+               sensor_id: Optional[str] = None) -> Dict:
+        """Stĺpcové údaje pre malé grafy: časy (epoch) a hodnoty po senzoroch, najviac `points` zberov."""
+        times, temperature, humidity, sensor_ids = self._select(start, end, sensor_id)
+        if points and len(times) > points:
+            # Rovnomerný výber zberov, posledný zber vždy zostane
+            step = math.ceil(len(times) / points)
+            rows = np.arange(len(times) - 1, -1, -step)[::-1]
+            times, temperature, humidity = times[rows], temperature[rows], humidity[rows]
+
+        def column(values: np.ndarray) -> List[Optional[float]]:
+            return [None if value != value else value for value in values.tolist()]
+
+        return {
+            'timestamps': times.tolist(),
+            'temperature': {sensor: column(temperature[:, i]) for i, sensor in enumerate(sensor_ids)},
+            'humidity': {sensor: column(humidity[:, i]) for i, sensor in enumerate(sensor_ids)}
+        }
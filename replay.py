@@ -0,0 +1,269 @@
+"""Prehrávanie starých denných logov namiesto zberníc I2C.
+
+Záznamy z logov idú v poradí podľa času po zberoch cez `SensorDataManager`
+(zápis logu, agregáty, alarmy, pamäť posledných hodín) s pôvodnou časovou
+pečiatkou. Tempo je skutočné (`--speed 1`), zrýchlené (`--speed 1000`)
+alebo maximálne (`--speed max`), napr. na záťažový test alebo na prepočet
+logov do iného formátu či agregátov. Cieľ určuje [Logging] v config.ini:
+
+    python replay.py sensor_logs --format csv --speed max --config replay.ini
+    python replay.py sensor_logs --from 2026-03-01 --to 2026-03-07 --speed 10 --publish
+
+S `--publish` sa každý zber zverejní v zdieľanej pamäti ([Serving] segment),
+webové procesy s mode = shared potom zobrazujú a posielajú prehrávané údaje.
+"""
+import logging
+import sys
+import threading
+import time as time_module
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from frame_decoder import DecodedSweep
+from log_maintenance import LogMaintenance
+from sensor_logger import LogFormat, SensorLogger, record_value
+
+logger = logging.getLogger(__name__)
+
+
+class LogReplay:
+    """Zdroj zberov z denných logov, náhrada zberníc v `SensorDataManager`.
+
+    Denné súbory sa čítajú postupne (aj komprimované), záznamy jedného dňa
+    sa zoradia podľa času a záznamy s rovnakou časovou pečiatkou tvoria
+    jeden zber. `speed` je násobok skutočného času (None = bez čakania);
+    `max_gap` obmedzí čakanie na dlhé medzery v logoch (výpadky) na daný
+    počet sekúnd času logu. Senzory, ktoré nie sú v topológii z config.ini,
+    sa preskočia a počítajú v `skipped`.
+
+    Po `skip_logged(cieľ)` sa vynechajú zbery, ktoré cieľový log už má
+    (do posledného záznamu dňa v cieli, počítajú sa v `logged`), takže
+    opakované alebo prerušené prehrávanie nezapíše nič dvakrát.
+    Skomprimovaný deň v cieli sa pri prvom novom zápise obnoví
+    (`SensorLogger._prepare_log_file`), archív sa neprepíše.
+    """
+
+    def __init__(self, source: SensorLogger, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None, speed: Optional[float] = 1.0,
+                 max_gap: Optional[float] = None):
+        if speed is not None and speed <= 0:
+            raise ValueError("Rýchlosť prehrávania musí byť kladná")
+        self.source = source
+        self.start = start
+        self.end = end
+        self.speed = speed
+        self.max_gap = max_gap
+        self.sweeps = 0
+        self.skipped = 0
+        self.logged = 0
+        self._target: Optional[SensorLogger] = None
+        # Posledný zapísaný čas v cieli podľa dňa, zisťuje sa pri prvom zbere dňa
+        self._logged: Dict[date, Optional[datetime]] = {}
+        self._sweeps = self._iter_sweeps()
+        self._sensor_ids: Optional[Sequence[str]] = None
+        self._index: Dict[str, int] = {}
+        self._unknown = set()
+        # Čas logu a monotónny čas, ku ktorým sa vzťahuje tempo prehrávania
+        self._anchor: Optional[Tuple[float, float]] = None
+        self._last_epoch: Optional[float] = None
+        self._stop_event = threading.Event()
+
+    def days(self) -> List[datetime]:
+        """Dni s logom v zdroji v rozsahu prehrávania."""
+        days = LogMaintenance(self.source, compression='none').day_files()
+        return [datetime.combine(day, time()) for day in days
+                if (self.start is None or day >= self.start.date()) and
+                (self.end is None or day <= self.end.date())]
+
+    def skip_logged(self, target: SensorLogger) -> None:
+        """Vynechá zbery, ktoré už sú v cieľovom logu `target`."""
+        self._target = target
+        self._logged = {}
+
+    def _iter_records(self) -> Iterator[Dict]:
+        start = self.start.isoformat(sep=' ') if self.start is not None else None
+        end = self.end.isoformat(sep=' ') if self.end is not None else None
+        if self.source.store is not None:
+            # Databáza vracia záznamy už zoradené podľa času
+            yield from self.source.store.query(self.start or datetime(1970, 1, 1),
+                                               self.end or datetime.max.replace(microsecond=0))
+            return
+        for day in self.days():
+            # Zoradenie je stabilné a na už zoradenom dni takmer zadarmo
+            records = sorted(self.source.iter_readings(day), key=lambda record: record['timestamp'])
+            for record in records:
+                timestamp = record['timestamp'].replace('T', ' ')
+                if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                    yield record
+
+    def _iter_sweeps(self) -> Iterator[Tuple[str, List[Dict]]]:
+        timestamp = None
+        records: List[Dict] = []
+        for record in self._iter_records():
+            if record['timestamp'] != timestamp:
+                if records:
+                    yield timestamp, records
+                timestamp = record['timestamp']
+                records = []
+            records.append(record)
+        if records:
+            yield timestamp, records
+
+    def next_sweep(self, sensor_ids: Sequence[str]) -> Tuple[datetime, DecodedSweep]:
+        """Nasledujúci zber v poradí `sensor_ids`; počká podľa tempa, na konci StopIteration."""
+        if self._stop_event.is_set():
+            raise StopIteration
+        while True:
+            timestamp, records = next(self._sweeps)
+            moment = datetime.fromisoformat(timestamp)
+            if not self._is_logged(moment):
+                break
+            self.logged += 1
+        self._wait(moment.timestamp())
+        self.sweeps += 1
+        return moment, self._to_sweep(sensor_ids, records)
+
+    def _is_logged(self, moment: datetime) -> bool:
+        if self._target is None:
+            return False
+        day = moment.date()
+        if day not in self._logged:
+            # Zbery idú podľa času, deň sa v cieli prečíta skôr, než sa doň zapíše
+            self._logged[day] = self._target.last_timestamp(datetime.combine(day, time()))
+        last = self._logged[day]
+        return last is not None and moment <= last
+
+    def _wait(self, epoch: float) -> None:
+        if self.speed is None:
+            return
+        now = time_module.monotonic()
+        if self._anchor is None or (self.max_gap is not None and epoch - self._last_epoch > self.max_gap):
+            self._anchor = (epoch, now)
+        self._last_epoch = epoch
+        log_start, started = self._anchor
+        delay = started + (epoch - log_start) / self.speed - now
+        if delay > 0:
+            self._stop_event.wait(delay)
+
+    def _to_sweep(self, sensor_ids: Sequence[str], records: List[Dict]) -> DecodedSweep:
+        if sensor_ids is not self._sensor_ids:
+            self._sensor_ids = sensor_ids
+            self._index = {sensor_id: i for i, sensor_id in enumerate(sensor_ids)}
+        count = len(sensor_ids)
+        temperature = np.full(count, np.nan)
+        humidity = np.full(count, np.nan)
+        present = np.zeros(count, dtype=bool)
+        for record in records:
+            i = self._index.get(record['sensor_id'])
+            if i is None:
+                self.skipped += 1
+                if record['sensor_id'] not in self._unknown:
+                    self._unknown.add(record['sensor_id'])
+                    logger.warning(f"Senzor {record['sensor_id']} nie je v topológii, preskakuje sa")
+                continue
+            temperature[i] = record_value(record['temperature'], np.nan)
+            humidity[i] = record_value(record['humidity'], np.nan)
+            present[i] = True
+        # Chyby senzorov sa do logu nezapisujú, neplatný kanál je v zázname prázdny
+        temperature_valid = present & ~np.isnan(temperature)
+        humidity_valid = present & ~np.isnan(humidity)
+        return DecodedSweep(
+            sensor_ids=sensor_ids,
+            temperature=temperature,
+            humidity=humidity,
+            present=present,
+            sensor_error=np.zeros(count, dtype=bool),
+            valid=temperature_valid | humidity_valid,
+            fresh=present.copy(),
+            temperature_valid=temperature_valid,
+            humidity_valid=humidity_valid
+        )
+
+    def stop(self) -> None:
+        """Preruší čakanie; nasledujúce `next_sweep` skončí StopIteration."""
+        self._stop_event.set()
+
+    def close(self) -> None:
+        self.stop()
+        self._sweeps.close()
+        self.source.close()
+
+
+def parse_speed(value: str) -> Optional[float]:
+    return None if value == 'max' else float(value)
+
+
+def main(argv=None):
+    import argparse
+    import signal
+
+    from acquisition import AcquisitionLoop
+    from sensor_manager import Config, SensorDataManager
+
+    parser = argparse.ArgumentParser(description="Prehrávanie denných logov cez SensorDataManager")
+    parser.add_argument('source', help="adresár s logmi sensor_log_*")
+    parser.add_argument('--format', default='csv', choices=[log_format.value for log_format in LogFormat])
+    parser.add_argument('--config', default='config.ini', help="cieľ (sekcia [Logging]), topológia a alarmy")
+    parser.add_argument('--from', dest='start', type=datetime.fromisoformat)
+    parser.add_argument('--to', dest='end', type=datetime.fromisoformat)
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help="násobok skutočného času alebo max")
+    parser.add_argument('--max-gap', type=float, help="najdlhšia čakaná medzera v logu v sekundách")
+    parser.add_argument('--publish', action='store_true', help="zverejniť zbery v zdieľanej pamäti")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    config = Config(args.config)
+    target = config.config['Logging']
+    source = SensorLogger(args.source, LogFormat(args.format))
+    if args.format == target['log_format'] and source.base_path.resolve() == Path(target['log_path']).resolve():
+        parser.error("Cieľový log je rovnaký ako zdroj, nastavte iný [Logging] log_path alebo log_format")
+    if args.speed is None:
+        # Pri maximálnej rýchlosti veľké dávky zápisu
+        target['buffer_size'] = str(max(target.getint('buffer_size', fallback=0), 5000))
+
+    replay = LogReplay(source, args.start, args.end, args.speed, args.max_gap)
+    sensor_manager = SensorDataManager(config, replay)
+    publisher = None
+    if args.publish:
+        from shared_snapshot import SharedSnapshotWriter
+        publisher = SharedSnapshotWriter(config.config.get('Serving', 'segment', fallback='sensor_snapshot'),
+                                         sensor_manager.decoder.sensor_ids)
+    # Tempo určuje prehrávanie, slučka zberu nečaká
+    acquisition = AcquisitionLoop(sensor_manager, period=0.0, publisher=publisher)
+    signal.signal(signal.SIGTERM, lambda *_: replay.stop())
+
+    readings = 0
+    first = last = None
+    started = time_module.perf_counter()
+    try:
+        while True:
+            try:
+                snapshot = acquisition.run_once()
+            except StopIteration:
+                break
+            readings += len(snapshot.readings)
+            if snapshot.readings:
+                last = snapshot.readings[0]['Timestamp']
+                first = first or last
+    except KeyboardInterrupt:
+        logger.info("Prehrávanie prerušené")
+    finally:
+        sensor_manager.close()
+        if publisher is not None:
+            publisher.close()
+    elapsed = time_module.perf_counter() - started
+
+    print(f"{replay.sweeps} zberov, {readings} meraní ({first} - {last}) za {elapsed:.1f} s, "
+          f"{replay.sweeps / max(elapsed, 1e-9):.0f} zberov/s")
+    if replay.logged:
+        print(f"{replay.logged} zberov už v cieľovom logu bolo, preskočili sa")
+    if replay.skipped:
+        print(f"{replay.skipped} meraní zo senzorov mimo topológie sa preskočilo")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
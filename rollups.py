@@ -0,0 +1,245 @@
+import csv
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rozlíšenie agregátov v sekundách, od najjemnejšieho
+RESOLUTIONS = {'1m': 60, '1h': 3600}
+
+FIELDNAMES = ['bucket', 'sensor_id', 'count',
+              'temp_min', 'temp_max', 'temp_mean', 'temp_last',
+              'hum_min', 'hum_max', 'hum_mean', 'hum_last',
+              'temp_count', 'hum_count']
+
+
+def _value(value) -> Optional[float]:
+    return None if value is None or value == '' else float(value)
+
+
+def _lower(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _upper(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return b if a is None else a if b is None else max(a, b)
+
+
+class _Bucket:
+    """Priebežné štatistiky jedného senzora v jednom časovom koši.
+
+    Kanály majú vlastné počty: neplatný kanál merania (None) sa do štatistík
+    kanála nezapočíta a kôš bez platnej hodnoty kanála má štatistiky None.
+    """
+    __slots__ = ('start', 'count',
+                 'temp_count', 'temp_min', 'temp_max', 'temp_sum', 'temp_last',
+                 'hum_count', 'hum_min', 'hum_max', 'hum_sum', 'hum_last')
+
+    def __init__(self, start: int, temperature: Optional[float], humidity: Optional[float]):
+        self.start = start
+        self.count = self.temp_count = self.hum_count = 0
+        self.temp_min = self.temp_max = self.temp_last = None
+        self.hum_min = self.hum_max = self.hum_last = None
+        self.temp_sum = self.hum_sum = 0.0
+        self.add(temperature, humidity)
+
+    def add(self, temperature: Optional[float], humidity: Optional[float]) -> None:
+        self.count += 1
+        if temperature is not None:
+            self.temp_count += 1
+            self.temp_min = _lower(self.temp_min, temperature)
+            self.temp_max = _upper(self.temp_max, temperature)
+            self.temp_sum += temperature
+            self.temp_last = temperature
+        if humidity is not None:
+            self.hum_count += 1
+            self.hum_min = _lower(self.hum_min, humidity)
+            self.hum_max = _upper(self.hum_max, humidity)
+            self.hum_sum += humidity
+            self.hum_last = humidity
+
+    def merge(self, other: '_Bucket') -> None:
+        # `other` je novší záznam toho istého koša (napr. po reštarte)
+        self.count += other.count
+        self.temp_count += other.temp_count
+        self.temp_min = _lower(self.temp_min, other.temp_min)
+        self.temp_max = _upper(self.temp_max, other.temp_max)
+        self.temp_sum += other.temp_sum
+        if other.temp_last is not None:
+            self.temp_last = other.temp_last
+        self.hum_count += other.hum_count
+        self.hum_min = _lower(self.hum_min, other.hum_min)
+        self.hum_max = _upper(self.hum_max, other.hum_max)
+        self.hum_sum += other.hum_sum
+        if other.hum_last is not None:
+            self.hum_last = other.hum_last
+
+    def copy(self) -> '_Bucket':
+        bucket = _Bucket.__new__(_Bucket)
+        for name in self.__slots__:
+            setattr(bucket, name, getattr(self, name))
+        return bucket
+
+    def to_dict(self, sensor_id: str) -> Dict:
+        return {
+            'bucket': datetime.fromtimestamp(self.start).strftime('%Y-%m-%d %H:%M:%S'),
+            'sensor_id': sensor_id,
+            'count': self.count,
+            'temp_min': self.temp_min,
+            'temp_max': self.temp_max,
+            'temp_mean': round(self.temp_sum / self.temp_count, 3) if self.temp_count else None,
+            'temp_last': self.temp_last,
+            'hum_min': self.hum_min,
+            'hum_max': self.hum_max,
+            'hum_mean': round(self.hum_sum / self.hum_count, 3) if self.hum_count else None,
+            'hum_last': self.hum_last,
+            'temp_count': self.temp_count,
+            'hum_count': self.hum_count
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict) -> '_Bucket':
+        bucket = cls.__new__(cls)
+        bucket.start = int(datetime.fromisoformat(row['bucket']).timestamp())
+        bucket.count = int(row['count'])
+        # Súbory zo starších verzií nemajú počty kanálov, všetky merania mali oba kanály
+        bucket.temp_count = int(row.get('temp_count') or bucket.count)
+        bucket.hum_count = int(row.get('hum_count') or bucket.count)
+        bucket.temp_min = _value(row['temp_min'])
+        bucket.temp_max = _value(row['temp_max'])
+        bucket.temp_last = _value(row['temp_last'])
+        bucket.temp_sum = (_value(row['temp_mean']) or 0.0) * bucket.temp_count
+        bucket.hum_min = _value(row['hum_min'])
+        bucket.hum_max = _value(row['hum_max'])
+        bucket.hum_last = _value(row['hum_last'])
+        bucket.hum_sum = (_value(row['hum_mean']) or 0.0) * bucket.hum_count
+        return bucket
+
+
+class RollupAggregator:
+    """Udržiava 1-minútové a 1-hodinové agregáty pre každý senzor.
+
+    Každé meranie aktualizuje otvorený kôš v O(1). Keď príde meranie do
+    nasledujúceho koša, uzavretý kôš sa pripíše do súboru
+    `rollups/rollup_<rozlíšenie>_YYYY_MM_DD.csv` vedľa surových logov.
+    Koše uzavreté v jednom zbere (rovnaký čas merania) sa zapíšu spolu
+    s prvým meraním ďalšieho zberu, jedným otvorením súboru.
+    """
+
+    def __init__(self, base_path, resolutions: Optional[Dict[str, int]] = None):
+        self.base_path = Path(base_path) / 'rollups'
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.resolutions = resolutions or RESOLUTIONS
+        self._open: Dict[str, Dict[str, _Bucket]] = {name: {} for name in self.resolutions}
+        # Uzavreté koše aktuálneho zberu, ešte nezapísané
+        self._closed: List[Tuple[str, str, _Bucket]] = []
+        self._last_epoch: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_file_path(self, resolution: str, date: datetime) -> Path:
+        return self.base_path / f"rollup_{resolution}_{date.strftime('%Y_%m_%d')}.csv"
+
+    def add(self, reading) -> None:
+        epoch = int(reading.timestamp.timestamp())
+        closed: List[Tuple[str, str, _Bucket]] = []
+        with self._lock:
+            if epoch != self._last_epoch:
+                closed, self._closed = self._closed, []
+                self._last_epoch = epoch
+            for name, seconds in self.resolutions.items():
+                start = epoch - epoch % seconds
+                buckets = self._open[name]
+                bucket = buckets.get(reading.sensor_id)
+                if bucket is not None and bucket.start == start:
+                    bucket.add(reading.temperature, reading.humidity)
+                    continue
+                if bucket is not None:
+                    self._closed.append((name, reading.sensor_id, bucket))
+                buckets[reading.sensor_id] = _Bucket(start, reading.temperature, reading.humidity)
+        if closed:
+            self._write(closed)
+
+    def close(self) -> None:
+        # Neuzavreté koše sa zapíšu tiež, pri čítaní sa zlúčia s pokračovaním po reštarte
+        with self._lock:
+            closed = self._closed + [(name, sensor_id, bucket)
+                                     for name, buckets in self._open.items()
+                                     for sensor_id, bucket in buckets.items()]
+            self._closed = []
+            for buckets in self._open.values():
+                buckets.clear()
+        if closed:
+            self._write(closed)
+
+    def _write(self, closed: List[Tuple[str, str, _Bucket]]) -> None:
+        rows_by_file: Dict[Tuple[str, date], List[Dict]] = {}
+        for name, sensor_id, bucket in closed:
+            day = datetime.fromtimestamp(bucket.start).date()
+            rows_by_file.setdefault((name, day), []).append(bucket.to_dict(sensor_id))
+        for (name, day), rows in rows_by_file.items():
+            file_path = self._get_file_path(name, day)
+            try:
+                file_exists = file_path.exists()
+                with open(file_path, mode='a', newline='', encoding='utf-8') as file:
+                    writer = csv.DictWriter(file, fieldnames=FIELDNAMES, delimiter=';')
+                    if not file_exists:
+                        writer.writeheader()
+                    writer.writerows(rows)
+            except OSError as e:
+                logger.error(f"Chyba pri zápise agregátov {file_path}: {e}")
+
+    def query(self, resolution: str, start: datetime, end: datetime,
+              sensor_id: Optional[str] = None) -> List[Dict]:
+        """Agregáty v rozsahu vrátane práve otvorených košov, zoradené podľa času."""
+        start_epoch = int(start.timestamp())
+        end_epoch = int(end.timestamp())
+        merged: Dict[Tuple[int, str], _Bucket] = {}
+
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            file_path = self._get_file_path(resolution, day)
+            if file_path.exists():
+                with open(file_path, mode='r', newline='', encoding='utf-8') as file:
+                    for row in csv.DictReader(file, delimiter=';'):
+                        if sensor_id is not None and row['sensor_id'] != sensor_id:
+                            continue
+                        self._merge_into(merged, row['sensor_id'], _Bucket.from_row(row),
+                                         start_epoch, end_epoch)
+            day += timedelta(days=1)
+
+        with self._lock:
+            pending = [(open_sensor_id, bucket) for name, open_sensor_id, bucket in self._closed
+                       if name == resolution]
+            for open_sensor_id, bucket in pending + list(self._open[resolution].items()):
+                if sensor_id is None or open_sensor_id == sensor_id:
+                    self._merge_into(merged, open_sensor_id, bucket.copy(), start_epoch, end_epoch)
+
+        return [merged[key].to_dict(key[1]) for key in sorted(merged)]
+
+    @staticmethod
+    def _merge_into(merged: Dict[Tuple[int, str], _Bucket], sensor_id: str, bucket: _Bucket,
+                    start_epoch: int, end_epoch: int) -> None:
+        if not start_epoch <= bucket.start <= end_epoch:
+            return
+        key = (bucket.start, sensor_id)
+        if key in merged:
+            merged[key].merge(bucket)
+        else:
+            merged[key] = bucket
+
+
+def choose_resolution(start: datetime, end: datetime, points: int, raw_period: float) -> Optional[str]:
+    """Najjemnejšie rozlíšenie, pri ktorom počet bodov na senzor neprekročí `points`.
+
+    None znamená, že sa zmestia surové merania.
+    """
+    span = max((end - start).total_seconds(), 0)
+    if span / max(raw_period, 1e-3) <= points:
+        return None
+    for name, seconds in sorted(RESOLUTIONS.items(), key=lambda item: item[1]):
+        if span / seconds <= points:
+            return name
+    return max(RESOLUTIONS, key=RESOLUTIONS.get)
@@ -1,58 +1,331 @@
-from flask import Blueprint, render_template, jsonify, request, send_file
-from datetime import datetime
+import json
+import time
+from flask import Blueprint, Response, g, render_template, jsonify, request
+from werkzeug.wsgi import wrap_file
+from datetime import datetime, timedelta
+from log_compression import COMPRESSION_SUFFIXES, is_compressed, logical_path
+from sensor_logger import LogFormat
+from sensor_query import numeric_values
+from metrics import HISTORY_QUERIES, HTTP_REQUEST_SECONDS, REGISTRY
+from streaming import (ConcatenatedFile, accepts_gzip, files_etag, first_line_length,
+                       gzip_chunks, iter_csv, iter_file, iter_json_array, iter_log_files)
 
+LOG_MIMETYPES = {
+    LogFormat.CSV: 'text/csv',
+    LogFormat.JSON: 'application/json',
+    LogFormat.JSONL: 'application/x-ndjson',
+    LogFormat.BINARY: 'application/octet-stream',
+    LogFormat.SQLITE: 'text/csv'
+}
 
-def create_routes(sensor_manager):  # prijíma dva argumenty
+
+def _sse_event(event, sequence, data):
+    return f"event: {event}\nid: {sequence}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def _streamed_response(chunks, mimetype, etag):
+    """Prúdová odpoveď s voliteľnou gzip kompresiou a podmieneným GET (ETag)."""
+    gzip = accepts_gzip(request)
+    if gzip:
+        chunks = gzip_chunks(chunks)
+    response = Response(chunks, mimetype=mimetype)
+    if gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+        etag += '-gz'
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = True
+    response.set_etag(etag)
+    # Pri zhode ETagu vráti 304 a generátor sa vôbec nespustí
+    return response.make_conditional(request)
+
+
+def _compressed_log_response(log_paths, log_format, etag):
+    """Export, v ktorom sú skomprimované dni (bez podpory Range)."""
+    if (len(log_paths) == 1 and log_paths[0].suffix == COMPRESSION_SUFFIXES['gzip']
+            and accepts_gzip(request)):
+        # Uložený gzip sa pošle tak, ako je - bez dekompresie a opätovnej kompresie
+        response = Response(iter_file(open(log_paths[0], 'rb')), mimetype=LOG_MIMETYPES[log_format])
+        response.headers['Content-Encoding'] = 'gzip'
+        response.content_length = log_paths[0].stat().st_size
+        response.vary.add('Accept-Encoding')
+        response.cache_control.no_cache = True
+        response.set_etag(etag + '-gz')
+        return response.make_conditional(request)
+    chunks = iter_log_files(log_paths, skip_header=log_format == LogFormat.CSV)
+    return _streamed_response(chunks, LOG_MIMETYPES[log_format], etag)
+
+
+def _download_name(log_paths, start, end, log_format):
+    if len(log_paths) == 1:
+        return logical_path(log_paths[0]).name
+    if start == end:
+        return f"sensor_log_{start.strftime('%Y_%m_%d')}.{log_format.value}"
+    return f"sensor_log_{start.strftime('%Y_%m_%d')}-{end.strftime('%Y_%m_%d')}.{log_format.value}"
+
+
+def create_routes(sensor_manager, acquisition):  # prijíma dva argumenty
     routes = Blueprint('routes', __name__)
+    settings = sensor_manager.config.config
+    volume = {}
+    # Úrovne detailu 3D pohľadu, prehliadač ich načítava postupne od najhrubšej
+    volume_levels = [int(level) for level in
+                     settings.get('Visualization', 'lod_levels', fallback='15, 29, 57').split(',') if level.strip()]
+
+    def get_volume_renderer():
+        # Geometria a interpolácia (numpy, scipy, plotly) sa načítajú až pri prvom 3D pohľade
+        if 'renderer' not in volume:
+            from sensor_visualizer import SensorVisualizer
+            from volume_renderer import VolumeRenderer
+            volume['renderer'] = VolumeRenderer(SensorVisualizer(), sensor_manager.decoder.sensor_ids,
+                                                settings.getint('Visualization', 'cache_size', fallback=64))
+        return volume['renderer']
+
+    @routes.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @routes.after_request
+    def record_duration(response):
+        # Pri prúdových odpovediach meria čas do začiatku odosielania tela
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_start,
+                                     endpoint=request.endpoint, status=response.status_code)
+        return response
+
+    @routes.route('/metrics')
+    def metrics():
+        # Textový formát Prometheus
+        return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
     @routes.route('/api/data', methods=['GET'])
     def get_api_data():
-        data = sensor_manager.get_sensor_data()  # alebo z iného zdroja
+        data = acquisition.latest().to_list()
         return jsonify(data)
 
     @routes.route('/')
     def home():
-        # Generovanie údajov pre senzory
-        data = sensor_manager.generate_sensor_data()
-        return render_template('index.html', data=data)
+        # Posledný snapshot z vlákna zberu, zbernica sa tu nečíta
+        data = acquisition.latest().to_list()
+        return render_template('index.html', data=data, volume_levels=volume_levels)
 
     @routes.route('/get_sensor_data')
     def get_sensor_data():
         # Získanie údajov pre senzory vo formáte JSON
-        data = sensor_manager.generate_sensor_data()
+        data = acquisition.latest().to_list()
         return jsonify(data)
 
+    @routes.route('/alarms')
+    def alarms():
+        # Aktívne alarmy z pamäte, historické súbory sa nečítajú
+        return jsonify({'version': acquisition.alarms.version, 'active': acquisition.alarms.active()})
+
+    @routes.route('/stream')
+    def stream():
+        # Server-Sent Events: každý nový snapshot sa pošle všetkým odberateľom raz
+        delta = request.args.get('delta') == '1'
+
+        def events():
+            sent = {}
+            sequence = 0
+            alarm_version = None
+            snapshot = acquisition.latest()
+            while True:
+                if snapshot is None:
+                    # Komentár udrží spojenie otvorené cez proxy
+                    yield ": keepalive\n\n"
+                elif snapshot.sequence > sequence:
+                    sequence = snapshot.sequence
+                    data = snapshot.to_list()
+                    current = {item['Sensor']: item for item in data}
+                    if not delta or not sent:
+                        yield _sse_event('snapshot', sequence, data)
+                    else:
+                        # Iba senzory so zmenenou hodnotou
+                        changed = [item for sensor, item in current.items()
+                                   if sensor not in sent or
+                                   (sent[sensor]['Temperature'], sent[sensor]['Humidity']) !=
+                                   (item['Temperature'], item['Humidity'])]
+                        removed = [sensor for sensor in sent if sensor not in current]
+                        yield _sse_event('delta', sequence, {
+                            'changed': changed,
+                            'removed': removed,
+                            'timestamp': snapshot.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+                        })
+                    sent = current
+                    if acquisition.alarms.version != alarm_version:
+                        # Zoznam aktívnych alarmov iba pri zmene (a raz po pripojení)
+                        alarm_version = acquisition.alarms.version
+                        yield _sse_event('alarms', sequence, acquisition.alarms.active())
+                snapshot = acquisition.wait_for_update(sequence, timeout=15.0)
+
+        response = Response(events(), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
     @routes.route('/historical_data')
     def historical_data():
-        # Získanie historických údajov podľa dátumu
-        date_str = request.args.get('date')
-        if date_str:
-            date = datetime.strptime(date_str, '%Y-%m-%d')
+        # Časový rozsah (aj cez viac dní) a voliteľne jeden senzor
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        if start_str or end_str:
+            try:
+                end = datetime.fromisoformat(end_str) if end_str else datetime.now()
+                start = datetime.fromisoformat(start_str) if start_str else end.replace(
+                    hour=0, minute=0, second=0, microsecond=0)
+            except ValueError:
+                return "Invalid start/end format. Use ISO format, e.g. 2026-10-18T14:00.", 400
+            recent = sensor_manager.recent
+            if recent is not None and recent.covers(start):
+                # Krátky rozsah z pamäte bez čítania disku; verzia sa číta pred dotazom,
+                # aby ETag nikdy nebol novší ako údaje
+                etag = files_etag((), f"recent:{recent.version}", request.query_string.decode())
+                readings = sensor_manager.query_readings(start, end, request.args.get('sensor_id'))
+                return _streamed_response(iter_json_array(readings), 'application/json', etag)
+            HISTORY_QUERIES.inc(source='disk')
+            sensor_manager.logger.flush()
+            paths = sensor_manager.logger.existing_log_files(start, end)
+            readings = numeric_values(sensor_manager.query.query(start, end, request.args.get('sensor_id')))
         else:
-            date = datetime.now()
-        readings = sensor_manager.get_readings_by_date(date)
-        return jsonify(readings)
+            # Získanie historických údajov podľa dátumu
+            date_str = request.args.get('date')
+            try:
+                date = datetime.strptime(date_str, '%Y-%m-%d') if date_str else datetime.now()
+            except ValueError:
+                return "Invalid date format. Use YYYY-MM-DD.", 400
+            sensor_manager.logger.flush()
+            paths = sensor_manager.logger.existing_log_files(date, date)
+            readings = numeric_values(sensor_manager.logger.iter_readings(date))
+
+        # Záznamy sa posielajú postupne, celý deň sa nezostavuje v pamäti
+        etag = files_etag(paths, request.query_string.decode())
+        return _streamed_response(iter_json_array(readings), 'application/json', etag)
+
+    @routes.route('/rollup_data')
+    def rollup_data():
+        # Zhustené údaje pre dlhé grafy, rozlíšenie sa volí podľa požadovaného počtu bodov
+        try:
+            end = datetime.fromisoformat(request.args['end']) if 'end' in request.args else datetime.now()
+            start = (datetime.fromisoformat(request.args['start']) if 'start' in request.args
+                     else end - timedelta(days=1))
+            points = int(request.args.get('points', 500))
+        except ValueError:
+            return "Invalid start/end/points parameter.", 400
+        if points <= 0:
+            return "Parameter points must be positive.", 400
+        data = sensor_manager.get_downsampled(start, end, points, request.args.get('sensor_id'))
+        return jsonify(data)
+
+    @routes.route('/sparkline_data')
+    def sparkline_data():
+        # Posledné minúty po stĺpcoch pre malé grafy pri senzoroch
+        try:
+            minutes = float(request.args.get('minutes', 60))
+            points = int(request.args.get('points', 120))
+        except ValueError:
+            return "Invalid minutes/points parameter.", 400
+        if minutes <= 0 or points <= 0:
+            return "Parameters minutes and points must be positive.", 400
+        return jsonify(sensor_manager.sparklines(minutes, points, request.args.get('sensor_id')))
+
+    @routes.route('/visualize_3d')
+    def visualize_3d():
+        # Interpolovaná 3D mriežka posledného alebo historického snapshotu (kvantovaná, binárna)
+        mode = request.args.get('mode', 'temperature')
+        try:
+            grid_points = int(request.args.get('grid', settings.getint('Visualization', 'grid_points', fallback=29)))
+            bits = int(request.args.get('bits', 8))
+            timestamp = datetime.fromisoformat(request.args['timestamp']) if 'timestamp' in request.args else None
+        except ValueError:
+            return "Invalid grid/bits/timestamp parameter.", 400
+        if mode not in ('temperature', 'humidity'):
+            return "Parameter mode must be temperature or humidity.", 400
+        if not 2 <= grid_points <= settings.getint('Visualization', 'max_grid_points', fallback=80):
+            return "Parameter grid is out of range.", 400
+        if bits not in (8, 16):
+            return "Parameter bits must be 8 or 16.", 400
+
+        if timestamp is None:
+            snapshot = acquisition.latest()
+            if snapshot.timestamp is None:
+                return "No snapshot available yet.", 503
+            snapshot_time = snapshot.timestamp
+            readings = [{'sensor_id': item['Sensor'], 'temperature': item['Temperature'],
+                         'humidity': item['Humidity']} for item in snapshot.readings]
+        else:
+            readings = sensor_manager.snapshot_at(timestamp)
+            if not readings:
+                return "No snapshot found before the requested time.", 404
+            snapshot_time = datetime.fromisoformat(readings[0]['timestamp'])
+
+        # Kľúč cache aj ETag: čas snapshotu, veličina a rozlíšenie
+        key = ('live' if timestamp is None else 'log', snapshot_time)
+        payload = get_volume_renderer().render(key, readings, snapshot_time, mode, grid_points, bits)
+        etag = f"{key[0]}-{snapshot_time.strftime('%Y%m%d%H%M%S%f')}-{mode}-{grid_points}-{bits}"
+        response = _streamed_response([payload.data], 'application/octet-stream', etag)
+        response.headers.update(payload.headers())
+        return response
 
     @routes.route('/download_log')
     def download_log():
-        # Získame parameter dátumu
+        # Jeden deň (date) alebo export viacerých dní (start, end)
         date_str = request.args.get('date')
-        if not date_str:
+        start_str = request.args.get('start', date_str)
+        end_str = request.args.get('end', start_str)
+        if not start_str:
             return "Date parameter is missing", 400
 
         try:
-            date = datetime.strptime(date_str, '%Y-%m-%d')
+            start = datetime.strptime(start_str, '%Y-%m-%d')
+            end = datetime.strptime(end_str, '%Y-%m-%d')
         except ValueError:
             return "Invalid date format. Use YYYY-MM-DD.", 400
 
-        # Získame cestu k logu pre zadaný dátum
-        log_path = sensor_manager.logger._get_log_file_path(date)
+        log_format = sensor_manager.logger.format
+        sensor_manager.logger.flush()
+        log_paths = sensor_manager.logger.existing_log_files(start, end)
 
         # Kontrola existencie súboru
-        if not log_path.exists():
+        if not log_paths:
             return "Log file not found", 404
+        if log_format == LogFormat.JSON and len(log_paths) > 1:
+            return "Multi-day export is not supported for the json log format.", 400
+
+        etag = files_etag(log_paths)
+        if log_format == LogFormat.SQLITE:
+            # Databáza sa exportuje ako CSV v rovnakom tvare ako denné súbory
+            records = sensor_manager.query.query(start, end + timedelta(days=1) - timedelta(seconds=1))
+            response = _streamed_response(iter_csv(records, sensor_manager.logger.fieldnames),
+                                          LOG_MIMETYPES[log_format], files_etag(log_paths, start_str, end_str))
+            response.headers['Content-Disposition'] = (
+                f'attachment; filename="{_download_name([], start, end, LogFormat.CSV)}"')
+            return response
+        if any(is_compressed(path) for path in log_paths):
+            response = _compressed_log_response(log_paths, log_format, etag)
+            response.headers['Content-Disposition'] = (
+                f'attachment; filename="{_download_name(log_paths, start, end, log_format)}"')
+            return response
+
+        # Hlavička CSV iba raz, na začiatku exportu
+        segments = [(log_paths[0], 0)]
+        for path in log_paths[1:]:
+            segments.append((path, first_line_length(path) if log_format == LogFormat.CSV else 0))
+        log_file = ConcatenatedFile(segments)
+
+        if accepts_gzip(request) and 'Range' not in request.headers:
+            response = _streamed_response(iter_file(log_file), LOG_MIMETYPES[log_format], etag)
+        else:
+            # Nekomprimovaná odpoveď podporuje Range (pokračovanie prerušeného sťahovania)
+            response = Response(wrap_file(request.environ, log_file), mimetype=LOG_MIMETYPES[log_format],
+                                direct_passthrough=True)
+            response.content_length = log_file.length
+            response.last_modified = datetime.fromtimestamp(max(path.stat().st_mtime for path in log_paths))
+            response.vary.add('Accept-Encoding')
+            response.cache_control.no_cache = True
+            response.set_etag(etag)
+            response = response.make_conditional(request, accept_ranges=True, complete_length=log_file.length)
 
-        # Ak súbor existuje, pošleme ho na stiahnutie
-        return send_file(log_path, as_attachment=True, cache_timeout=0)
+        response.headers['Content-Disposition'] = (
+            f'attachment; filename="{_download_name(log_paths, start, end, log_format)}"')
+        return response
 
     return routes
\ No newline at end of file
@@ -1,11 +1,28 @@
 import csv
 import json
-from datetime import datetime
+import os
+import sqlite3
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from dataclasses import dataclass
 from enum import Enum
+from log_compression import decompress_file, is_compressed, open_log, resolve_log_path
+from log_index import IndexWriter
+from rollups import RollupAggregator
+from sqlite_store import SqliteStore, format_timestamp
+from metrics import (LOG_BYTES_READ, LOG_READ_SECONDS, LOG_ROWS_DROPPED, LOG_ROWS_WRITTEN, LOG_SAVE_SECONDS,
+                     LOG_WRITE_ERRORS)
+
+try:
+    import numpy as np
+except ImportError:  # numpy je potrebný iba na čítanie binárneho formátu
+    np = None
 
 logger = logging.getLogger(__name__)
 
@@ -13,13 +30,43 @@ logger = logging.getLogger(__name__)
 class LogFormat(Enum):
     CSV = "csv"
     JSON = "json"
+    JSONL = "jsonl"
+    BINARY = "bin"
+    SQLITE = "sqlite"
+
+
+# Binárny záznam s pevnou dĺžkou 10 bajtov: čas (epoch s), index senzora,
+# teplota a vlhkosť v stotinách ako int16 - presne to, čo posiela slave
+BINARY_RECORD = struct.Struct('<IHhh')
+# Kód chýbajúcej hodnoty kanála v binárnom zázname (CSV má prázdne pole, JSON null)
+BINARY_NODATA = -32768
+# Fyzický rozsah senzora; limity [Sensors] sú len prahy alarmov
+TEMPERATURE_RANGE = (-50.0, 100.0)
+HUMIDITY_RANGE = (0.0, 100.0)
+if np is not None:
+    BINARY_DTYPE = np.dtype([
+        ('timestamp', '<u4'),
+        ('sensor', '<u2'),
+        ('temperature', '<i2'),
+        ('humidity', '<i2')
+    ])
+SENSOR_INDEX_FILE = 'sensor_ids.json'
+# Po chybe zápisu buffer drží najviac toľkoto dávok, staršie riadky sa zahodia
+MAX_PENDING_BATCHES = 10
+
+
+def record_value(value, missing: Optional[float] = None) -> Optional[float]:
+    """Hodnota kanála zo záznamu logu; prázdne pole (CSV) alebo null (JSON) je `missing`."""
+    if value is None or value == '':
+        return missing
+    return float(value)
 
 
 @dataclass
 class SensorReading:
     sensor_id: str
-    temperature: float
-    humidity: float
+    temperature: Optional[float]
+    humidity: Optional[float]
     timestamp: Optional[datetime] = None
 
     def __post_init__(self):
@@ -27,24 +74,198 @@ class SensorReading:
             self.timestamp = datetime.now()
 
     def validate(self) -> bool:
+        """Kanály sa kontrolujú samostatne voči fyzickému rozsahu senzora.
+
+        Neplatný kanál je None; meranie bez jediného platného kanála sa nezapíše.
+        """
         try:
+           if self.temperature is None and self.humidity is None:
+               return False
            return (
                 #isinstance(self.sensor_id, str) and
                 #isinstance(self.temperature, (int, float)) and
                 #isinstance(self.humidity, int, float) and
-                0 <= self.humidity <= 100 and
-                -50 <= self.temperature <= 100
+                (self.humidity is None or HUMIDITY_RANGE[0] <= self.humidity <= HUMIDITY_RANGE[1]) and
+                (self.temperature is None or TEMPERATURE_RANGE[0] <= self.temperature <= TEMPERATURE_RANGE[1])
             )
         except (TypeError, ValueError):
             return False
 
 
+class _BufferedWriter:
+    """Drží otvorený denný súbor a zapisuje riadky v dávkach.
+
+    Dávka sa zapíše pri dosiahnutí `buffer_size` riadkov alebo po uplynutí
+    `flush_interval` sekúnd od posledného zápisu. Súbor sa určuje podľa
+    časovej pečiatky merania, takže prechod cez polnoc otvorí nový súbor
+    aj s hlavičkou. Riadky, ktoré sa pri chybe nezapísali, sa vrátia
+    do buffera a zapíšu sa pri ďalšom pokuse.
+    """
+
+    def __init__(self, sensor_logger: 'SensorLogger', buffer_size: int, flush_interval: float):
+        self.sensor_logger = sensor_logger
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._pending: List[SensorReading] = []
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_path: Optional[Path] = None
+        self._csv_writer = None
+        self._is_csv = sensor_logger.format == LogFormat.CSV
+        self._is_binary = sensor_logger.format == LogFormat.BINARY
+        self._is_sqlite = sensor_logger.format == LogFormat.SQLITE
+        self._last_flush = time.monotonic()
+        # Po chybe zápisu ďalší pokus z `append` najskôr v tomto čase
+        self._retry_at = 0.0
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._run_flusher, name='log-flusher', daemon=True)
+            self._flusher.start()
+
+    def append(self, reading: SensorReading) -> None:
+        with self._lock:
+            self._pending.append(reading)
+            now = time.monotonic()
+            if ((len(self._pending) >= self.buffer_size or now - self._last_flush >= self.flush_interval)
+                    and now >= self._retry_at):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            self._flush_locked()
+            self._close_file()
+            if self._pending:
+                LOG_ROWS_DROPPED.inc(len(self._pending), format=self.sensor_logger.format.value)
+                logger.error(f"Pri zatvorení logu sa nezapísalo {len(self._pending)} riadkov")
+                self._pending = []
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+
+    def _run_flusher(self) -> None:
+        # Zápis aj vtedy, keď nové merania neprichádzajú (napr. výpadok slave)
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if self._is_sqlite:
+            # Celá dávka v jednej transakcii, pri chybe sa vráti celá
+            try:
+                self.sensor_logger.store.insert([self.sensor_logger._format_sqlite_row(reading) for reading in pending])
+                LOG_ROWS_WRITTEN.inc(len(pending), format=self.sensor_logger.format.value)
+            except sqlite3.Error as e:
+                logger.error(f"Chyba pri zápise do databázy {self.sensor_logger.store.path}: {e}")
+                self._requeue(pending)
+            return
+        day = None
+        written = 0
+        try:
+            for reading in pending:
+                # Cesta k dennému súboru sa počíta iba pri zmene dňa
+                if reading.timestamp.date() != day:
+                    day = reading.timestamp.date()
+                    file_path = self.sensor_logger._get_log_file_path(reading.timestamp)
+                    if file_path != self._file_path:
+                        self._open_file(file_path)
+                self.sensor_logger._note_index(file_path, reading.timestamp, self._file)
+                if self._is_csv:
+                    self._csv_writer.writerow(self.sensor_logger._format_csv_row(reading))
+                elif self._is_binary:
+                    self._file.write(self.sensor_logger._pack_binary_record(reading))
+                else:
+                    self._file.write(self.sensor_logger._format_jsonl_line(reading))
+                written += 1
+            self._file.flush()
+            LOG_ROWS_WRITTEN.inc(len(pending), format=self.sensor_logger.format.value)
+        except OSError as e:
+            logger.error(f"Chyba pri zápise do logu {self._file_path}: {e}")
+            LOG_ROWS_WRITTEN.inc(written, format=self.sensor_logger.format.value)
+            # Súbor sa pri ďalšom pokuse otvorí znova, nezapísané riadky sa vrátia
+            try:
+                self._close_file()
+            except OSError:
+                self._file = None
+                self._file_path = None
+                self._csv_writer = None
+            self._requeue(pending[written:])
+
+    def _requeue(self, rows: List[SensorReading]) -> None:
+        log_format = self.sensor_logger.format.value
+        LOG_WRITE_ERRORS.inc(format=log_format)
+        self._retry_at = time.monotonic() + max(self.flush_interval, 1.0)
+        self._pending = rows + self._pending
+        limit = max(self.buffer_size, 1) * MAX_PENDING_BATCHES
+        if len(self._pending) > limit:
+            dropped = len(self._pending) - limit
+            LOG_ROWS_DROPPED.inc(dropped, format=log_format)
+            logger.error(f"Buffer logu je plný, zahodilo sa {dropped} najstarších riadkov")
+            self._pending = self._pending[dropped:]
+
+    def _open_file(self, file_path: Path) -> None:
+        self._close_file()
+        self.sensor_logger._prepare_log_file(file_path)
+        if self._is_binary:
+            self._file = open(file_path, mode='ab')
+        else:
+            self._file = open(file_path, mode='a', newline='', encoding='utf-8')
+        self._file_path = file_path
+        if self._is_csv:
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=self.sensor_logger.fieldnames, delimiter=';')
+            # V režime 'a' je pozícia na konci súboru, prázdny súbor dostane hlavičku
+            if self._file.tell() == 0:
+                self._csv_writer.writeheader()
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+            self._file = None
+            self._file_path = None
+            self._csv_writer = None
+
+
 class SensorLogger:
-    def __init__(self, base_path: str = "logs", format: LogFormat = LogFormat.CSV):
+    def __init__(self, base_path: str = "logs", format: LogFormat = LogFormat.CSV,
+                 buffer_size: int = 0, flush_interval: float = 5.0, index_bucket: int = 300,
+                 rollups: bool = False):
         self.base_path = Path(base_path)
         self.format = format
         self.fieldnames = ['timestamp', 'sensor_id', 'temperature', 'humidity']
         self._ensure_log_directory()
+        self._sensor_ids: List[str] = []
+        self._sensor_index: Dict[str, int] = {}
+        if format == LogFormat.BINARY:
+            self._sensor_ids = load_sensor_ids(self.base_path)
+            self._sensor_index = {sensor_id: i for i, sensor_id in enumerate(self._sensor_ids)}
+        # Riedky index (kôš -> offset) pre textové formáty, binárny sa prehľadáva priamo
+        self._index: Optional[IndexWriter] = None
+        if format in (LogFormat.CSV, LogFormat.JSONL):
+            self._index = IndexWriter(self.parse_line_timestamp, index_bucket)
+        # 1-minútové a 1-hodinové agregáty pre dlhé grafy
+        self.rollups: Optional[RollupAggregator] = RollupAggregator(self.base_path) if rollups else None
+        # Formát sqlite ukladá všetky dni do jednej databázy s indexmi podľa času a senzora
+        self.store: Optional[SqliteStore] = SqliteStore(self.base_path) if format == LogFormat.SQLITE else None
+        # buffer_size > 0 zapne dávkový zápis (iba pre formáty, do ktorých sa dá pripisovať)
+        self._writer: Optional[_BufferedWriter] = None
+        # Zápis bez buffera a údržba logov (writes_paused) sa navzájom vylučujú
+        self._write_lock = threading.Lock()
+        if buffer_size > 0 and format in (LogFormat.CSV, LogFormat.JSONL, LogFormat.BINARY, LogFormat.SQLITE):
+            self._writer = _BufferedWriter(self, buffer_size, flush_interval)
 
     def _ensure_log_directory(self):
         self.base_path.mkdir(parents=True, exist_ok=True)
@@ -55,17 +276,81 @@ class SensorLogger:
         filename = f"sensor_log_{date.strftime('%Y_%m_%d')}.{self.format.value}"
         return self.base_path / filename
 
+    def _prepare_log_file(self, file_path: Path) -> Path:
+        """Pripraví denný súbor na zápis, prechádza ním každý zápis do súboru.
+
+        Neskorý záznam pre deň, ktorý údržba už skomprimovala, deň obnoví, aby mal
+        stále jediný súbor (znova sa skomprimuje pri ďalšej údržbe). Inak by vedľa
+        archívu vznikol nový súbor, ktorý by archív pri kompresii prepísal.
+        """
+        existing = resolve_log_path(file_path)
+        if existing is not None and existing != file_path:
+            decompress_file(existing)
+        return file_path
+
+    def get_log_file_paths(self, start: datetime, end: datetime) -> List[Path]:
+        """Cesty k denným súborom pre všetky dni v rozsahu (aj neexistujúce)."""
+        paths = []
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            paths.append(self._get_log_file_path(day))
+            day += timedelta(days=1)
+        return paths
+
+    def existing_log_files(self, start: datetime, end: datetime) -> List[Path]:
+        """Existujúce denné súbory v rozsahu, nekomprimované aj komprimované (.gz, .zst)."""
+        if self.store is not None:
+            return [self.store.path] if self.store.path.exists() else []
+        paths = [resolve_log_path(path) for path in self.get_log_file_paths(start, end)]
+        return [path for path in paths if path is not None]
+
+    @contextmanager
+    def writes_paused(self, file_path: Optional[Path] = None):
+        """Počas bloku zapisovač nič nezapíše; `file_path` sa zavrie, ak je práve otvorený."""
+        if self._writer is None:
+            with self._write_lock:
+                yield
+            return
+        with self._writer._lock:
+            self._writer._flush_locked()
+            if file_path is not None and self._writer._file_path == file_path:
+                self._writer._close_file()
+            yield
+
     def save_reading(self, reading: SensorReading) -> bool:
         if not reading.validate():
             return False
 
-        if self.format == LogFormat.CSV:
-            return self._save_to_csv(reading)
-        elif self.format == LogFormat.JSON:
-            return self._save_to_json(reading)
+        start = time.perf_counter()
+        if self.rollups is not None:
+            self.rollups.add(reading)
+
+        saved = False
+        if self._writer is not None:
+            # Riadky sa započítajú do metriky až pri zápise dávky
+            self._writer.append(reading)
+            saved = True
+        else:
+            with self._write_lock:
+                if self.format == LogFormat.CSV:
+                    saved = self._save_to_csv(reading)
+                elif self.format == LogFormat.JSONL:
+                    saved = self._save_to_jsonl(reading)
+                elif self.format == LogFormat.BINARY:
+                    saved = self._save_to_binary(reading)
+                elif self.format == LogFormat.JSON:
+                    saved = self._save_to_json(reading)
+                elif self.format == LogFormat.SQLITE:
+                    saved = self._save_to_sqlite(reading)
+            if saved:
+                LOG_ROWS_WRITTEN.inc(format=self.format.value)
+
+        LOG_SAVE_SECONDS.observe(time.perf_counter() - start, format=self.format.value)
+        return saved
 
     def _save_to_csv(self, reading: SensorReading) -> bool:
-        file_path = self._get_log_file_path()
+        # Súbor podľa času merania (nie dnešný), ako pri dávkovom zápise
+        file_path = self._prepare_log_file(self._get_log_file_path(reading.timestamp))
         file_exists = file_path.exists()
 
         with open(file_path, mode='a', newline='', encoding='utf-8') as file:
@@ -75,42 +360,312 @@ class SensorLogger:
             if not file_exists:
                 writer.writeheader()
 
+            self._note_index(file_path, reading.timestamp, file)
             # Zapíšeme riadok
-            writer.writerow({
-                'timestamp': reading.timestamp.strftime('%Y-%m-%d %H:%M'),
-                'sensor_id': reading.sensor_id,
-                'temperature': reading.temperature,
-                'humidity': reading.humidity
-            })
+            writer.writerow(self._format_csv_row(reading))
         return True
 
+    def _format_csv_row(self, reading: SensorReading) -> Dict:
+        return {
+            'timestamp': reading.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            'sensor_id': reading.sensor_id,
+            'temperature': reading.temperature,
+            'humidity': reading.humidity
+        }
+
     def _save_to_json(self, reading: SensorReading) -> bool:
-        file_path = self._get_log_file_path()
+        file_path = self._prepare_log_file(self._get_log_file_path(reading.timestamp))
         data = []
 
         if file_path.exists():
             with open(file_path, 'r', encoding='utf-8') as file:
                 data = json.load(file)
 
-        data.append({
+        data.append(self._format_json_record(reading))
+
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2)
+        return True
+
+    def _save_to_jsonl(self, reading: SensorReading) -> bool:
+        # Jeden záznam na riadok, súbor sa nikdy neprepisuje
+        file_path = self._prepare_log_file(self._get_log_file_path(reading.timestamp))
+        with open(file_path, 'a', encoding='utf-8') as file:
+            self._note_index(file_path, reading.timestamp, file)
+            file.write(self._format_jsonl_line(reading))
+        return True
+
+    def _save_to_sqlite(self, reading: SensorReading) -> bool:
+        try:
+            self.store.insert([self._format_sqlite_row(reading)])
+        except sqlite3.Error as e:
+            logger.error(f"Chyba pri zápise do databázy {self.store.path}: {e}")
+            return False
+        return True
+
+    def _format_sqlite_row(self, reading: SensorReading):
+        return (format_timestamp(reading.timestamp), reading.sensor_id, reading.temperature, reading.humidity)
+
+    def _note_index(self, file_path: Path, timestamp: datetime, file) -> None:
+        if self._index is not None:
+            self._index.note(file_path, timestamp, file)
+
+    def parse_line_timestamp(self, line: bytes) -> Optional[datetime]:
+        """Časová pečiatka jedného riadku textového logu (None pre hlavičku a chybné riadky)."""
+        try:
+            if self.format == LogFormat.CSV:
+                return datetime.fromisoformat(line.split(b';', 1)[0].decode('utf-8'))
+            return datetime.fromisoformat(json.loads(line)['timestamp'])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _save_to_binary(self, reading: SensorReading) -> bool:
+        with open(self._prepare_log_file(self._get_log_file_path(reading.timestamp)), 'ab') as file:
+            file.write(self._pack_binary_record(reading))
+        return True
+
+    def _pack_binary_record(self, reading: SensorReading) -> bytes:
+        return BINARY_RECORD.pack(
+            int(reading.timestamp.timestamp()),
+            self._get_sensor_index(reading.sensor_id),
+            _binary_value(reading.temperature),
+            _binary_value(reading.humidity)
+        )
+
+    def _get_sensor_index(self, sensor_id: str) -> int:
+        index = self._sensor_index.get(sensor_id)
+        if index is None:
+            # Nový senzor sa pridá na koniec, existujúce indexy sa nemenia
+            index = len(self._sensor_ids)
+            self._sensor_ids.append(sensor_id)
+            self._sensor_index[sensor_id] = index
+            save_sensor_ids(self.base_path, self._sensor_ids)
+        return index
+
+    def _format_json_record(self, reading: SensorReading) -> Dict:
+        return {
             'timestamp': reading.timestamp.isoformat(),
             'sensor_id': reading.sensor_id,
             'temperature': reading.temperature,
             'humidity': reading.humidity
-        })
+        }
 
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=2)
-        return True
+    def _format_jsonl_line(self, reading: SensorReading) -> str:
+        return json.dumps(self._format_json_record(reading), separators=(',', ':')) + '\n'
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Zapíše čakajúce riadky a uzavrie súbor (volať pri vypnutí)."""
+        if self._writer is not None:
+            self._writer.close()
+        if self.rollups is not None:
+            self.rollups.close()
+        if self.store is not None:
+            self.store.close()
 
     def get_readings(self, date: Optional[datetime] = None) -> List[Dict]:
-        file_path = self._get_log_file_path(date)
-        if not file_path.exists():
-            return []
+        with LOG_READ_SECONDS.time(format=self.format.value, kind='day'):
+            return list(self.iter_readings(date))
 
+    def last_timestamp(self, date: datetime) -> Optional[datetime]:
+        """Čas posledného záznamu dňa v logu (None, ak deň nemá záznamy)."""
+        if self.store is not None:
+            self.flush()
+            day = date.replace(hour=0, minute=0, second=0, microsecond=0)
+            return self.store.last_timestamp(day, day + timedelta(days=1) - timedelta(seconds=1))
+        # Pečiatky jedného formátu majú pevný tvar, porovnávajú sa ako reťazce
+        last = max((record['timestamp'] for record in self.iter_readings(date)), default=None)
+        return datetime.fromisoformat(last) if last is not None else None
+
+    def iter_readings(self, date: Optional[datetime] = None) -> Iterator[Dict]:
+        """Postupne číta záznamy z denného súboru bez načítania celého súboru."""
+        # Čitateľ musí vidieť aj riadky, ktoré ešte čakajú v bufferi
+        self.flush()
+        if self.store is not None:
+            day = (date or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+            yield from self.store.query(day, day + timedelta(days=1) - timedelta(seconds=1))
+            return
+        file_path = resolve_log_path(self._get_log_file_path(date))
+        if file_path is None:
+            return
+
+        # Celý denný súbor sa prečíta (komprimovaný sa dekomprimuje priebežne)
+        LOG_BYTES_READ.inc(file_path.stat().st_size, format=self.format.value)
         if self.format == LogFormat.CSV:
-            with open(file_path, mode='r', encoding='utf-8') as file:
-                return list(csv.DictReader(file))
+            with open_log(file_path, text=True) as file:
+                yield from csv.DictReader(file, delimiter=';')
+        elif self.format == LogFormat.JSONL:
+            with open_log(file_path, text=True) as file:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
         elif self.format == LogFormat.JSON:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
\ No newline at end of file
+            with open_log(file_path, text=True) as file:
+                yield from json.load(file)
+        elif self.format == LogFormat.BINARY:
+            records = read_binary_log(file_path)
+            yield from binary_records_to_dicts(records, self._resolve_sensor_ids(records))
+
+    def read_binary(self, date: Optional[datetime] = None):
+        """Denný binárny log ako štruktúrované pole numpy (memory-map, bez kopírovania)."""
+        self.flush()
+        return read_binary_log(self._get_log_file_path(date))
+
+    def iter_binary_days(self, start: datetime, end: datetime):
+        """Pre každý deň v rozsahu vráti dvojicu (dátum, memory-mapped pole)."""
+        self.flush()
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            yield day, read_binary_log(self._get_log_file_path(day))
+            day += timedelta(days=1)
+
+    @property
+    def sensor_ids(self) -> List[str]:
+        return list(self._sensor_ids)
+
+    def _resolve_sensor_ids(self, records) -> List[str]:
+        # Iný proces mohol medzitým zaregistrovať nový senzor
+        if len(records) and int(records['sensor'].max()) >= len(self._sensor_ids):
+            self._sensor_ids = load_sensor_ids(self.base_path)
+            self._sensor_index = {sensor_id: i for i, sensor_id in enumerate(self._sensor_ids)}
+        return self._sensor_ids
+
+
+def load_sensor_ids(base_path) -> List[str]:
+    index_path = Path(base_path) / SENSOR_INDEX_FILE
+    if not index_path.exists():
+        return []
+    with open(index_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_sensor_ids(base_path, sensor_ids: List[str]) -> None:
+    index_path = Path(base_path) / SENSOR_INDEX_FILE
+    tmp_path = index_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(sensor_ids, file)
+    os.replace(tmp_path, index_path)
+
+
+def read_binary_log(file_path):
+    """Namapuje binárny log do pamäte ako pole s typom `BINARY_DTYPE`.
+
+    Komprimovaný deň (.gz, .zst) sa celý dekomprimuje do pamäte.
+    """
+    if np is None:
+        raise RuntimeError("Binárny formát logu vyžaduje balík numpy")
+    file_path = resolve_log_path(file_path)
+    if file_path is not None and is_compressed(file_path):
+        with open_log(file_path) as file:
+            data = file.read()
+        return np.frombuffer(data, dtype=BINARY_DTYPE, count=len(data) // BINARY_DTYPE.itemsize)
+    count = file_path.stat().st_size // BINARY_DTYPE.itemsize if file_path is not None else 0
+    if count == 0:
+        return np.empty(0, dtype=BINARY_DTYPE)
+    # Neúplný posledný záznam (napr. po výpadku napájania) sa ignoruje
+    return np.memmap(file_path, dtype=BINARY_DTYPE, mode='r', shape=(count,))
+
+
+def local_datetime64(epochs):
+    """Prevedie epoch sekundy na lokálny čas (rovnaký ako `datetime.now()` pri zápise)."""
+    if len(epochs) == 0:
+        return np.empty(0, dtype='datetime64[s]')
+    first, last = int(epochs[0]), int(epochs[-1])
+    offset = _utc_offset(first)
+    if offset == _utc_offset(last):
+        return (epochs.astype('int64') + offset).astype('datetime64[s]')
+    # Zmena letného času počas dňa - posun sa počíta pre každý záznam
+    return np.array([datetime.fromtimestamp(int(t)) for t in epochs], dtype='datetime64[s]')
+
+
+def _utc_offset(epoch: int) -> int:
+    return int(datetime.fromtimestamp(epoch).astimezone().utcoffset().total_seconds())
+
+
+def _binary_value(value: Optional[float]) -> int:
+    return BINARY_NODATA if value is None else int(round(value * 100))
+
+
+def binary_values(column):
+    """Stĺpec int16 v stotinách ako float pole, `BINARY_NODATA` je NaN."""
+    return np.where(column == BINARY_NODATA, np.nan, column / 100.0)
+
+
+def _binary_list(column) -> List[Optional[float]]:
+    values = (column / 100.0).tolist()
+    missing = np.flatnonzero(column == BINARY_NODATA)
+    for i in missing.tolist():
+        values[i] = None
+    return values
+
+
+def binary_records_to_dicts(records, sensor_ids: List[str]) -> Iterator[Dict]:
+    # Prevod po stĺpcoch, nie po jednotlivých záznamoch
+    timestamps = local_datetime64(records['timestamp']).astype(str)
+    ids = np.asarray(sensor_ids + ['?'], dtype=object)
+    sensors = ids[np.minimum(records['sensor'], len(sensor_ids))]
+    temperatures = _binary_list(records['temperature'])
+    humidities = _binary_list(records['humidity'])
+    for timestamp, sensor_id, temperature, humidity in zip(timestamps, sensors, temperatures, humidities):
+        yield {
+            'timestamp': timestamp.replace('T', ' '),
+            'sensor_id': sensor_id,
+            'temperature': temperature,
+            'humidity': humidity
+        }
+
+
+def convert_json_log(json_path: Path, remove_source: bool = False) -> Path:
+    """Prevedie starý súbor `sensor_log_*.json` (jedno veľké pole) na JSON Lines."""
+    json_path = Path(json_path)
+    jsonl_path = json_path.with_suffix('.' + LogFormat.JSONL.value)
+    tmp_path = jsonl_path.with_suffix(jsonl_path.suffix + '.tmp')
+
+    with open(json_path, 'r', encoding='utf-8') as file:
+        records = json.load(file)
+
+    # Ak už .jsonl existuje (zápis pokračoval v novom formáte), staré záznamy idú pred neho
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for record in records:
+            out.write(json.dumps(record, separators=(',', ':')) + '\n')
+        if jsonl_path.exists():
+            with open(jsonl_path, 'r', encoding='utf-8') as existing:
+                for line in existing:
+                    out.write(line)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_path, jsonl_path)
+
+    # Pôvodný súbor sa premenuje, aby opakované spustenie nezdvojilo záznamy
+    if remove_source:
+        json_path.unlink()
+    else:
+        json_path.rename(json_path.with_suffix(json_path.suffix + '.bak'))
+    return jsonl_path
+
+
+def convert_json_logs(base_path: str = "logs", remove_source: bool = False) -> List[Path]:
+    converted = []
+    for json_path in sorted(Path(base_path).glob('sensor_log_*.' + LogFormat.JSON.value)):
+        try:
+            converted.append(convert_json_log(json_path, remove_source))
+            logger.info(f"Prevedený log {json_path}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Chyba pri prevode {json_path}: {e}")
+    return converted
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Jednorazový prevod JSON logov na JSON Lines")
+    parser.add_argument('log_path', nargs='?', default='sensor_logs')
+    parser.add_argument('--remove', action='store_true', help="po prevode zmaže pôvodné .json súbory namiesto premenovania na .json.bak")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for path in convert_json_logs(args.log_path, args.remove):
+        print(path)
\ No newline at end of file
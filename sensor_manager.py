@@ -1,18 +1,25 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
 import logging
+from alarms import ALARM_LOG_FILE, AlarmEngine
 from sensor_logger import SensorLogger, SensorReading, LogFormat
-from typing import List, Dict
+from sensor_query import SensorQuery, numeric_values
+from rollups import choose_resolution
+from frame_decoder import FrameDecoder, DecodedSweep
+from i2c_topology import BusTopology, SweepScheduler
+from metrics import HISTORY_QUERIES, LOG_READ_SECONDS, SENSOR_ERRORS
+from recent_buffer import RecentReadings
+from typing import List, Dict, Optional
 import configparser
 import os
-import struct
 logger = logging.getLogger(__name__)
 
 
 class Config:
 
-    def __init__(self):
+    def __init__(self, config_file: str = 'config.ini'):
         self.config = configparser.ConfigParser()
-        self.config_file = 'config.ini'
+        self.config_file = config_file
         self.load_config()
 
     def load_config(self) -> None:
@@ -22,7 +29,7 @@ class Config:
 
     def create_default_config(self) -> None:
         self.config['Sensors'] = {
-            'num_sensors': '20',
+            'num_sensors': '10',
             'min_temp': '-15.0',
             'max_temp': '50.0',
             'min_humidity': '0',
@@ -30,7 +37,51 @@ class Config:
         }
         self.config['Logging'] = {
             'log_format': 'csv',
-            'log_path': 'sensor_logs'
+            'log_path': 'sensor_logs',
+            'buffer_size': '100',
+            'flush_interval': '10.0',
+            'index_bucket': '300',
+            'rollups': 'true',
+            'recent_hours': '6'
+        }
+        self.config['Alarms'] = {
+            'temp_hysteresis': '0.5',
+            'humidity_hysteresis': '2.0',
+            'max_temp_rate': '1.0',
+            'max_humidity_rate': '5.0',
+            'rate_fast_seconds': '30',
+            'rate_slow_seconds': '120',
+            'stuck_samples': '120'
+        }
+        self.config['Maintenance'] = {
+            'compression': 'gzip',
+            'compress_after_days': '1',
+            'retention_days': '0',
+            'max_total_mb': '0',
+            'interval': '3600'
+        }
+        self.config['Acquisition'] = {
+            'period': '5.0',
+            'read_timeout': '0.5',
+            'retries': '2',
+            'retry_backoff': '0.05',
+            'max_skip_cycles': '32',
+            'simulate': 'false'
+        }
+        self.config['Serving'] = {
+            'mode': 'standalone',
+            'segment': 'sensor_snapshot'
+        }
+        self.config['Visualization'] = {
+            'grid_points': '29',
+            'lod_levels': '15, 29, 57',
+            'max_grid_points': '80',
+            'cache_size': '64'
+        }
+        self.config['Bus 1'] = {
+            'addresses': '8, 9',
+            'sensors_per_slave': '5',
+            'frame_version': '1'
         }
         with open(self.config_file, 'w') as configfile:
             self.config.write(configfile)
@@ -39,49 +90,129 @@ class Config:
 
 
 class SensorDataManager:
-    def __init__(self, config: Config, bus, address):
+    def __init__(self, config: Config, bus, address=None, topology: Optional[BusTopology] = None):
+        """`bus=None` vytvorí správcu bez zbernice, ktorý iba číta logy (webový proces).
+
+        Namiesto zberníc môže byť `bus` aj zdroj zberov s metódou `next_sweep`
+        (`replay.LogReplay`), zbery potom prichádzajú zo starých logov.
+        `topology` je topológia už načítaná z config.ini (inak sa načíta znova).
+        """
         self.config = config
-        self.bus = bus  # I2C zbernica
-        self.address = address  # Adresa I2C slave
+        self.replay = None
+        if topology is None and (address is None or bus is None or isinstance(bus, dict) or
+                                 hasattr(bus, 'next_sweep')):
+            topology = BusTopology.from_config(config.config)
+        # Slovník {číslo zbernice: SMBus} s topológiou z config.ini,
+        # alebo jedna zbernica so zoznamom adries slave
+        if bus is None:
+            self.topology = topology
+            self.buses = {}
+        elif hasattr(bus, 'next_sweep'):
+            self.topology = topology
+            self.buses = {}
+            self.replay = bus
+        elif isinstance(bus, dict):
+            self.topology = topology
+            self.buses = bus
+        else:
+            self.topology = topology if topology is not None else BusTopology.single_bus(address)
+            self.buses = {number: bus for number in self.topology.buses}
+        self.address = [slave.address for slave in self.topology.slaves]  # Adresy I2C slave
         self.logger = SensorLogger(
             base_path=config.config['Logging']['log_path'],
-            format=LogFormat(config.config['Logging']['log_format'])
+            format=LogFormat(config.config['Logging']['log_format']),
+            buffer_size=config.config.getint('Logging', 'buffer_size', fallback=0) if bus is not None else 0,
+            flush_interval=config.config.getfloat('Logging', 'flush_interval', fallback=5.0),
+            index_bucket=config.config.getint('Logging', 'index_bucket', fallback=300),
+            rollups=config.config.getboolean('Logging', 'rollups', fallback=False)
+        )
+        self.query = SensorQuery(self.logger)
+        self.decoder = FrameDecoder(
+            self.address,
+            [slave.sensors for slave in self.topology.slaves],
+            frame_versions=[slave.frame_version for slave in self.topology.slaves]
+        )
+        # Alarmy (limity z [Sensors]) sa vyhodnocujú z každého zberu, zmeny stavu idú do alarms.log vedľa logov
+        self.alarms = AlarmEngine.from_config(
+            self.decoder.sensor_ids, config.config,
+            log_path=Path(config.config['Logging']['log_path']) / ALARM_LOG_FILE)
+        # Posledné hodiny v pamäti pre krátke rozsahy; proces bez zberu ich nemá a číta logy
+        self.recent = None if bus is None else RecentReadings.from_config(
+            self.decoder.sensor_ids, config.config,
+            iso_timestamps=self.logger.format in (LogFormat.JSON, LogFormat.JSONL))
+        if self.replay is not None:
+            # Opakované prehrávanie nezapíše zbery, ktoré cieľový log už má
+            self.replay.skip_logged(self.logger)
+        self.scheduler = None if not self.buses else SweepScheduler(
+            self.buses,
+            self.topology,
+            read_timeout=config.config.getfloat('Acquisition', 'read_timeout', fallback=0.5),
+            retries=config.config.getint('Acquisition', 'retries', fallback=2),
+            retry_backoff=config.config.getfloat('Acquisition', 'retry_backoff', fallback=0.05),
+            max_skip_cycles=config.config.getint('Acquisition', 'max_skip_cycles', fallback=32)
         )
 
     def generate_sensor_data(self) -> List[Dict]:
-        """Generuje údaje zo senzorov z dvoch I2C slave zariadení."""
-        data = []
+        """Generuje údaje zo senzorov zo všetkých I2C slave zariadení."""
+        if self.replay is not None:
+            # Zber zo starých logov s pôvodnou časovou pečiatkou, tempo určuje prehrávanie
+            timestamp, sweep = self.replay.next_sweep(self.decoder.sensor_ids)
+            return self.process_sweep(sweep, timestamp)
+        # Zbernice sa čítajú paralelne, slave na jednej zbernici postupne
+        frames = self.scheduler.sweep()
+        return self.process_sweep(self.decoder.decode(frames))
+
+    def close(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.close()
+        if self.replay is not None:
+            self.replay.close()
+        self.logger.close()
+
+    def process_sweep(self, sweep: DecodedSweep, timestamp: Optional[datetime] = None) -> List[Dict]:
+        """Zapíše platné merania jedného zberu do logu a vráti ich pre snapshot.
 
-        # Cyklus cez všetky slave zariadenia
-        for slave_addr in self.address:
-            try:
-                # Čítanie 20 bajtov
-                raw_data = self.bus.read_i2c_block_data(slave_addr, 0, 20)
-
-                for i in range(5):  # 5 senzorov na jednom slave zariadení
-                    # Spracovanie údajov: teplota (2 bajty), vlhkosť (2 bajty)
-                    temp = struct.unpack('h', bytes(raw_data[i * 4:i * 4 + 2]))[0]
-                    hum = struct.unpack('h', bytes(raw_data[i * 4 + 2:i * 4 + 4]))[0]
-
-                    reading = SensorReading(
-                        sensor_id=f"Sensor_{slave_addr}_{i + 1}",  # Unikátny identifikátor
-                        temperature=temp / 100.0,
-                        humidity=hum / 100.0
-                    )
-
-                    if reading.validate():
-                        self.logger.save_reading(reading)
-                        data.append({
-                            'Sensor': reading.sensor_id,
-                            'Temperature': reading.temperature,
-                            'Humidity': reading.humidity,
-                            'Timestamp': reading.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    else:
-                        logger.error(f"Neplatné údaje zo senzora Sensor_{slave_addr}_{i + 1}")
-
-            except Exception as e:
-                logger.error(f"Chyba pri čítaní z adresy {slave_addr}: {e}")
+        Merania zo slave, ktorý odvtedy nemeral (rovnaké poradové číslo rámca),
+        sa do logu znova nezapíšu, v snapshote však ostanú. Meranie s jedným
+        neplatným kanálom sa zapíše s prázdnou hodnotou (None) tohto kanála.
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Jedna časová pečiatka pre celý zber
+        timestamp_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        self.alarms.update(sweep, timestamp)
+        if self.recent is not None:
+            self.recent.append(timestamp, sweep.valid & sweep.fresh, sweep.temperature, sweep.humidity)
+        temperatures = sweep.temperature.tolist()
+        humidities = sweep.humidity.tolist()
+        valid = sweep.valid.tolist()
+        complete = (sweep.temperature_valid & sweep.humidity_valid).tolist()
+        sensor_error = sweep.sensor_error.tolist()
+        present = sweep.present.tolist()
+        fresh = sweep.fresh.tolist()
+
+        data = []
+        for i, sensor_id in enumerate(sweep.sensor_ids):
+            if fresh[i] and present[i] and not complete[i]:
+                if sensor_error[i]:
+                    SENSOR_ERRORS.inc(sensor=sensor_id, reason='sentinel')
+                    logger.error(f"Chyba senzora {sensor_id} (slave hlási chybu čítania)")
+                else:
+                    SENSOR_ERRORS.inc(sensor=sensor_id, reason='range')
+                    logger.error(f"Neplatné údaje zo senzora {sensor_id}")
+            if not valid[i]:
+                continue
+            # Neplatný kanál je v poli NaN, v zázname None
+            temperature = temperatures[i] if temperatures[i] == temperatures[i] else None
+            humidity = humidities[i] if humidities[i] == humidities[i] else None
+            if fresh[i]:
+                self.logger.save_reading(SensorReading(sensor_id, temperature, humidity, timestamp))
+            data.append({
+                'Sensor': sensor_id,
+                'Temperature': temperature,
+                'Humidity': humidity,
+                'Timestamp': timestamp_str
+            })
 
         return data
 
@@ -91,3 +222,44 @@ class SensorDataManager:
 
     def get_readings_by_date(self, date: datetime) -> List[Dict]:
         return self.logger.get_readings(date)
+
+    def query_readings(self, start: datetime, end: datetime, sensor_id: Optional[str] = None) -> List[Dict]:
+        if self.recent is not None and self.recent.covers(start):
+            HISTORY_QUERIES.inc(source='memory')
+            return self.recent.query(start, end, sensor_id)
+        HISTORY_QUERIES.inc(source='disk')
+        with LOG_READ_SECONDS.time(format=self.logger.format.value, kind='range'):
+            return list(numeric_values(self.query.query(start, end, sensor_id)))
+
+    def sparklines(self, minutes: float, points: int, sensor_id: Optional[str] = None) -> Dict:
+        """Stĺpcové údaje za posledných `minutes` minút pre malé grafy."""
+        end = datetime.now()
+        start = end - timedelta(minutes=minutes)
+        recent = self.recent
+        if recent is None or not recent.covers(start):
+            # Rozsah starší ako buffer: záznamy z logov sa poskladajú do dočasného buffera
+            records = self.query_readings(start, end, sensor_id)
+            recent = RecentReadings(self.decoder.sensor_ids, max(len({r['timestamp'] for r in records}), 1),
+                                    iso_timestamps=self.logger.format in (LogFormat.JSON, LogFormat.JSONL))
+            recent.extend(records)
+        else:
+            HISTORY_QUERIES.inc(source='memory')
+        return recent.series(start, end, points, sensor_id)
+
+    def snapshot_at(self, timestamp: datetime, window: float = 300.0) -> List[Dict]:
+        """Záznamy posledného zberu v čase `timestamp` alebo pred ním (hľadá sa `window` sekúnd späť)."""
+        readings = self.query_readings(timestamp - timedelta(seconds=window), timestamp)
+        if not readings:
+            return []
+        last = readings[-1]['timestamp']
+        return [reading for reading in readings if reading['timestamp'] == last]
+
+    def get_downsampled(self, start: datetime, end: datetime, points: int,
+                        sensor_id: Optional[str] = None) -> Dict:
+        """Údaje pre graf: surové merania alebo najjemnejší agregát s najviac `points` bodmi."""
+        period = self.config.config.getfloat('Acquisition', 'period', fallback=5.0)
+        resolution = choose_resolution(start, end, points, period)
+        if resolution is None or self.logger.rollups is None:
+            return {'resolution': 'raw', 'data': self.query_readings(start, end, sensor_id)}
+        return {'resolution': resolution,
+                'data': self.logger.rollups.query(resolution, start, end, sensor_id)}
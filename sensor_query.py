@@ -0,0 +1,118 @@
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from log_compression import open_log, resolve_log_path
+from log_index import build_index, find_offset, load_index
+from sensor_logger import SensorLogger, LogFormat, read_binary_log, binary_records_to_dicts, record_value
+from metrics import LOG_BYTES_READ
+
+logger = logging.getLogger(__name__)
+
+
+def numeric_values(records: Iterable[Dict]) -> Iterator[Dict]:
+    """Záznamy s teplotou a vlhkosťou ako čísla, rovnako ako z pamäte (CSV log ich číta ako reťazce).
+
+    Neplatný kanál (prázdne pole CSV) je None.
+    """
+    for record in records:
+        record['temperature'] = record_value(record['temperature'])
+        record['humidity'] = record_value(record['humidity'])
+        yield record
+
+
+class SensorQuery:
+    """Dotazy na časový rozsah a senzor naprieč dennými súbormi `sensor_log_YYYY_MM_DD`.
+
+    Textové logy sa čítajú od offsetu z riedkeho indexu a čítanie sa skončí
+    pri prvom riadku po konci rozsahu. Binárny log je zoradený podľa času,
+    takže rozsah sa nájde binárnym vyhľadávaním v memory-mapped poli.
+    """
+
+    def __init__(self, sensor_logger: SensorLogger):
+        self.sensor_logger = sensor_logger
+
+    def query(self, start: datetime, end: datetime, sensor_id: Optional[str] = None) -> Iterator[Dict]:
+        # Riadky čakajúce v bufferi zapisovača musia byť viditeľné
+        self.sensor_logger.flush()
+        if self.sensor_logger.store is not None:
+            # Databáza odpovie z indexu (sensor_id, timestamp) alebo (timestamp)
+            yield from self.sensor_logger.store.query(start, end, sensor_id)
+            return
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            file_path = resolve_log_path(self.sensor_logger._get_log_file_path(day))
+            if file_path is not None:
+                yield from self.query_file(file_path, start, end, sensor_id)
+            day += timedelta(days=1)
+
+    def query_file(self, file_path: Path, start: datetime, end: datetime,
+                   sensor_id: Optional[str] = None) -> Iterator[Dict]:
+        """Dotaz na jeden denný súbor (aj komprimovaný), napr. zadaný v príkazovom riadku."""
+        log_format = self.sensor_logger.format
+        if log_format in (LogFormat.CSV, LogFormat.JSONL):
+            yield from self._query_text(file_path, start, end, sensor_id)
+        elif log_format == LogFormat.BINARY:
+            yield from self._query_binary(file_path, start, end, sensor_id)
+        elif log_format == LogFormat.JSON:
+            with open_log(file_path, text=True) as file:
+                for record in json.load(file):
+                    if self._matches(record, start, end, sensor_id):
+                        yield record
+
+    def _query_text(self, file_path: Path, start: datetime, end: datetime,
+                    sensor_id: Optional[str]) -> Iterator[Dict]:
+        parse_timestamp = self.sensor_logger.parse_line_timestamp
+        entries = load_index(file_path)
+        if not entries:
+            entries = build_index(file_path, parse_timestamp, self.sensor_logger._index.bucket_seconds)
+        offset = find_offset(entries, start.timestamp()) or 0
+
+        is_csv = self.sensor_logger.format == LogFormat.CSV
+        fieldnames = self.sensor_logger.fieldnames
+        # Pri komprimovanom súbore sa seek dopredu vykoná dekompresiou, parsovanie sa aj tak preskočí
+        with open_log(file_path) as file:
+            file.seek(offset)
+            try:
+                for line in file:
+                    timestamp = parse_timestamp(line)
+                    if timestamp is None or timestamp < start:
+                        continue
+                    if timestamp > end:
+                        # Riadky sú zapisované chronologicky
+                        break
+                    if is_csv:
+                        record = dict(zip(fieldnames, line.decode('utf-8').rstrip('\r\n').split(';')))
+                    else:
+                        record = json.loads(line)
+                    if sensor_id is None or record['sensor_id'] == sensor_id:
+                        yield record
+            finally:
+                LOG_BYTES_READ.inc(file.tell() - offset, format=self.sensor_logger.format.value)
+
+    def _query_binary(self, file_path: Path, start: datetime, end: datetime,
+                      sensor_id: Optional[str]) -> Iterator[Dict]:
+        records = read_binary_log(file_path)
+        timestamps = records['timestamp']
+        low = timestamps.searchsorted(int(start.timestamp()), side='left')
+        high = timestamps.searchsorted(int(end.timestamp()), side='right')
+        records = records[low:high]
+        LOG_BYTES_READ.inc(records.nbytes, format=LogFormat.BINARY.value)
+        sensor_ids = self.sensor_logger._resolve_sensor_ids(records)
+        if sensor_id is not None:
+            if sensor_id not in sensor_ids:
+                return
+            records = records[records['sensor'] == sensor_ids.index(sensor_id)]
+        yield from binary_records_to_dicts(records, sensor_ids)
+
+    @staticmethod
+    def _matches(record: Dict, start: datetime, end: datetime, sensor_id: Optional[str]) -> bool:
+        if sensor_id is not None and record.get('sensor_id') != sensor_id:
+            return False
+        try:
+            timestamp = datetime.fromisoformat(record['timestamp'])
+        except (KeyError, ValueError):
+            return False
+        return start <= timestamp <= end
@@ -0,0 +1,436 @@
+"""Interpolácia a 3D vykreslenie snapshotov, bez závislosti od GUI.
+
+pandas, Plotly a SciPy sa načítajú až pri prvom použití, takže modul sa dá
+rýchlo importovať vo webovej aplikácii aj na serveri bez displeja. Jeden
+snapshot z logu sa dá vykresliť aj z príkazového riadku:
+
+    python sensor_visualizer.py sensor_logs/sensor_log_2024_05_01.csv --at "2024-05-01 12:00" -o snimka.html
+    python sensor_visualizer.py sensor_logs/sensor_log_2024_05_01.bin.gz --at "2024-05-01 12:00" -o snimka.npz
+
+Formát výstupu (html, json, npz) sa určí podľa prípony alebo cez --format.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from interpolation import LOD_LEVELS, RbfInterpolationEngine
+from log_compression import logical_path
+from sensor_logger import binary_values, read_binary_log, load_sensor_ids, local_datetime64
+from snapshot_log import CHUNK_ROWS, CSV_DTYPES, SnapshotLog
+
+OUTPUT_FORMATS = ('html', 'json', 'npz')
+
+PLOT_CONFIG = {
+    'temperature': {
+        'column': 'temperature',
+        'title': '3D Temperature Distribution',
+        'colorscale': 'jet',
+        'vmin': -40,
+        'vmax': 150
+    },
+    'humidity': {
+        'column': 'humidity',
+        'title': '3D Humidity Distribution',
+        'colorscale': 'Blues',
+        'vmin': 0,
+        'vmax': 100
+    }
+}
+
+
+class SensorVisualizer:
+    def __init__(self):
+        self.room_width = 3.5  # X
+        self.room_length = 3.5  # Y
+        self.room_height = 3.0  # Z
+        self.generate_sensor_coordinates()
+        self._engines = {}
+        self._grids = {}
+
+    def load_log(self, filename):
+        import pandas as pd
+        if logical_path(Path(filename)).suffix == '.bin':
+            # Binárny log sa mapuje priamo do pamäte, bez parsovania textu
+            records = read_binary_log(filename)
+            sensor_ids = np.asarray(load_sensor_ids(Path(filename).parent) + ['?'], dtype=object)
+            return pd.DataFrame({
+                'timestamp': local_datetime64(records['timestamp']),
+                'sensor_id': sensor_ids[np.minimum(records['sensor'], len(sensor_ids) - 1)],
+                'temperature': binary_values(records['temperature']),
+                'humidity': binary_values(records['humidity'])
+            })
+        return pd.read_csv(filename, sep=';', dtype=CSV_DTYPES)
+
+    def load_snapshots(self, filenames, chunksize=CHUNK_ROWS):
+        # Jeden prechod cez súbory, riadky zoskupené podľa času a senzora
+        if isinstance(filenames, (str, Path)):
+            filenames = [filenames]
+        return SnapshotLog.from_files(filenames, chunksize=chunksize)
+
+    def snapshot_data(self, snapshot_log, index):
+        return snapshot_log.frame(index, len(self.x_coords))
+
+    def generate_sensor_coordinates(self):
+
+        offset = 0
+
+        wall_sensors = [
+
+            (0.0, self.room_length / 4, self.room_height / 4),
+            (0.0, 3 * self.room_length / 4, self.room_height / 4),
+            (0.0, self.room_length / 2, 3 * self.room_height / 4),
+
+
+            (self.room_width, self.room_length / 4, self.room_height / 4),
+            (self.room_width, 3 * self.room_length / 4, self.room_height / 4),
+            (self.room_width, self.room_length / 2, 3 * self.room_height / 4),
+
+
+            (self.room_width / 4, 0.0, self.room_height / 4),
+            (3 * self.room_width / 4, 0.0, self.room_height / 4),
+            (self.room_width / 2, 0.0, 3 * self.room_height / 4),
+
+
+            (self.room_width / 4, self.room_length, self.room_height / 4),
+            (3 * self.room_width / 4, self.room_length, self.room_height / 4),
+            (self.room_width / 2, self.room_length, 3 * self.room_height / 4)
+        ]
+
+        floor_sensors = [
+            (self.room_width / 4, self.room_length / 4, 0.0),
+            (3 * self.room_width / 4, self.room_length / 4, 0.0),
+            (self.room_width / 4, 3 * self.room_length / 4, 0.0),
+            (3 * self.room_width / 4, 3 * self.room_length / 4, 0.0)
+        ]
+
+        ceiling_sensors = [
+            (self.room_width / 4, self.room_length / 4, self.room_height),
+            (3 * self.room_width / 4, self.room_length / 4, self.room_height),
+            (self.room_width / 4, 3 * self.room_length / 4, self.room_height),
+            (3 * self.room_width / 4, 3 * self.room_length / 4, self.room_height)
+        ]
+
+
+        all_sensors = wall_sensors + floor_sensors + ceiling_sensors
+
+
+        self.x_coords = np.array([x for x, y, z in all_sensors])
+        self.y_coords = np.array([y for x, y, z in all_sensors])
+        self.z_coords = np.array([z for x, y, z in all_sensors])
+
+
+    def generate_virtual_points(self, points, values):
+        virtual_points = []
+        virtual_values = []
+        extension = 0.3
+        edges = [
+
+            (0, 0, self.room_height / 2),
+            (0, self.room_length, self.room_height / 2),
+            (self.room_width, 0, self.room_height / 2),
+            (self.room_width, self.room_length, self.room_height / 2),
+
+            (self.room_width / 2, 0, 0),
+            (self.room_width / 2, self.room_length, 0),
+            (0, self.room_length / 2, 0),
+            (self.room_width, self.room_length / 2, 0),
+
+            (self.room_width / 2, 0, self.room_height),
+            (self.room_width / 2, self.room_length, self.room_height),
+            (0, self.room_length / 2, self.room_height),
+            (self.room_width, self.room_length / 2, self.room_height)
+        ]
+
+        for edge in edges:
+            virtual_points.append(edge)
+            distances = np.sqrt(
+                (points[:, 0] - edge[0]) ** 2 +
+                (points[:, 1] - edge[1]) ** 2 +
+                (points[:, 2] - edge[2]) ** 2
+            )
+            nearest_indices = np.argsort(distances)[:2]
+            virtual_values.append(np.mean(values[nearest_indices]))
+
+        for i, (x, y, z) in enumerate(points):
+            if x <= 0.1:
+                virtual_points.append([-extension, y, z])
+                virtual_values.append(values[i])
+            elif x >= self.room_width - 0.1:
+                virtual_points.append([self.room_width + extension, y, z])
+                virtual_values.append(values[i])
+
+            if y <= 0.1:
+                virtual_points.append([x, -extension, z])
+                virtual_values.append(values[i])
+            elif y >= self.room_length - 0.1:
+                virtual_points.append([x, self.room_length + extension, z])
+                virtual_values.append(values[i])
+
+            if z <= 0.1:  # Пол
+                virtual_points.append([x, y, -extension])
+                virtual_values.append(values[i])
+            elif z >= self.room_height - 0.1:
+                virtual_points.append([x, y, self.room_height + extension])
+                virtual_values.append(values[i])
+
+        corners_ext = [
+            (-extension, -extension, -extension),
+            (-extension, -extension, self.room_height + extension),
+            (-extension, self.room_length + extension, -extension),
+            (-extension, self.room_length + extension, self.room_height + extension),
+            (self.room_width + extension, -extension, -extension),
+            (self.room_width + extension, -extension, self.room_height + extension),
+            (self.room_width + extension, self.room_length + extension, -extension),
+            (self.room_width + extension, self.room_length + extension, self.room_height + extension)
+        ]
+
+        for corner in corners_ext:
+            virtual_points.append(corner)
+            distances = np.sqrt(
+                (points[:, 0] - corner[0]) ** 2 +
+                (points[:, 1] - corner[1]) ** 2 +
+                (points[:, 2] - corner[2]) ** 2
+            )
+            nearest_idx = np.argmin(distances)
+            virtual_values.append(values[nearest_idx])
+
+        return (np.vstack([points, virtual_points]),
+                np.hstack([values, virtual_values]))
+
+    def interpolation_engine(self, grid_points=60):
+        # Geometria je pevná, operátor sa počíta raz pre každú veľkosť mriežky
+        engine = self._engines.get(grid_points)
+        if engine is None:
+            points = np.column_stack((self.x_coords, self.y_coords, self.z_coords))
+            engine = RbfInterpolationEngine(points, self.generate_virtual_points, self.grid_axes(grid_points),
+                                            function='quintic', epsilon=0.8, smooth=0.05)
+            self._engines[grid_points] = engine
+        return engine
+
+    def grid_axes(self, grid_points=60):
+        return (np.linspace(-0.3, self.room_width + 0.3, grid_points),
+                np.linspace(-0.3, self.room_length + 0.3, grid_points),
+                np.linspace(-0.3, self.room_height + 0.3, grid_points))
+
+    def grid(self, grid_points=60):
+        if grid_points not in self._grids:
+            self._grids[grid_points] = self._build_grid(grid_points)
+        return self._grids[grid_points]
+
+    def _build_grid(self, grid_points):
+        xi, yi, zi = self.grid_axes(grid_points)
+        grid_x, grid_y, grid_z = np.meshgrid(xi, yi, zi, indexing='ij')
+
+        mask = ((grid_x >= -0.01) & (grid_x <= self.room_width + 0.01) &
+                (grid_y >= -0.01) & (grid_y <= self.room_length + 0.01) &
+                (grid_z >= -0.01) & (grid_z <= self.room_height + 0.01))
+        return grid_x, grid_y, grid_z, mask
+
+    def interpolate_grid(self, values, grid_points=60):
+        grid_values = self.interpolation_engine(grid_points).interpolate(values).astype(np.float64)
+        grid_values[~self.grid(grid_points)[3]] = np.nan
+        return grid_values
+
+    def iter_levels(self, values, levels=LOD_LEVELS):
+        # Postupné zjemňovanie: najprv hrubá mriežka v interaktívnom čase, potom jemnejšie
+        for grid_points in levels:
+            yield grid_points, self.interpolate_grid(values, grid_points)
+
+    def volume_trace(self, grid_values, mode, grid_points=60):
+        import plotly.graph_objs as go
+        config = PLOT_CONFIG[mode]
+        grid_x, grid_y, grid_z, _ = self.grid(grid_points)
+        return go.Volume(
+            x=grid_x.flatten(),
+            y=grid_y.flatten(),
+            z=grid_z.flatten(),
+            value=grid_values.flatten(),
+            isomin=config['vmin'],
+            isomax=config['vmax'],
+            opacity=0.15,
+            surface_count=35,
+            colorscale=config['colorscale'],
+            caps=dict(x_show=False, y_show=False, z_show=False),
+            reversescale=(mode == 'humidity'),
+            colorbar=dict(
+                title=dict(text=f"{mode.capitalize()} Scale", side="right"),
+                x=1.15
+            )
+        )
+
+    def figure_3d(self, data, mode='temperature', grid_points=60):
+        """Figúra Plotly; `data` je tabuľka snapshotu alebo slovník polí `temperature` a `humidity`."""
+        import plotly.graph_objs as go
+        config = PLOT_CONFIG.get(mode)
+        if data is None or not config or config['column'] not in data:
+            return None
+
+        values = np.asarray(data[config['column']])
+        fig = go.Figure()
+        fig.add_trace(self.volume_trace(self.interpolate_grid(values, grid_points), mode, grid_points))
+        self.add_room_traces(fig, data)
+        self.apply_layout(fig, config['title'])
+        return fig
+
+    def plot_3d(self, data, mode='temperature', grid_points=60):
+        fig = self.figure_3d(data, mode, grid_points)
+        if fig is not None:
+            fig.show()
+
+    def add_room_traces(self, fig, data):
+        import plotly.graph_objs as go
+        temperature = np.asarray(data['temperature'])
+        humidity = np.asarray(data['humidity'])
+        hover_text = [
+            f"Sensor {i + 1}<br>" +
+            f"Position: ({x:.1f}, {y:.1f}, {z:.1f})<br>" +
+            f"Temperature: {temperature[i]:.1f}°C<br>" +
+            f"Humidity: {humidity[i]:.1f}%"
+            for i, (x, y, z) in enumerate(zip(self.x_coords, self.y_coords, self.z_coords))
+        ]
+
+        fig.add_trace(go.Scatter3d(
+            x=self.x_coords,
+            y=self.y_coords,
+            z=self.z_coords,
+            mode='markers+text',
+            marker=dict(
+                size=5,
+                color='black',
+                symbol='circle',
+                line=dict(color='white', width=1)
+            ),
+            text=[f"{i + 1}" for i in range(len(self.x_coords))],
+            textposition="top center",
+            textfont=dict(size=8),
+            hovertext=hover_text,
+            hoverinfo='text',
+            name='Sensors'
+        ))
+
+        walls = [
+
+            dict(x=[0, 0, 0, 0], y=[0, 3.5, 3.5, 0], z=[0, 0, 3, 3]),
+            dict(x=[3.5, 3.5, 3.5, 3.5], y=[0, 3.5, 3.5, 0], z=[0, 0, 3, 3]),
+            dict(x=[0, 3.5, 3.5, 0], y=[0, 0, 0, 0], z=[0, 0, 3, 3]),
+            dict(x=[0, 3.5, 3.5, 0], y=[3.5, 3.5, 3.5, 3.5], z=[0, 0, 3, 3])
+        ]
+
+        for wall in walls:
+            fig.add_trace(go.Mesh3d(
+                x=wall['x'],
+                y=wall['y'],
+                z=wall['z'],
+                opacity=0.1,
+                color='lightgray',
+                hoverinfo='skip',
+                showscale=False
+            ))
+
+    def apply_layout(self, fig, title):
+        fig.update_layout(
+            title=dict(
+                text=title,
+                x=0.5,
+                y=0.95,
+                xanchor='center',
+                yanchor='top'
+            ),
+            scene=dict(
+                xaxis_title='Width (m)',
+                yaxis_title='Length (m)',
+                zaxis_title='Height (m)',
+                camera=dict(
+                    eye=dict(x=1.8, y=1.8, z=1.5)
+                ),
+                aspectmode='data'
+            ),
+            showlegend=False
+        )
+
+
+def read_snapshot_records(filename, timestamp: datetime, window: float = 300.0) -> List[Dict]:
+    """Záznamy z jedného logu za `window` sekúnd pred `timestamp` (vrátane).
+
+    Textové logy sa čítajú od offsetu z riedkeho indexu, binárny binárnym
+    vyhľadávaním, takže na jeden snapshot netreba načítať celý deň ani pandas.
+    """
+    from sensor_logger import LogFormat, SensorLogger
+    from sensor_query import SensorQuery
+    from sqlite_store import SqliteStore
+
+    path = Path(filename)
+    start = timestamp - timedelta(seconds=window)
+    log_format = LogFormat(logical_path(path).suffix[1:])
+    if log_format == LogFormat.SQLITE:
+        return list(SqliteStore(path.parent, path.name).query(start, timestamp))
+    return list(SensorQuery(SensorLogger(path.parent, log_format)).query_file(path, start, timestamp))
+
+
+def write_snapshot(visualizer: SensorVisualizer, snapshot_log: SnapshotLog, path: Path, output_format: str,
+                   mode: str = 'temperature', grid_points: int = 29) -> Tuple[str, Path]:
+    """Vykreslí posledný snapshot z `snapshot_log` do súboru html, json (figúra Plotly) alebo npz."""
+    num_sensors = len(visualizer.x_coords)
+    data = {column: snapshot_log.values(column, num_sensors)[-1] for column in ('temperature', 'humidity')}
+    timestamp = str(snapshot_log.timestamps[-1]).replace('T', ' ')
+    path = Path(path)
+    if output_format == 'npz':
+        # Iba numpy, Plotly sa nenačíta
+        xi, yi, zi = visualizer.grid_axes(grid_points)
+        np.savez_compressed(path, grid=visualizer.interpolate_grid(data[mode], grid_points).astype(np.float32),
+                            values=data[mode], x=xi, y=yi, z=zi, mode=mode, timestamp=timestamp)
+        return timestamp, path
+
+    fig = visualizer.figure_3d(data, mode, grid_points)
+    fig.update_layout(title_text=f"{PLOT_CONFIG[mode]['title']} ({timestamp})")
+    if output_format == 'html':
+        fig.write_html(str(path))
+    else:
+        path.write_text(fig.to_json(), encoding='utf-8')
+    return timestamp, path
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vykreslenie jedného snapshotu z logu bez GUI")
+    parser.add_argument('log', type=Path, help="denný súbor logu (.csv, .jsonl, .json, .bin, aj .gz/.zst) alebo .sqlite")
+    parser.add_argument('--at', type=datetime.fromisoformat, default=None,
+                        help="čas snapshotu, použije sa posledný zber v tomto čase alebo pred ním (predvolene koniec logu)")
+    parser.add_argument('-o', '--output', type=Path, required=True, help="výstupný súbor")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="predvolene podľa prípony výstupu")
+    parser.add_argument('--mode', choices=sorted(PLOT_CONFIG), default='temperature')
+    parser.add_argument('--grid', type=int, default=29, help="body mriežky na os")
+    parser.add_argument('--window', type=float, default=300.0,
+                        help="sekundy pred --at, z ktorých sa doplnia chýbajúce senzory")
+    parser.add_argument('--timing', action='store_true', help="vypísať trvanie jednotlivých krokov")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or args.output.suffix.lstrip('.').lower()
+    if output_format not in OUTPUT_FORMATS:
+        parser.error(f"neznámy formát výstupu '{output_format}', použite --format {'/'.join(OUTPUT_FORMATS)}")
+
+    started = time.perf_counter()
+    visualizer = SensorVisualizer()
+    if args.at is not None:
+        snapshot_log = SnapshotLog.from_records(read_snapshot_records(args.log, args.at, args.window))
+    else:
+        snapshot_log = visualizer.load_snapshots(args.log)
+    loaded = time.perf_counter()
+    if len(snapshot_log) == 0:
+        print("V logu nie je žiadny snapshot v zadanom čase.", file=sys.stderr)
+        return 1
+    timestamp, path = write_snapshot(visualizer, snapshot_log, args.output, output_format, args.mode, args.grid)
+    if args.timing:
+        print(f"načítanie {(loaded - started) * 1000:.0f} ms, "
+              f"vykreslenie {(time.perf_counter() - loaded) * 1000:.0f} ms", file=sys.stderr)
+    print(f"{timestamp} -> {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
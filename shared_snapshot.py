@@ -0,0 +1,245 @@
+"""Posledný snapshot v zdieľanej pamäti pre viac webových procesov.
+
+Proces zberu (`acquisition_service.py`) po každom zbere zapíše snapshot
+a stav alarmov do segmentu s pevným rozložením. Webové procesy ho čítajú
+cez `SharedSnapshotReader`, ktorý má rovnaké rozhranie ako `AcquisitionLoop`
+(`latest()`, `wait_for_update()`, `alarms`), takže cesty sa nemenia.
+
+Zápis chráni počítadlo v štýle seqlock: pred zápisom sa zvýši na nepárne,
+po zápise na párne číslo. Čitateľ skopíruje telo a prijme ho, iba ak je
+počítadlo pred aj po kópii rovnaké a párne a sedí CRC32 tela - CRC zachytí
+aj preusporiadanie zápisov na ARM, kde Python nemá pamäťové bariéry.
+Čitateľ nepoužíva zámky, opakované volanie `latest()` bez nového zberu
+prečíta iba hlavičku a vráti uložený objekt.
+"""
+import struct
+import time
+import zlib
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from types import MappingProxyType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from acquisition import Snapshot
+from alarms import ALARM_KINDS, active_alarms
+
+LAYOUT_MAGIC = b'SNP1'
+# magic, počet senzorov, počet druhov alarmov, seqlock, CRC32 tela
+_HEADER = struct.Struct('<4sHHQI')
+# poradové číslo snapshotu, čas snapshotu, čas zberu (epoch, NaN ak chýba), verzia alarmov
+_BODY_HEAD = struct.Struct('<QddQ')
+_SEQLOCK_OFFSET = 8
+_CRC_OFFSET = 16
+_READ_ATTEMPTS = 100
+
+
+def _body_size(num_sensors: int, num_kinds: int) -> int:
+    # platnosť (u1), teplota a vlhkosť (f8) na senzor; aktívny (u1), začiatok a hodnota (f8) na alarm
+    return _BODY_HEAD.size + num_sensors * 17 + num_sensors * num_kinds * 17
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    # Segment nesmie zmazať resource_tracker pri skončení ktoréhokoľvek procesu,
+    # prežije aj reštart procesu zberu
+    segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+    try:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    except Exception:
+        pass
+    return segment
+
+
+class SharedSnapshotWriter:
+    """Zapisovač segmentu, používa ho jediný proces zberu."""
+
+    def __init__(self, name: str, sensor_ids: Sequence[str]):
+        self.name = name
+        self.sensor_ids = list(sensor_ids)
+        self._index = {sensor_id: i for i, sensor_id in enumerate(self.sensor_ids)}
+        self._num_kinds = len(ALARM_KINDS)
+        size = _HEADER.size + _body_size(len(self.sensor_ids), self._num_kinds)
+        self._sequence_offset = 0
+        try:
+            self._segment = _open_segment(name)
+            magic, num_sensors, num_kinds, seqlock, _ = _HEADER.unpack_from(self._segment.buf)
+            if (magic, num_sensors, num_kinds) != (LAYOUT_MAGIC, len(self.sensor_ids), self._num_kinds):
+                raise ValueError(f"Segment {name} má iné rozloženie, reštartujte aj webové procesy")
+            # Po reštarte zberu pokračujú poradové čísla, odberatelia SSE nečakajú na staré číslo
+            self._seqlock = seqlock + (seqlock & 1)
+            self._sequence_offset = _BODY_HEAD.unpack_from(self._segment.buf, _HEADER.size)[0]
+        except FileNotFoundError:
+            self._segment = _open_segment(name, create=True, size=size)
+            self._seqlock = 0
+            _HEADER.pack_into(self._segment.buf, 0, LAYOUT_MAGIC, len(self.sensor_ids), self._num_kinds, 0, 0)
+
+    def publish(self, snapshot: Snapshot, alarm_state: Optional[Tuple] = None) -> None:
+        """Zapíše snapshot a stav alarmov (`AlarmEngine.state()`)."""
+        count = len(self.sensor_ids)
+        valid = np.zeros(count, dtype=np.uint8)
+        temperature = np.full(count, np.nan)
+        humidity = np.full(count, np.nan)
+        sweep_timestamp = None
+        for reading in snapshot.readings:
+            i = self._index.get(reading['Sensor'])
+            if i is not None:
+                valid[i] = 1
+                # Neplatný kanál (None) sa uloží ako NaN
+                temperature[i] = reading['Temperature']
+                humidity[i] = reading['Humidity']
+                sweep_timestamp = reading['Timestamp']
+        # Všetky merania zberu majú rovnaký čas
+        sweep_time = (datetime.strptime(sweep_timestamp, '%Y-%m-%d %H:%M:%S').timestamp()
+                      if sweep_timestamp else float('nan'))
+        alarm_version, active, since, values = alarm_state or (
+            0, np.zeros((self._num_kinds, count), dtype=bool),
+            np.full((self._num_kinds, count), np.nan), np.full((self._num_kinds, count), np.nan))
+
+        body = b''.join((
+            _BODY_HEAD.pack(self._sequence_offset + snapshot.sequence,
+                            snapshot.timestamp.timestamp() if snapshot.timestamp else float('nan'),
+                            sweep_time, alarm_version),
+            valid.tobytes(), temperature.tobytes(), humidity.tobytes(),
+            active.astype(np.uint8).tobytes(), since.astype(np.float64).tobytes(),
+            values.astype(np.float64).tobytes()
+        ))
+        buf = self._segment.buf
+        self._seqlock += 1
+        struct.pack_into('<Q', buf, _SEQLOCK_OFFSET, self._seqlock)
+        buf[_HEADER.size:_HEADER.size + len(body)] = body
+        struct.pack_into('<I', buf, _CRC_OFFSET, zlib.crc32(body))
+        self._seqlock += 1
+        struct.pack_into('<Q', buf, _SEQLOCK_OFFSET, self._seqlock)
+
+    def close(self) -> None:
+        # Segment ostáva (čitatelia aj ďalší beh zberu), zatvorí sa iba mapovanie
+        self._segment.close()
+
+    @staticmethod
+    def unlink(name: str) -> None:
+        """Zmaže segment (pri zmene topológie alebo po teste), ak existuje."""
+        try:
+            segment = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return
+        segment.close()
+        segment.unlink()
+
+
+class SharedAlarms:
+    """Alarmy zo segmentu s rozhraním `AlarmEngine` (`version`, `active()`)."""
+
+    def __init__(self, reader: 'SharedSnapshotReader'):
+        self._reader = reader
+
+    @property
+    def version(self) -> int:
+        return self._reader._read()[1]
+
+    def active(self) -> List[Dict]:
+        return active_alarms(self._reader.sensor_ids, *self._reader._read()[2])
+
+
+class SharedSnapshotReader:
+    """Čitateľ segmentu vo webovom procese, náhrada `AcquisitionLoop`.
+
+    Kým proces zberu segment nevytvorí, `latest()` vracia prázdny snapshot.
+    `wait_for_update` sa dotazuje každých `poll_interval` sekúnd.
+    """
+
+    def __init__(self, name: str, sensor_ids: Sequence[str], poll_interval: float = 0.05):
+        self.name = name
+        self.sensor_ids = list(sensor_ids)
+        self.poll_interval = poll_interval
+        self.alarms = SharedAlarms(self)
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self._seqlock = None
+        self._empty = (Snapshot(sequence=0, timestamp=None), 0, (
+            np.zeros((len(ALARM_KINDS), len(self.sensor_ids)), dtype=bool),
+            np.full((len(ALARM_KINDS), len(self.sensor_ids)), np.nan),
+            np.full((len(ALARM_KINDS), len(self.sensor_ids)), np.nan)))
+        self._cached = self._empty
+
+    def latest(self) -> Snapshot:
+        return self._read()[0]
+
+    def wait_for_update(self, after_sequence: int, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.latest()
+            if snapshot.sequence > after_sequence:
+                return snapshot
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        # Zber beží v inom procese, rozhranie je rovnaké ako pri AcquisitionLoop
+        pass
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _attach(self) -> bool:
+        try:
+            segment = _open_segment(self.name)
+        except FileNotFoundError:
+            return False
+        magic, num_sensors, num_kinds, _, _ = _HEADER.unpack_from(segment.buf)
+        if (magic, num_sensors, num_kinds) != (LAYOUT_MAGIC, len(self.sensor_ids), len(ALARM_KINDS)):
+            segment.close()
+            raise ValueError(f"Segment {self.name} nezodpovedá topológii v config.ini")
+        self._segment = segment
+        return True
+
+    def _read(self) -> Tuple[Snapshot, int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        if self._segment is None and not self._attach():
+            return self._empty
+        buf = self._segment.buf
+        count = len(self.sensor_ids)
+        size = _body_size(count, len(ALARM_KINDS))
+        for _ in range(_READ_ATTEMPTS):
+            before = struct.unpack_from('<Q', buf, _SEQLOCK_OFFSET)[0]
+            if before == self._seqlock:
+                return self._cached
+            if before & 1:
+                continue
+            body = bytes(buf[_HEADER.size:_HEADER.size + size])
+            crc = struct.unpack_from('<I', buf, _CRC_OFFSET)[0]
+            if struct.unpack_from('<Q', buf, _SEQLOCK_OFFSET)[0] == before and zlib.crc32(body) == crc:
+                if before == 0:
+                    # Segment vytvorený, ale ešte bez prvého snapshotu
+                    return self._empty
+                self._cached = self._decode(body, count)
+                self._seqlock = before
+                return self._cached
+        # Zapisovač práve zapisuje opakovane - vráti sa predchádzajúci snapshot
+        return self._cached
+
+    def _decode(self, body: bytes, count: int):
+        sequence, snapshot_time, sweep_time, alarm_version = _BODY_HEAD.unpack_from(body)
+        offset = _BODY_HEAD.size
+        valid = np.frombuffer(body, dtype=np.uint8, count=count, offset=offset)
+        temperature = np.frombuffer(body, dtype=np.float64, count=count, offset=offset + count)
+        humidity = np.frombuffer(body, dtype=np.float64, count=count, offset=offset + 9 * count)
+        offset += 17 * count
+        cells = count * len(ALARM_KINDS)
+        shape = (len(ALARM_KINDS), count)
+        active = np.frombuffer(body, dtype=np.uint8, count=cells, offset=offset).astype(bool).reshape(shape)
+        since = np.frombuffer(body, dtype=np.float64, count=cells, offset=offset + cells).reshape(shape)
+        values = np.frombuffer(body, dtype=np.float64, count=cells, offset=offset + 9 * cells).reshape(shape)
+
+        timestamp_str = (datetime.fromtimestamp(sweep_time).strftime('%Y-%m-%d %H:%M:%S')
+                         if sweep_time == sweep_time else '')
+        readings = tuple(MappingProxyType({
+            'Sensor': sensor_id,
+            'Temperature': float(temperature[i]) if temperature[i] == temperature[i] else None,
+            'Humidity': float(humidity[i]) if humidity[i] == humidity[i] else None,
+            'Timestamp': timestamp_str
+        }) for i, sensor_id in enumerate(self.sensor_ids) if valid[i])
+        snapshot = Snapshot(sequence, datetime.fromtimestamp(snapshot_time) if snapshot_time == snapshot_time
+                            else None, readings)
+        return snapshot, alarm_version, (active, since, values)
@@ -0,0 +1,109 @@
+import math
+import random
+import struct
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from frame_decoder import (ERROR_SENTINEL, FRAME_HEADER_SIZE, FRAME_VERSION, SENSOR_BLOCK_SIZE,
+                           SENSORS_PER_SLAVE, STATUS_OK, STATUS_READ_ERROR, build_frame)
+
+
+class SimulatedBus:
+    """Náhrada `smbus.SMBus` bez hardvéru.
+
+    Generuje rámce v rovnakom formáte ako firmvér slave (`frame_version`,
+    0 pre pôvodný firmvér). Hodnoty pomaly kolíšu okolo základnej teploty
+    s odchýlkou podľa polohy senzora. Dá sa nastaviť oneskorenie čítania,
+    pravdepodobnosť chyby DHT22, poškodeného rámca, nedostupné slave
+    (OSError ako pri NACK) a zaseknuté slave. S `update_interval` slave
+    meria iba raz za daný počet sekúnd a medzitým posiela rovnaký rámec
+    (0 = nové meranie pri každom čítaní).
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 dead_slaves: Iterable[int] = (), hung_slaves: Iterable[int] = (),
+                 hang_time: float = 10.0, base_temperature: float = 22.0,
+                 base_humidity: float = 45.0, seed: Optional[int] = None,
+                 frame_version: int = FRAME_VERSION, update_interval: float = 0.0,
+                 corrupt_rate: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.dead_slaves = set(dead_slaves)
+        self.hung_slaves = set(hung_slaves)
+        self.hang_time = hang_time
+        self.base_temperature = base_temperature
+        self.base_humidity = base_humidity
+        self.frame_version = frame_version
+        self.update_interval = update_interval
+        self.corrupt_rate = corrupt_rate
+        self._sequences: Dict[int, int] = {}
+        self._frames: Dict[int, tuple] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self.reads = 0
+
+    def read_i2c_block_data(self, address: int, register: int, length: int) -> list:
+        with self._lock:
+            self.reads += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if address in self.hung_slaves:
+            delay = self.hang_time
+        if delay > 0:
+            time.sleep(delay)
+        if address in self.dead_slaves:
+            raise OSError(121, 'Remote I/O error')
+        if self.frame_version == 0:
+            sensors = length // 4
+        else:
+            sensors = (length - FRAME_HEADER_SIZE - 1) // SENSOR_BLOCK_SIZE
+        frame = bytearray(self.current_frame(address, sensors))
+        with self._lock:
+            if self._random.random() < self.corrupt_rate:
+                frame[self._random.randrange(len(frame))] ^= 1 << self._random.randrange(8)
+        return list(frame)
+
+    def current_frame(self, address: int, sensors: int = SENSORS_PER_SLAVE) -> bytes:
+        """Rámec, ktorý slave práve posiela; nový iba po uplynutí `update_interval`."""
+        if self.update_interval <= 0:
+            return self.make_frame(address, sensors)
+        period = int((time.monotonic() - self._start) / self.update_interval)
+        with self._lock:
+            cached = self._frames.get(address)
+        if cached is not None and cached[0] == period:
+            return cached[1]
+        frame = self.make_frame(address, sensors)
+        with self._lock:
+            self._frames[address] = (period, frame)
+        return frame
+
+    def make_frame(self, address: int, sensors: int = SENSORS_PER_SLAVE) -> bytes:
+        elapsed = time.monotonic() - self._start
+        temperatures, humidities, statuses = [], [], []
+        with self._lock:
+            for i in range(sensors):
+                if self._random.random() < self.error_rate:
+                    temperatures.append(ERROR_SENTINEL)
+                    humidities.append(ERROR_SENTINEL)
+                    statuses.append(STATUS_READ_ERROR)
+                    continue
+                phase = address * 0.7 + i * 1.3
+                temperature = (self.base_temperature + 1.5 * math.sin(elapsed / 600 + phase)
+                               + self._random.gauss(0, 0.05))
+                humidity = (self.base_humidity + 5 * math.cos(elapsed / 900 + phase)
+                            + self._random.gauss(0, 0.2))
+                temperatures.append(round(temperature * 100))
+                humidities.append(round(humidity * 100))
+                statuses.append(STATUS_OK)
+            sequence = self._sequences.get(address, 0) + 1
+            self._sequences[address] = sequence
+        if self.frame_version == 0:
+            values = [value for pair in zip(temperatures, humidities) for value in pair]
+            return struct.pack(f'<{len(values)}h', *values)
+        return build_frame(sequence, temperatures, humidities, statuses)
+
+
+def simulated_buses(bus_numbers: Iterable[int], **options) -> Dict[int, SimulatedBus]:
+    return {number: SimulatedBus(**options) for number in bus_numbers}
@@ -0,0 +1,213 @@
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from log_compression import logical_path
+from sensor_logger import binary_values, load_sensor_ids, local_datetime64, read_binary_log, record_value
+
+if TYPE_CHECKING:
+    # pandas sa načíta až pri čítaní textového logu (import trvá stovky ms)
+    import pandas as pd
+
+# Riadky spracované naraz, veľké viacdenné súbory sa nenačítajú do pamäte celé
+CHUNK_ROWS = 200_000
+
+CSV_DTYPES = {'timestamp': 'string', 'sensor_id': 'string', 'temperature': 'float32', 'humidity': 'float32'}
+
+_SENSOR_ID = re.compile(r'Sensor_(\d+)_(\d+)$')
+
+
+def sensor_sort_key(sensor_id: str) -> Tuple:
+    # Sensor_<adresa>_<poradie>, rovnaké poradie ako v topológii zberníc
+    match = _SENSOR_ID.match(sensor_id)
+    if match:
+        return 0, int(match.group(1)), int(match.group(2)), sensor_id
+    return 1, 0, 0, sensor_id
+
+
+def _to_seconds(timestamps: 'pd.Series') -> np.ndarray:
+    import pandas as pd
+    # Staré CSV majú čas na minúty, nové na sekundy, JSONL s mikrosekundami
+    return pd.to_datetime(timestamps, format='ISO8601').to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+
+def iter_log_chunks(filename, chunksize: int = CHUNK_ROWS) -> Iterator[Tuple[np.ndarray, List[str], np.ndarray,
+                                                                                np.ndarray, np.ndarray]]:
+    """Časti denného logu ako (sekundy, id senzorov, kódy senzorov, teplota, vlhkosť).
+
+    Komprimované logy (.gz, .zst) pandas dekomprimuje podľa prípony, databáza
+    formátu sqlite sa číta celá po častiach zoradená podľa času.
+    """
+    path = Path(filename)
+    suffix = logical_path(path).suffix
+    if suffix == '.bin':
+        # Binárny log už obsahuje index senzora, netreba porovnávať reťazce
+        records = read_binary_log(path)
+        sensor_ids = load_sensor_ids(path.parent)
+        sensor_ids = sensor_ids + [f'?{i}' for i in range(len(sensor_ids), int(records['sensor'].max(initial=0)) + 1)]
+        for offset in range(0, len(records), chunksize):
+            chunk = records[offset:offset + chunksize]
+            seconds = local_datetime64(chunk['timestamp']).astype('datetime64[s]').astype(np.int64)
+            yield (seconds, sensor_ids, chunk['sensor'].astype(np.int32),
+                   binary_values(chunk['temperature']).astype(np.float32),
+                   binary_values(chunk['humidity']).astype(np.float32))
+        return
+
+    import pandas as pd
+    if suffix == '.sqlite':
+        connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            yield from _frame_chunks(pd.read_sql_query(
+                "SELECT timestamp, sensor_id, temperature, humidity FROM readings ORDER BY timestamp",
+                connection, chunksize=chunksize, dtype=CSV_DTYPES))
+        finally:
+            connection.close()
+        return
+
+    if suffix == '.jsonl':
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype=CSV_DTYPES)
+    else:
+        reader = pd.read_csv(path, sep=';', dtype=CSV_DTYPES, chunksize=chunksize,
+                             usecols=list(CSV_DTYPES))
+    with reader:
+        yield from _frame_chunks(reader)
+
+
+def _frame_chunks(chunks: Iterable['pd.DataFrame']):
+    import pandas as pd
+    for chunk in chunks:
+        codes, sensor_ids = pd.factorize(chunk['sensor_id'])
+        yield (_to_seconds(chunk['timestamp']), [str(sensor_id) for sensor_id in sensor_ids],
+               codes.astype(np.int32), chunk['temperature'].to_numpy(dtype=np.float32),
+               chunk['humidity'].to_numpy(dtype=np.float32))
+
+
+class SnapshotLog:
+    """Log rozdelený na snapshoty: riadok = čas zberu, stĺpec = senzor.
+
+    Riadky sa zoskupia podľa časovej pečiatky a id senzora, nie po pevných
+    blokoch, takže vynechaný slave iba nechá v snapshote prázdne (NaN) miesta.
+    Snapshot `i` je riadok `i`, vyhľadanie bloku je priamy prístup do poľa.
+    """
+
+    def __init__(self, timestamps: np.ndarray, sensor_ids: List[str],
+                 temperature: np.ndarray, humidity: np.ndarray):
+        self.timestamps = timestamps
+        self.sensor_ids = sensor_ids
+        self.temperature = temperature
+        self.humidity = humidity
+        self._filled: Dict[Tuple, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_files(cls, filenames: Iterable, sensor_ids: Optional[List[str]] = None,
+                   chunksize: int = CHUNK_ROWS) -> 'SnapshotLog':
+        """Načíta logy jedným prechodom po častiach; `sensor_ids` určí poradie stĺpcov."""
+        columns: Dict[str, int] = {sensor_id: i for i, sensor_id in enumerate(sensor_ids or [])}
+        parts = []
+        for filename in filenames:
+            for seconds, chunk_ids, codes, temperature, humidity in iter_log_chunks(filename, chunksize):
+                # Kódy senzorov v tejto časti -> stĺpce naprieč všetkými súbormi
+                mapping = np.array([columns.setdefault(sensor_id, len(columns)) for sensor_id in chunk_ids]
+                                   + [-1], dtype=np.int32)
+                parts.append((seconds, mapping[codes], temperature, humidity))
+
+        if sensor_ids is None:
+            # Bez zadaného poradia sa stĺpce zoradia podľa adresy slave a čísla senzora
+            ordered = sorted(columns, key=sensor_sort_key)
+            remap = np.empty(len(columns) + 1, dtype=np.int32)
+            remap[[columns[sensor_id] for sensor_id in ordered]] = np.arange(len(ordered))
+            remap[-1] = -1
+            parts = [(seconds, remap[column], temperature, humidity)
+                     for seconds, column, temperature, humidity in parts]
+        else:
+            ordered = sorted(columns, key=columns.get)
+
+        if not parts:
+            return cls(np.array([], dtype='datetime64[s]'), ordered,
+                       np.empty((0, len(ordered)), dtype=np.float32), np.empty((0, len(ordered)), dtype=np.float32))
+        seconds = np.concatenate([part[0] for part in parts])
+        column = np.concatenate([part[1] for part in parts])
+        times, rows = np.unique(seconds, return_inverse=True)
+
+        shape = (len(times), len(ordered))
+        temperature = np.full(shape, np.nan, dtype=np.float32)
+        humidity = np.full(shape, np.nan, dtype=np.float32)
+        known = column >= 0
+        temperature[rows[known], column[known]] = np.concatenate([part[2] for part in parts])[known]
+        humidity[rows[known], column[known]] = np.concatenate([part[3] for part in parts])[known]
+        return cls(times.astype('datetime64[s]'), ordered, temperature, humidity)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], sensor_ids: Optional[List[str]] = None) -> 'SnapshotLog':
+        """Snapshoty zo záznamov v tvare logu (výsledok `SensorQuery`), bez pandas."""
+        records = list(records)
+        ordered = list(sensor_ids) if sensor_ids is not None else sorted(
+            {record['sensor_id'] for record in records}, key=sensor_sort_key)
+        columns = {sensor_id: i for i, sensor_id in enumerate(ordered)}
+        times = sorted({record['timestamp'] for record in records})
+        rows = {timestamp: i for i, timestamp in enumerate(times)}
+        temperature = np.full((len(times), len(ordered)), np.nan, dtype=np.float32)
+        humidity = np.full((len(times), len(ordered)), np.nan, dtype=np.float32)
+        for record in records:
+            i = columns.get(record['sensor_id'])
+            if i is not None:
+                # CSV log vracia hodnoty ako reťazce, neplatný kanál je prázdny
+                temperature[rows[record['timestamp']], i] = record_value(record['temperature'], np.nan)
+                humidity[rows[record['timestamp']], i] = record_value(record['humidity'], np.nan)
+        timestamps = np.array([datetime.fromisoformat(timestamp) for timestamp in times], dtype='datetime64[s]')
+        return cls(timestamps, ordered, temperature, humidity)
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> 'SnapshotLog':
+        low = 0 if start is None else self.timestamps.searchsorted(np.datetime64(start, 's'), side='left')
+        high = len(self) if end is None else self.timestamps.searchsorted(np.datetime64(end, 's'), side='right')
+        return SnapshotLog(self.timestamps[low:high], self.sensor_ids,
+                           self.temperature[low:high], self.humidity[low:high])
+
+    def index_of(self, timestamp: datetime) -> int:
+        """Posledný snapshot v čase `timestamp` alebo pred ním."""
+        return max(int(self.timestamps.searchsorted(np.datetime64(timestamp, 's'), side='right')) - 1, 0)
+
+    def values(self, mode: str = 'temperature', num_sensors: Optional[int] = None) -> np.ndarray:
+        """Hodnoty bez medzier pre interpoláciu (snapshoty × senzory).
+
+        Chýbajúci senzor preberie svoju poslednú známu hodnotu, inak priemer
+        snapshotu. `num_sensors` doplní stĺpce na počet senzorov v geometrii.
+        """
+        key = (mode, num_sensors)
+        if key not in self._filled:
+            self._filled[key] = self._fill(self.temperature if mode == 'temperature' else self.humidity, num_sensors)
+        return self._filled[key]
+
+    @staticmethod
+    def _fill(values: np.ndarray, num_sensors: Optional[int]) -> np.ndarray:
+        if num_sensors is not None and values.shape[1] != num_sensors:
+            padded = np.full((len(values), num_sensors), np.nan, dtype=np.float32)
+            padded[:, :min(num_sensors, values.shape[1])] = values[:, :num_sensors]
+            values = padded
+        values = np.asarray(values, dtype=np.float64)
+        # Dopredné doplnenie po stĺpcoch: index posledného riadku so známou hodnotou
+        rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        values = values[rows, np.arange(values.shape[1])]
+        missing = np.isnan(values)
+        if missing.any():
+            with np.errstate(invalid='ignore'):
+                means = np.nanmean(np.where(missing.all(axis=1, keepdims=True), 0.0, values), axis=1)
+            values[missing] = np.broadcast_to(means[:, None], values.shape)[missing]
+        return values
+
+    def frame(self, index: int, num_sensors: Optional[int] = None) -> 'pd.DataFrame':
+        """Jeden snapshot ako tabuľka v poradí senzorov, ako ju očakáva plot_3d."""
+        import pandas as pd
+        temperature = self.values('temperature', num_sensors)[index]
+        humidity = self.values('humidity', num_sensors)[index]
+        sensor_ids = self.sensor_ids + [''] * (len(temperature) - len(self.sensor_ids))
+        return pd.DataFrame({'timestamp': self.timestamps[index], 'sensor_id': sensor_ids[:len(temperature)],
+                             'temperature': temperature, 'humidity': humidity})
@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+DATABASE_FILE = 'sensor_log.sqlite'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    timestamp TEXT NOT NULL,
+    sensor_id TEXT NOT NULL,
+    temperature REAL,
+    humidity REAL
+);
+CREATE INDEX IF NOT EXISTS readings_sensor_time ON readings (sensor_id, timestamp);
+CREATE INDEX IF NOT EXISTS readings_time ON readings (timestamp);
+"""
+
+# Konštantné príkazy s parametrami - sqlite3 ich pripraví raz a drží v cache spojenia
+_INSERT = "INSERT INTO readings (timestamp, sensor_id, temperature, humidity) VALUES (?, ?, ?, ?)"
+_SELECT_RANGE = ("SELECT timestamp, sensor_id, temperature, humidity FROM readings "
+                 "WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, rowid")
+_SELECT_SENSOR_RANGE = ("SELECT timestamp, sensor_id, temperature, humidity FROM readings "
+                        "WHERE sensor_id = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp, rowid")
+_SELECT_LAST = "SELECT MAX(timestamp) FROM readings WHERE timestamp BETWEEN ? AND ?"
+_DELETE_BEFORE = "DELETE FROM readings WHERE timestamp < ?"
+# Staršie databázy mali kanály NOT NULL; neplatný kanál sa teraz ukladá ako NULL
+_MIGRATE_NULLABLE = """
+ALTER TABLE readings RENAME TO readings_old;
+DROP INDEX IF EXISTS readings_sensor_time;
+DROP INDEX IF EXISTS readings_time;
+""" + _SCHEMA + """
+INSERT INTO readings (timestamp, sensor_id, temperature, humidity)
+    SELECT timestamp, sensor_id, temperature, humidity FROM readings_old ORDER BY rowid;
+DROP TABLE readings_old;
+"""
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    return timestamp.strftime(TIMESTAMP_FORMAT)
+
+
+class SqliteStore:
+    """Merania v jednej databáze SQLite (WAL) namiesto denných súborov.
+
+    Každé vlákno (zápis dávok, požiadavky webu) má vlastné spojenie. Vo WAL
+    režime čitatelia neblokujú zapisovača ani naopak, takže web môže čítať
+    históriu aj z iného procesu počas zberu. Dávka sa zapíše v jednej transakcii.
+    """
+
+    def __init__(self, base_path, filename: str = DATABASE_FILE, busy_timeout: float = 5.0):
+        self.path = Path(base_path) / filename
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+            columns = {row[1]: row[3] for row in connection.execute("PRAGMA table_info(readings)")}
+            if columns.get('temperature') or columns.get('humidity'):
+                connection.executescript("BEGIN;" + _MIGRATE_NULLABLE + "COMMIT;")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Vo WAL stačí synchronizácia pri checkpointe, výpadok napájania neporuší databázu
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def insert(self, rows: Iterable[Tuple[str, str, Optional[float], Optional[float]]]) -> int:
+        """Zapíše riadky (čas, senzor, teplota, vlhkosť) v jednej transakcii, None je NULL."""
+        connection = self._connection()
+        with connection:
+            cursor = connection.executemany(_INSERT, rows)
+        return cursor.rowcount
+
+    def query(self, start: datetime, end: datetime, sensor_id: Optional[str] = None) -> Iterator[Dict]:
+        """Záznamy v rozsahu vrátane okrajov, zoradené podľa času (formát ako CSV log)."""
+        # Čas je uložený na sekundy, začiatok so zlomkom sekundy sa zaokrúhli nahor
+        if start.microsecond:
+            start = start.replace(microsecond=0) + timedelta(seconds=1)
+        bounds = (format_timestamp(start), format_timestamp(end))
+        if sensor_id is None:
+            cursor = self._connection().execute(_SELECT_RANGE, bounds)
+        else:
+            cursor = self._connection().execute(_SELECT_SENSOR_RANGE, (sensor_id,) + bounds)
+        try:
+            for timestamp, sensor, temperature, humidity in cursor:
+                yield {
+                    'timestamp': timestamp,
+                    'sensor_id': sensor,
+                    'temperature': temperature,
+                    'humidity': humidity
+                }
+        finally:
+            cursor.close()
+
+    def last_timestamp(self, start: datetime, end: datetime) -> Optional[datetime]:
+        """Čas posledného záznamu v rozsahu (None, ak rozsah nemá záznamy)."""
+        row = self._connection().execute(_SELECT_LAST, (format_timestamp(start), format_timestamp(end))).fetchone()
+        return datetime.fromisoformat(row[0]) if row[0] is not None else None
+
+    def delete_before(self, timestamp: datetime) -> int:
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(_DELETE_BEFORE, (format_timestamp(timestamp),))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Zatvorí spojenie aktuálneho vlákna (spojenia ostatných vlákien zanikajú s vláknom)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
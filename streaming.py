@@ -0,0 +1,161 @@
+import csv
+import hashlib
+import io
+import json
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from log_compression import open_log
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ConcatenatedFile(io.RawIOBase):
+    """Niekoľko súborov čítaných ako jeden súvislý súbor (s podporou seek).
+
+    Každý segment je dvojica (cesta, počet bajtov preskočených na začiatku),
+    napr. hlavička CSV v druhom a ďalšom dennom súbore.
+    """
+
+    def __init__(self, segments: List[Tuple[Path, int]]):
+        super().__init__()
+        self._segments = []
+        self.length = 0
+        for path, skip in segments:
+            size = max(path.stat().st_size - skip, 0)
+            self._segments.append((path, skip, self.length, size))
+            self.length += size
+        self._position = 0
+        self._file = None
+        self._file_index = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.length
+        self._position = min(max(offset, 0), self.length)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        for index, (path, skip, start, size) in enumerate(self._segments):
+            if start <= self._position < start + size:
+                if self._file_index != index:
+                    self._close_current()
+                    self._file = open(path, 'rb')
+                    self._file_index = index
+                self._file.seek(skip + self._position - start)
+                limit = min(len(buffer), start + size - self._position)
+                read = self._file.readinto(memoryview(buffer)[:limit])
+                self._position += read
+                return read
+        return 0
+
+    def close(self) -> None:
+        self._close_current()
+        super().close()
+
+    def _close_current(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_index = None
+
+
+def files_etag(paths: Iterable[Path], *extra: str) -> str:
+    """ETag z veľkosti a času zmeny súborov - mení sa s každým zápisom do logu."""
+    digest = hashlib.sha1()
+    for path in paths:
+        # Do databázy SQLite sa zapisuje cez jej WAL súbor
+        for part in (path, path.with_name(path.name + '-wal')):
+            if part.exists():
+                stat = part.stat()
+                digest.update(f"{part.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    for value in extra:
+        digest.update(value.encode())
+    return digest.hexdigest()
+
+
+def first_line_length(path: Path) -> int:
+    with open(path, 'rb') as file:
+        return len(file.readline())
+
+
+def accepts_gzip(request) -> bool:
+    return 'gzip' in request.accept_encodings
+
+
+def iter_json_array(records: Iterable) -> Iterator[bytes]:
+    """JSON pole po častiach, celý výsledok nikdy nie je v pamäti."""
+    parts = [b'[']
+    size = 1
+    first = True
+    for record in records:
+        part = json.dumps(record, separators=(',', ':')).encode('utf-8')
+        if not first:
+            part = b',' + part
+        first = False
+        parts.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield b''.join(parts)
+            parts, size = [], 0
+    parts.append(b']')
+    yield b''.join(parts)
+
+
+def iter_csv(records: Iterable[dict], fieldnames: List[str]) -> Iterator[bytes]:
+    """Záznamy ako CSV v tvare denného logu (oddeľovač ;), po častiach."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, delimiter=';')
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def iter_file(file, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    try:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file.close()
+
+
+def iter_log_files(paths: List[Path], skip_header: bool = False) -> Iterator[bytes]:
+    """Denné logy za sebou, komprimované (.gz, .zst) sa dekomprimujú priebežne.
+
+    `skip_header` vynechá prvý riadok (hlavičku CSV) v druhom a ďalšom súbore.
+    """
+    for i, path in enumerate(paths):
+        file = open_log(path)
+        if skip_header and i > 0:
+            file.readline()
+        yield from iter_file(file)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Priebežná gzip kompresia prúdu bajtov."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
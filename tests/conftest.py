@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Moduly sú v koreni repozitára (bez balíka)
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sensor_manager import Config  # noqa: E402
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Config s predvolenými hodnotami a logmi v dočasnom adresári."""
+    def make(log_format='csv', **logging_options):
+        config = Config(str(tmp_path / 'config.ini'))
+        config.config['Logging']['log_path'] = str(tmp_path / 'sensor_logs')
+        config.config['Logging']['log_format'] = log_format
+        for key, value in logging_options.items():
+            config.config['Logging'][key] = str(value)
+        return config
+    return make
@@ -0,0 +1,62 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from sensor_logger import LogFormat, SensorLogger, SensorReading, _BufferedWriter
+
+DAY = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def readings(count, start=DAY):
+    return [SensorReading(f"Sensor_8_{i % 5 + 1}", 21.5, 45.0, start + timedelta(seconds=5 * i))
+            for i in range(count)]
+
+
+@pytest.mark.parametrize('log_format', [LogFormat.CSV, LogFormat.JSONL, LogFormat.BINARY])
+def test_failed_batch_is_written_on_next_flush(tmp_path, monkeypatch, log_format):
+    sensor_logger = SensorLogger(str(tmp_path), log_format, buffer_size=100, flush_interval=3600)
+    for reading in readings(6):
+        sensor_logger.save_reading(reading)
+
+    original = _BufferedWriter._open_file
+
+    def failing_open(self, file_path):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(_BufferedWriter, '_open_file', failing_open)
+    sensor_logger.flush()
+    assert len(sensor_logger._writer._pending) == 6
+
+    monkeypatch.setattr(_BufferedWriter, '_open_file', original)
+    sensor_logger.flush()
+    assert len(sensor_logger.get_readings(DAY)) == 6
+    sensor_logger.close()
+
+
+def test_failed_sqlite_transaction_is_retried(tmp_path, monkeypatch):
+    sensor_logger = SensorLogger(str(tmp_path), LogFormat.SQLITE, buffer_size=100, flush_interval=3600)
+    for reading in readings(4):
+        sensor_logger.save_reading(reading)
+    original = sensor_logger.store.insert
+
+    def failing_insert(rows):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(sensor_logger.store, 'insert', failing_insert)
+    sensor_logger.flush()
+    monkeypatch.setattr(sensor_logger.store, 'insert', original)
+    sensor_logger.flush()
+    assert len(sensor_logger.get_readings(DAY)) == 4
+    sensor_logger.close()
+
+
+def test_pending_rows_are_bounded(tmp_path, monkeypatch):
+    sensor_logger = SensorLogger(str(tmp_path), LogFormat.CSV, buffer_size=2, flush_interval=3600)
+    monkeypatch.setattr(_BufferedWriter, '_open_file',
+                        lambda self, file_path: (_ for _ in ()).throw(OSError(5, 'I/O error')))
+    for reading in readings(50):
+        sensor_logger.save_reading(reading)
+        sensor_logger.flush()
+    assert len(sensor_logger._writer._pending) <= 2 * 10
+    sensor_logger.close()
@@ -0,0 +1,95 @@
+import numpy as np
+
+from frame_decoder import (ERROR_SENTINEL, STATUS_NO_DATA, STATUS_OK, STATUS_READ_ERROR, FrameDecoder,
+                           build_frame, crc8, frame_size)
+from metrics import I2C_FRAME_ERRORS
+
+
+def frame(sequence, temperature=2150, humidity=4500, statuses=(STATUS_OK,) * 5):
+    return list(build_frame(sequence, [temperature] * 5, [humidity] * 5, list(statuses)))
+
+
+def test_crc8_matches_smbus_pec():
+    assert crc8(b'123456789') == 0xF4
+
+
+def test_valid_frame():
+    sweep = FrameDecoder([8, 9]).decode([frame(1), frame(1, temperature=-1000)])
+    assert sweep.valid.all() and sweep.fresh.all()
+    assert sweep.temperature.tolist() == [21.5] * 5 + [-10.0] * 5
+    assert sweep.humidity.tolist() == [45.0] * 10
+
+
+def test_bad_crc_is_rejected():
+    decoder = FrameDecoder([8, 9])
+    errors = I2C_FRAME_ERRORS._values.get(('8', 'crc'), 0)
+    corrupted = frame(1)
+    corrupted[6] ^= 0x01
+    sweep = decoder.decode([corrupted, frame(1)])
+    assert not sweep.present[:5].any() and not sweep.valid[:5].any()
+    assert sweep.valid[5:].all()
+    assert I2C_FRAME_ERRORS._values[('8', 'crc')] == errors + 1
+
+
+def test_short_frame_and_wrong_sensor_count_are_rejected():
+    decoder = FrameDecoder([8, 9])
+    errors = I2C_FRAME_ERRORS._values.get(('9', 'format'), 0)
+    # Platné CRC, ale hlavička hlási iný počet senzorov ako topológia
+    body = bytes(frame(1)[:-1])
+    body = body[:1] + bytes([4]) + body[2:]
+    sweep = decoder.decode([frame(1)[:-1], list(body) + [crc8(body)]])
+    assert not sweep.present.any()
+    assert I2C_FRAME_ERRORS._values[('9', 'format')] == errors + 1
+    assert len(frame(1)) == frame_size(5)
+
+
+def test_repeated_sequence_is_not_fresh_and_gap_is():
+    decoder = FrameDecoder([8])
+    assert decoder.decode([frame(7)]).fresh.all()
+    repeated = decoder.decode([frame(7)])
+    # Rovnaké poradové číslo: slave odvtedy nemeral, hodnoty ostávajú platné, ale nie nové
+    assert repeated.valid.all() and not repeated.fresh.any()
+    # Medzera (vynechané merania) aj pretečenie uint16 sú nové merania
+    assert decoder.decode([frame(10)]).fresh.all()
+    assert decoder.decode([frame(0xFFFF)]).fresh.all()
+    assert decoder.decode([frame(0x10000)]).fresh.all()
+
+
+def test_failed_read_does_not_reset_sequence():
+    decoder = FrameDecoder([8])
+    decoder.decode([frame(3)])
+    assert not decoder.decode([None]).present.any()
+    assert not decoder.decode([frame(3)]).fresh.any()
+
+
+def test_sensor_status_and_physical_range():
+    decoder = FrameDecoder([8])
+    statuses = (STATUS_OK, STATUS_READ_ERROR, STATUS_NO_DATA, STATUS_OK, STATUS_OK)
+    temperatures = [2150, 2150, 2150, ERROR_SENTINEL, 5500]
+    sweep = decoder.decode([list(build_frame(1, temperatures, [4500] * 5, list(statuses)))])
+    assert sweep.present.tolist() == [True, True, False, True, True]
+    assert sweep.sensor_error.tolist() == [False, True, False, True, False]
+    # Limity [Sensors] sú prahy alarmov, 55 °C je platné meranie
+    assert sweep.temperature_valid.tolist() == [True, False, False, False, True]
+    assert sweep.humidity_valid.tolist() == [True, False, False, True, True]
+    assert sweep.valid.tolist() == [True, False, False, True, True]
+    assert np.isnan(sweep.temperature[3]) and sweep.humidity[3] == 45.0
+
+
+def test_channels_are_validated_separately():
+    decoder = FrameDecoder([8])
+    sweep = decoder.decode([list(build_frame(1, [2150] * 5, [4500, 10001, 4500, 4500, 4500], [STATUS_OK] * 5))])
+    assert sweep.valid.all()
+    assert sweep.humidity_valid.tolist() == [True, False, True, True, True]
+    assert sweep.temperature.tolist() == [21.5] * 5
+    assert np.isnan(sweep.humidity[1])
+
+
+def test_mixed_frame_versions():
+    decoder = FrameDecoder([8, 9], frame_versions=[0, 1])
+    legacy = list(np.array([[2000, 4000]] * 5, dtype='<i2').tobytes())
+    sweep = decoder.decode([legacy, frame(1)])
+    assert sweep.valid.all()
+    assert sweep.temperature.tolist() == [20.0] * 5 + [21.5] * 5
+    # Rámec verzie 0 nemá poradové číslo, každé čítanie je nové
+    assert decoder.decode([legacy, frame(1)]).fresh.tolist() == [True] * 5 + [False] * 5
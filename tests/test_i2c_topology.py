@@ -0,0 +1,40 @@
+import configparser
+import logging
+from pathlib import Path
+
+from i2c_topology import BusTopology, SlaveConfig, SweepScheduler
+
+
+class FailingBus:
+    def __init__(self):
+        self.reads = 0
+
+    def read_i2c_block_data(self, address, register, length):
+        self.reads += 1
+        raise OSError(121, 'Remote I/O error')
+
+
+def test_failing_slave_is_skipped_for_1_2_4_sweeps():
+    bus = FailingBus()
+    scheduler = SweepScheduler({1: bus}, BusTopology([SlaveConfig(1, 8)]),
+                               retries=0, retry_backoff=0.0, max_skip_cycles=4)
+    attempted = []
+    try:
+        for sweep in range(20):
+            reads = bus.reads
+            assert scheduler.sweep() == [None]
+            if bus.reads > reads:
+                attempted.append(sweep)
+    finally:
+        scheduler.close()
+    # Po 1., 2., 3. a ďalších zlyhaniach sa vynechá 1, 2, 4, 4 ... zberov
+    assert attempted == [0, 2, 5, 10, 15]
+
+
+def test_shipped_config_matches_topology(caplog):
+    config = configparser.ConfigParser()
+    config.read(Path(__file__).resolve().parent.parent / 'config.ini')
+    with caplog.at_level(logging.WARNING, logger='i2c_topology'):
+        topology = BusTopology.from_config(config)
+    assert topology.num_sensors == config.getint('Sensors', 'num_sensors')
+    assert not caplog.records
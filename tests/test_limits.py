@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from frame_decoder import STATUS_OK, DecodedSweep, build_frame
+from sensor_logger import LogFormat, SensorLogger, SensorReading
+from sensor_manager import SensorDataManager
+
+DAY = datetime(2026, 3, 1, 12, 0, 0)
+
+
+class ScriptedReplay:
+    """Zdroj zberov pre SensorDataManager s vopred danými hodnotami."""
+
+    def __init__(self, sweeps):
+        self.sweeps = list(sweeps)
+
+    def next_sweep(self, sensor_ids):
+        timestamp, temperature, humidity = self.sweeps.pop(0)
+        count = len(sensor_ids)
+        present = np.ones(count, dtype=bool)
+        temperature_valid = present & (temperature is not None)
+        humidity_valid = present & (humidity is not None)
+        return timestamp, DecodedSweep(sensor_ids, np.full(count, np.nan if temperature is None else temperature),
+                                       np.full(count, np.nan if humidity is None else humidity),
+                                       present, np.zeros(count, dtype=bool), temperature_valid | humidity_valid,
+                                       present.copy(), temperature_valid, humidity_valid)
+
+    def skip_logged(self, target):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_logger_validates_physical_range_per_channel(tmp_path):
+    sensor_logger = SensorLogger(str(tmp_path), LogFormat.CSV)
+    assert sensor_logger.save_reading(SensorReading('Sensor_8_1', 55.0, 50.0, DAY))
+    assert sensor_logger.save_reading(SensorReading('Sensor_8_1', None, 50.0, DAY))
+    assert not sensor_logger.save_reading(SensorReading('Sensor_8_1', 110.0, 50.0, DAY))
+    assert not sensor_logger.save_reading(SensorReading('Sensor_8_1', None, None, DAY))
+    assert [row['temperature'] for row in sensor_logger.get_readings(DAY)] == ['55.0', '']
+
+
+def test_memory_and_log_hold_the_same_readings(make_config):
+    config = make_config()
+    replay = ScriptedReplay([(DAY, 55.0, 50.0), (DAY + timedelta(seconds=5), 21.0, None)])
+    manager = SensorDataManager(config, replay)
+    # Zber z I2C nad limitom z config.ini (alarm), ale vo fyzickom rozsahu senzora
+    frame = build_frame(1, [5500] * 5, [5000] * 5, [STATUS_OK] * 5)
+    manager.process_sweep(manager.decoder.decode([list(frame), list(frame)]), DAY - timedelta(seconds=5))
+    manager.generate_sensor_data()
+    manager.generate_sensor_data()
+
+    start, end = DAY - timedelta(seconds=5), DAY + timedelta(seconds=5)
+    assert manager.recent.covers(start)
+    memory = manager.recent.query(start, end)
+    log = manager.logger.get_readings(DAY)
+    assert len(memory) == len(log) == 30
+    assert [row['humidity'] for row in memory[-10:]] == [None] * 10
+    assert [row['humidity'] for row in log[-10:]] == [''] * 10
+    manager.close()
+
+
+def test_out_of_limit_reading_raises_alarm_and_is_logged(make_config):
+    config = make_config()
+    replay = ScriptedReplay([(DAY, 55.0, 50.0)])
+    manager = SensorDataManager(config, replay)
+    data = manager.generate_sensor_data()
+    assert [item['Temperature'] for item in data] == [55.0] * 10
+
+    assert {(alarm['kind'], alarm['value']) for alarm in manager.alarms.active()} == {('temperature_high', 55.0)}
+    assert len(manager.alarms.active()) == 10
+    assert [row['temperature'] for row in manager.logger.get_readings(DAY)] == ['55.0'] * 10
+    # Z pamäte aj z logu (proces bez zberu nemá pamäť posledných hodín)
+    assert [row['temperature'] for row in manager.query_readings(DAY, DAY)] == [55.0] * 10
+    manager.recent = None
+    manager.logger.flush()
+    assert [row['temperature'] for row in manager.query_readings(DAY, DAY)] == [55.0] * 10
+    manager.close()
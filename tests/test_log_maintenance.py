@@ -0,0 +1,77 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from log_compression import compress_file
+from log_maintenance import LogMaintenance
+from sensor_logger import LogFormat, SensorLogger, SensorReading
+
+DAY = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def save(sensor_logger, count, start=DAY):
+    for i in range(count):
+        assert sensor_logger.save_reading(SensorReading(f"Sensor_8_{i % 5 + 1}", 21.5, 45.0,
+                                                        start + timedelta(seconds=5 * i)))
+    sensor_logger.flush()
+
+
+@pytest.mark.parametrize('buffer_size', [0, 100])
+@pytest.mark.parametrize('log_format', [LogFormat.CSV, LogFormat.JSON, LogFormat.JSONL, LogFormat.BINARY])
+def test_late_write_into_compressed_day_keeps_archived_rows(tmp_path, log_format, buffer_size):
+    sensor_logger = SensorLogger(str(tmp_path), log_format, buffer_size=buffer_size, flush_interval=3600)
+    maintenance = LogMaintenance(sensor_logger, compress_after_days=1)
+    plain = sensor_logger._get_log_file_path(DAY)
+    archive = plain.with_name(plain.name + '.gz')
+
+    save(sensor_logger, 3)
+    assert maintenance.run_once(today=date(2026, 3, 3))['compressed'] == 1
+    assert archive.exists() and not plain.exists()
+
+    # Neskorý záznam obnoví deň z archívu namiesto založenia nového súboru
+    save(sensor_logger, 1, DAY + timedelta(hours=1))
+    assert plain.exists() and not archive.exists()
+    assert len(sensor_logger.get_readings(DAY)) == 4
+
+    assert maintenance.run_once(today=date(2026, 3, 3))['compressed'] == 1
+    assert archive.exists() and not plain.exists()
+    assert len(sensor_logger.get_readings(DAY)) == 4
+    sensor_logger.close()
+
+
+def test_compress_file_does_not_overwrite_archive(tmp_path):
+    path = tmp_path / 'sensor_log_2026_03_01.csv'
+    path.write_text('a\n')
+    archive = compress_file(path)
+    archived = archive.read_bytes()
+    path.write_text('b\n')
+    with pytest.raises(FileExistsError):
+        compress_file(path)
+    assert archive.read_bytes() == archived
+
+
+def test_maintenance_keeps_plain_file_next_to_archive(tmp_path):
+    sensor_logger = SensorLogger(str(tmp_path), LogFormat.CSV)
+    save(sensor_logger, 3)
+    plain = sensor_logger._get_log_file_path(DAY)
+    compress_file(plain)
+    result = LogMaintenance(sensor_logger).run_once(today=date(2026, 3, 3))
+    assert result['compressed'] == 0
+    assert plain.exists() and plain.with_name(plain.name + '.gz').exists()
+
+
+def test_retention_deletes_old_days_only(tmp_path):
+    sensor_logger = SensorLogger(str(tmp_path), LogFormat.CSV)
+    for offset in range(5):
+        save(sensor_logger, 2, DAY + timedelta(days=offset))
+    maintenance = LogMaintenance(sensor_logger, compress_after_days=2, retention_days=2)
+    result = maintenance.run_once(today=date(2026, 3, 5))
+
+    assert result == {'compressed': 1, 'deleted': 2}
+    days = {day: sorted(path.name for path in paths) for day, paths in maintenance.day_files().items()}
+    assert days == {
+        date(2026, 3, 3): ['sensor_log_2026_03_03.csv.gz'],
+        date(2026, 3, 4): ['sensor_log_2026_03_04.csv'],
+        date(2026, 3, 5): ['sensor_log_2026_03_05.csv'],
+    }
+    assert not list(tmp_path.glob('sensor_log_2026_03_0[12]*'))
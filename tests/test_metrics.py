@@ -0,0 +1,22 @@
+from flask import Flask
+
+from metrics import Counter, Registry
+from routes import create_routes
+from sensor_manager import SensorDataManager
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.register(Counter('test_total', 'Test', ('path',)))
+    counter.inc(path='C:\\logs\n"day"')
+    assert 'test_total{path="C:\\\\logs\\n\\"day\\""} 1' in registry.render().splitlines()
+
+
+def test_metrics_content_type(make_config):
+    manager = SensorDataManager(make_config(), None)
+    app = Flask(__name__)
+    app.register_blueprint(create_routes(manager, None))
+    response = app.test_client().get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    manager.close()
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from flask import Flask
+
+from frame_decoder import STATUS_OK, build_frame
+from recent_buffer import RecentReadings
+from routes import create_routes
+from sensor_manager import SensorDataManager
+
+DAY = datetime(2026, 3, 1, 12, 0, 0)
+SENSOR_IDS = ['Sensor_8_1', 'Sensor_8_2']
+
+
+def fill(recent, count, start=DAY):
+    for i in range(count):
+        recent.append(start + timedelta(seconds=5 * i), np.array([True, i % 2 == 0]),
+                      np.array([20.0 + i, 30.0 + i]), np.array([40.0, 50.0]))
+
+
+def test_covers_from_first_sweep():
+    recent = RecentReadings(SENSOR_IDS, capacity=10)
+    assert not recent.covers(DAY)
+    fill(recent, 3)
+    assert recent.covers(DAY)
+    assert recent.covers(DAY + timedelta(seconds=7))
+    assert not recent.covers(DAY - timedelta(seconds=1))
+
+
+def test_wrap_around_keeps_newest_sweeps():
+    recent = RecentReadings(SENSOR_IDS, capacity=4)
+    fill(recent, 7)
+    assert len(recent) == 4
+    # Zbery 0 - 2 sa prepísali, úplné sú až od zberu 3
+    assert not recent.covers(DAY + timedelta(seconds=10))
+    assert recent.covers(DAY + timedelta(seconds=15))
+
+    records = recent.query(DAY, DAY + timedelta(hours=1))
+    assert [record['timestamp'][-2:] for record in records] == ['15', '20', '20', '25', '30', '30']
+    assert [record['temperature'] for record in records] == [23.0, 24.0, 34.0, 25.0, 26.0, 36.0]
+    series = recent.series(DAY, DAY + timedelta(hours=1), sensor_id='Sensor_8_2')
+    assert series['temperature'] == {'Sensor_8_2': [None, 34.0, None, 36.0]}
+
+
+class IdleReplay:
+    """Zdroj zberov, ktorý sa v teste nevolá; SensorDataManager s ním má pamäť posledných hodín."""
+
+    def next_sweep(self, sensor_ids):
+        raise StopIteration
+
+    def skip_logged(self, target):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_historical_data_types_match_memory_and_disk(make_config):
+    manager = SensorDataManager(make_config(), IdleReplay())
+    for i in range(3):
+        frame = list(build_frame(i, [2150] * 5, [4500] * 5, [STATUS_OK] * 5))
+        manager.process_sweep(manager.decoder.decode([frame, frame]), DAY + timedelta(seconds=5 * i))
+    app = Flask(__name__)
+    app.register_blueprint(create_routes(manager, None))
+    client = app.test_client()
+
+    end = (DAY + timedelta(minutes=1)).isoformat()
+    memory = client.get(f'/historical_data?start={DAY.isoformat()}&end={end}').get_json()
+    disk = client.get(f'/historical_data?start={(DAY - timedelta(hours=1)).isoformat()}&end={end}').get_json()
+    by_date = client.get('/historical_data?date=2026-03-01').get_json()
+    assert len(memory) == 30
+    assert memory == disk == by_date
+    assert memory[0] == {'timestamp': '2026-03-01 12:00:00', 'sensor_id': 'Sensor_8_1',
+                         'temperature': 21.5, 'humidity': 45.0}
+    manager.close()
@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from log_maintenance import LogMaintenance
+from replay import LogReplay
+from sensor_logger import LogFormat, SensorLogger, SensorReading
+from sensor_manager import SensorDataManager
+
+DAY = datetime(2026, 3, 1, 12, 0, 0)
+SENSOR_IDS = [f"Sensor_{address}_{i}" for address in (8, 9) for i in range(1, 6)]
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Zdrojový CSV log: dva dni po 6 zberov 10 senzorov."""
+    sensor_logger = SensorLogger(str(tmp_path / 'source'), LogFormat.CSV)
+    for day in range(2):
+        write_sweeps(sensor_logger, DAY + timedelta(days=day), 6)
+    return sensor_logger
+
+
+def write_sweeps(sensor_logger, start, count):
+    for sweep in range(count):
+        for i, sensor_id in enumerate(SENSOR_IDS):
+            sensor_logger.save_reading(SensorReading(sensor_id, 20.0 + sweep, 40.0 + i,
+                                                     start + timedelta(seconds=5 * sweep)))
+
+
+def replay(config, source, end=None):
+    log_replay = LogReplay(SensorLogger(str(source.base_path), LogFormat.CSV), end=end, speed=None)
+    manager = SensorDataManager(config, log_replay)
+    while True:
+        try:
+            manager.generate_sensor_data()
+        except StopIteration:
+            break
+    manager.close()
+    return log_replay
+
+
+def target_rows(config, day):
+    sensor_logger = SensorLogger(config.config['Logging']['log_path'],
+                                 LogFormat(config.config['Logging']['log_format']))
+    rows = [(row['timestamp'], row['sensor_id'], float(row['temperature'])) for row in sensor_logger.iter_readings(day)]
+    sensor_logger.close()
+    return rows
+
+
+@pytest.mark.parametrize('log_format', ['csv', 'jsonl', 'bin', 'sqlite'])
+def test_replay_twice_writes_each_sweep_once(make_config, source, log_format):
+    config = make_config(log_format, buffer_size=50)
+    first = replay(config, source)
+    assert (first.sweeps, first.logged) == (12, 0)
+    expected = {day: target_rows(config, DAY + timedelta(days=day)) for day in range(2)}
+    assert [len(rows) for rows in expected.values()] == [60, 60]
+
+    second = replay(config, source)
+    assert (second.sweeps, second.logged) == (0, 12)
+    assert {day: target_rows(config, DAY + timedelta(days=day)) for day in range(2)} == expected
+
+
+def test_interrupted_replay_continues_after_last_logged_sweep(make_config, source):
+    config = make_config('csv')
+    assert replay(config, source, end=DAY + timedelta(seconds=10)).sweeps == 3
+    resumed = replay(config, source)
+    assert (resumed.sweeps, resumed.logged) == (9, 3)
+    rows = target_rows(config, DAY)
+    assert len(rows) == len(set(rows)) == 60
+
+
+def test_replay_into_compressed_day(make_config, source):
+    config = make_config('csv')
+    replay(config, source, end=DAY + timedelta(hours=1))
+    target = SensorLogger(config.config['Logging']['log_path'], LogFormat.CSV)
+    maintenance = LogMaintenance(target)
+    assert maintenance.run_once(today=date(2026, 3, 3))['compressed'] == 1
+    plain = target._get_log_file_path(DAY)
+    archive = plain.with_name(plain.name + '.gz')
+    archived = archive.read_bytes()
+
+    # Zdroj nemá nič nové pre skomprimovaný deň, archív ostane nezmenený
+    assert replay(config, source, end=DAY + timedelta(hours=1)).sweeps == 0
+    assert archive.read_bytes() == archived
+
+    # Neskoré zbery v zdroji obnovia deň v cieli namiesto nového súboru vedľa archívu
+    write_sweeps(source, DAY + timedelta(minutes=30), 2)
+    assert replay(config, source, end=DAY + timedelta(hours=1)).sweeps == 2
+    assert plain.exists() and not archive.exists()
+    assert len(target_rows(config, DAY)) == 80
+
+    assert maintenance.run_once(today=date(2026, 3, 3))['compressed'] == 1
+    assert archive.exists() and not plain.exists()
+    assert len(target_rows(config, DAY)) == 80
+    target.close()
+
+
+def test_replay_from_sqlite_source_twice(make_config, tmp_path):
+    source = SensorLogger(str(tmp_path / 'source_db'), LogFormat.SQLITE)
+    write_sweeps(source, DAY, 4)
+    config = make_config('csv')
+    log_replay = LogReplay(source, speed=None)
+    manager = SensorDataManager(config, log_replay)
+    with pytest.raises(StopIteration):
+        while True:
+            manager.generate_sensor_data()
+    manager.close()
+    assert log_replay.sweeps == 4
+
+    again = LogReplay(SensorLogger(str(tmp_path / 'source_db'), LogFormat.SQLITE), speed=None)
+    manager = SensorDataManager(config, again)
+    with pytest.raises(StopIteration):
+        manager.generate_sensor_data()
+    manager.close()
+    assert (again.sweeps, again.logged) == (0, 4)
+    assert len(target_rows(config, DAY)) == 40
@@ -0,0 +1,86 @@
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+
+from rollups import RollupAggregator
+from sensor_logger import SensorReading
+
+SENSORS = ('Sensor_8_1', 'Sensor_8_2')
+
+
+@pytest.fixture
+def aggregator(tmp_path):
+    aggregator = RollupAggregator(tmp_path)
+    yield aggregator
+    aggregator.close()
+
+
+def sweep(aggregator, timestamp, temperature, humidity=40.0):
+    for sensor_id in SENSORS:
+        aggregator.add(SensorReading(sensor_id, temperature, humidity, timestamp))
+
+
+def rows(aggregator, resolution, day):
+    file_path = aggregator._get_file_path(resolution, day)
+    if not file_path.exists():
+        return []
+    with open(file_path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file, delimiter=';'))
+
+
+def test_minute_and_hour_close_on_the_next_sweep(aggregator):
+    day = datetime(2026, 3, 1)
+    sweep(aggregator, datetime(2026, 3, 1, 12, 59, 30), 20.0)
+    sweep(aggregator, datetime(2026, 3, 1, 12, 59, 55), 22.0)
+    sweep(aggregator, datetime(2026, 3, 1, 13, 0, 5), 30.0)
+    # Koše 12:59 a 12:00 sú uzavreté, zapíšu sa až s prvým meraním ďalšieho zberu
+    assert rows(aggregator, '1m', day) == rows(aggregator, '1h', day) == []
+    minutes = aggregator.query('1m', datetime(2026, 3, 1, 12, 59), datetime(2026, 3, 1, 13, 0))
+    assert [(row['bucket'], row['count'], row['temp_mean']) for row in minutes] == [
+        ('2026-03-01 12:59:00', 2, 21.0), ('2026-03-01 12:59:00', 2, 21.0),
+        ('2026-03-01 13:00:00', 1, 30.0), ('2026-03-01 13:00:00', 1, 30.0)]
+
+    sweep(aggregator, datetime(2026, 3, 1, 13, 0, 10), 32.0)
+    assert [(row['bucket'], row['sensor_id'], row['count'], row['temp_min'], row['temp_max'], row['temp_last'])
+            for row in rows(aggregator, '1m', day)] == [
+        ('2026-03-01 12:59:00', sensor_id, '2', '20.0', '22.0', '22.0') for sensor_id in SENSORS]
+    assert [(row['bucket'], row['count']) for row in rows(aggregator, '1h', day)] == [
+        ('2026-03-01 12:00:00', '2')] * 2
+    hours = aggregator.query('1h', datetime(2026, 3, 1, 12), datetime(2026, 3, 1, 13), 'Sensor_8_1')
+    assert [(row['bucket'], row['count'], row['temp_mean']) for row in hours] == [
+        ('2026-03-01 12:00:00', 2, 21.0), ('2026-03-01 13:00:00', 2, 31.0)]
+
+
+def test_bucket_closed_after_midnight_goes_to_its_own_day(aggregator):
+    sweep(aggregator, datetime(2026, 3, 1, 23, 59, 50), 20.0)
+    sweep(aggregator, datetime(2026, 3, 2, 0, 0, 0), 21.0)
+    sweep(aggregator, datetime(2026, 3, 2, 0, 0, 5), 22.0)
+    assert [row['bucket'] for row in rows(aggregator, '1m', datetime(2026, 3, 1))] == ['2026-03-01 23:59:00'] * 2
+    assert [row['bucket'] for row in rows(aggregator, '1h', datetime(2026, 3, 1))] == ['2026-03-01 23:00:00'] * 2
+    assert rows(aggregator, '1m', datetime(2026, 3, 2)) == []
+
+
+def test_channels_are_counted_separately(aggregator):
+    start = datetime(2026, 3, 1, 12, 0, 0)
+    sweep(aggregator, start, 20.0, None)
+    sweep(aggregator, start + timedelta(seconds=5), None, 40.0)
+    sweep(aggregator, start + timedelta(seconds=10), 24.0, 44.0)
+    sweep(aggregator, start + timedelta(minutes=1), 25.0)
+    sweep(aggregator, start + timedelta(minutes=1, seconds=5), 25.0)
+    [row] = [row for row in rows(aggregator, '1m', start) if row['sensor_id'] == 'Sensor_8_1']
+    assert (row['count'], row['temp_count'], row['hum_count']) == ('3', '2', '2')
+    assert (row['temp_mean'], row['temp_last'], row['hum_mean'], row['hum_min']) == ('22.0', '24.0', '42.0', '40.0')
+
+
+def test_bucket_continued_after_restart_is_merged(tmp_path):
+    start = datetime(2026, 3, 1, 12, 0, 0)
+    first = RollupAggregator(tmp_path)
+    sweep(first, start, 20.0)
+    first.close()
+    second = RollupAggregator(tmp_path)
+    sweep(second, start + timedelta(seconds=5), 24.0)
+    [row] = second.query('1m', start, start, 'Sensor_8_1')
+    assert (row['count'], row['temp_min'], row['temp_max'], row['temp_mean'], row['temp_last']) == (
+        2, 20.0, 24.0, 22.0, 24.0)
+    second.close()
@@ -0,0 +1,116 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from acquisition import AcquisitionLoop
+from routes import create_routes
+from sensor_logger import SensorReading
+from sensor_manager import SensorDataManager
+
+DAYS = [datetime(2026, 3, 1), datetime(2026, 3, 2), datetime(2026, 3, 3)]
+
+
+def make_client(manager, acquisition):
+    app = Flask(__name__)
+    app.register_blueprint(create_routes(manager, acquisition))
+    return app.test_client()
+
+
+@pytest.fixture(params=['csv', 'jsonl'])
+def logged_manager(request, make_config):
+    # Proces bez zberu (bus None): iba čítanie a export logov
+    manager = SensorDataManager(make_config(request.param), None)
+    for day in DAYS:
+        for minute in range(40):
+            for sensor in (1, 2):
+                manager.logger.save_reading(SensorReading(f'Sensor_8_{sensor}', 20.0 + minute / 10, 45.0,
+                                                          day + timedelta(hours=12, minutes=minute)))
+    yield manager
+    manager.close()
+
+
+def download(client, headers=None):
+    return client.get('/download_log?start=2026-03-01&end=2026-03-03', headers=headers or {})
+
+
+def day_parts(manager):
+    """Obsah denných súborov tak, ako ho má export spojiť."""
+    parts = [path.read_bytes() for path in manager.logger.existing_log_files(DAYS[0], DAYS[-1])]
+    if manager.logger.format.value == 'csv':
+        # Hlavička iba z prvého dňa, v ďalších dňoch sa preskočí
+        parts = parts[:1] + [part.split(b'\n', 1)[1] for part in parts[1:]]
+    return parts
+
+
+def test_multi_day_body_concatenates_days(logged_manager):
+    client = make_client(logged_manager, AcquisitionLoop(logged_manager))
+    body = download(client).data
+    assert body == b''.join(day_parts(logged_manager))
+    assert body.count(b'timestamp;sensor_id') == (logged_manager.logger.format.value == 'csv')
+
+
+def test_range_slices_match_the_full_body(logged_manager):
+    client = make_client(logged_manager, AcquisitionLoop(logged_manager))
+    body = download(client).data
+    first, second, _ = (len(part) for part in day_parts(logged_manager))
+    # Rozsahy na začiatku, cez hranice dní (za preskočenou hlavičkou), cez celý deň a na konci
+    ranges = [(0, 99), (first - 10, first + 10), (first + second - 1, first + second + 200),
+              (first - 1, first + second + 1), (len(body) - 50, len(body) - 1)]
+    for low, high in ranges:
+        response = download(client, {'Range': f'bytes={low}-{high}'})
+        assert response.status_code == 206
+        assert response.headers['Content-Range'] == f'bytes {low}-{high}/{len(body)}'
+        assert response.data == body[low:high + 1]
+    assert download(client, {'Range': 'bytes=-70'}).data == body[-70:]
+
+
+class ScriptedSource:
+    """Zdroj zberov pre AcquisitionLoop s vopred danými snapshotmi."""
+
+    def __init__(self, alarms, sweeps):
+        self.alarms = alarms
+        self.sweeps = list(sweeps)
+
+    def generate_sensor_data(self):
+        return [{'Sensor': sensor, 'Temperature': temperature, 'Humidity': 45.0,
+                 'Timestamp': '2026-03-01 12:00:00'} for sensor, temperature in self.sweeps.pop(0).items()]
+
+
+def read_event(events):
+    event, sequence, data = next(events).decode('utf-8').strip().split('\n')
+    return event.split(': ')[1], int(sequence.split(': ')[1]), json.loads(data.split(': ', 1)[1])
+
+
+def test_stream_delta_reports_changed_and_removed_sensors(make_config):
+    manager = SensorDataManager(make_config(), None)
+    acquisition = AcquisitionLoop(ScriptedSource(manager.alarms, [
+        {'Sensor_8_1': 21.0, 'Sensor_8_2': 22.0, 'Sensor_8_3': 23.0},
+        {'Sensor_8_1': 21.0, 'Sensor_8_2': 22.5},
+        {'Sensor_8_1': 21.0, 'Sensor_8_2': 22.5, 'Sensor_8_3': 23.0},
+    ]))
+    acquisition.run_once()
+    response = make_client(manager, acquisition).get('/stream?delta=1', buffered=False)
+    events = iter(response.response)
+
+    # Po pripojení celý snapshot a zoznam alarmov, potom iba zmeny
+    event, sequence, data = read_event(events)
+    assert (event, sequence, [item['Sensor'] for item in data]) == (
+        'snapshot', 1, ['Sensor_8_1', 'Sensor_8_2', 'Sensor_8_3'])
+    assert read_event(events)[0] == 'alarms'
+
+    acquisition.run_once()
+    event, sequence, data = read_event(events)
+    assert (event, sequence) == ('delta', 2)
+    assert [(item['Sensor'], item['Temperature']) for item in data['changed']] == [('Sensor_8_2', 22.5)]
+    assert data['removed'] == ['Sensor_8_3']
+
+    # Senzor, ktorý sa vrátil, je opäť medzi zmenenými
+    acquisition.run_once()
+    event, sequence, data = read_event(events)
+    assert (event, sequence) == ('delta', 3)
+    assert [(item['Sensor'], item['Temperature']) for item in data['changed']] == [('Sensor_8_3', 23.0)]
+    assert data['removed'] == []
+    response.close()
+    manager.close()
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from log_index import index_path_for, load_index
+from metrics import LOG_BYTES_READ
+from sensor_logger import LogFormat, SensorLogger, SensorReading
+from sensor_query import SensorQuery
+
+START = datetime(2026, 3, 1, 22, 0, 0)
+SENSORS = ('Sensor_8_1', 'Sensor_8_2')
+
+
+@pytest.fixture(params=[LogFormat.CSV, LogFormat.JSONL])
+def sensor_logger(request, tmp_path):
+    # Dva senzory každú minútu od 1. 3. 22:00 do 3. 3. 02:00, index po 10 minútach
+    sensor_logger = SensorLogger(str(tmp_path), request.param, buffer_size=1000, index_bucket=600)
+    minute = 0
+    while START + timedelta(minutes=minute) <= datetime(2026, 3, 3, 2, 0, 0):
+        for sensor_id in SENSORS:
+            sensor_logger.save_reading(SensorReading(sensor_id, 20.0 + minute % 10, 40.0,
+                                                     START + timedelta(minutes=minute)))
+        minute += 1
+    sensor_logger.flush()
+    yield sensor_logger
+    sensor_logger.close()
+
+
+def timestamps(records):
+    return [datetime.fromisoformat(record['timestamp']) for record in records]
+
+
+def expected(start, end, step=timedelta(minutes=1)):
+    # Minúty zberu v rozsahu vrátane okrajov
+    moment = START + (max(start, START) - START + step - timedelta(microseconds=1)) // step * step
+    result = []
+    while moment <= end and moment <= datetime(2026, 3, 3, 2, 0, 0):
+        result.append(moment)
+        moment += step
+    return result
+
+
+def bytes_read(log_format):
+    return LOG_BYTES_READ._values.get((log_format.value,), 0)
+
+
+def test_range_across_three_days(sensor_logger):
+    start, end = datetime(2026, 3, 1, 23, 55, 30), datetime(2026, 3, 3, 0, 4, 0)
+    records = list(SensorQuery(sensor_logger).query(start, end))
+    assert timestamps(records)[::2] == expected(start, end)
+    assert [record['sensor_id'] for record in records[:2]] == list(SENSORS)
+
+
+def test_sensor_filter_across_days(sensor_logger):
+    start, end = datetime(2026, 3, 1, 23, 58), datetime(2026, 3, 2, 0, 2)
+    records = list(SensorQuery(sensor_logger).query(start, end, 'Sensor_8_2'))
+    assert timestamps(records) == expected(start, end)
+    assert {record['sensor_id'] for record in records} == {'Sensor_8_2'}
+
+
+def test_short_range_seeks_and_stops_early(sensor_logger):
+    day_path = sensor_logger._get_log_file_path(datetime(2026, 3, 2))
+    assert len(load_index(day_path)) == 24 * 6
+    before = bytes_read(sensor_logger.format)
+    start, end = datetime(2026, 3, 2, 12, 3), datetime(2026, 3, 2, 12, 7)
+    records = list(SensorQuery(sensor_logger).query(start, end))
+    assert timestamps(records)[::2] == expected(start, end)
+    # Čítanie začne na koši 12:00 a skončí za 12:07, nie na konci dňa
+    read = bytes_read(sensor_logger.format) - before
+    assert 0 < read < day_path.stat().st_size / 50
+
+
+def test_missing_index_is_rebuilt(sensor_logger):
+    day_path = sensor_logger._get_log_file_path(datetime(2026, 3, 2))
+    entries = load_index(day_path)
+    index_path_for(day_path).unlink()
+    start, end = datetime(2026, 3, 2, 6, 0), datetime(2026, 3, 2, 6, 30)
+    records = list(SensorQuery(sensor_logger).query(start, end))
+    assert timestamps(records)[::2] == expected(start, end)
+    assert load_index(day_path) == entries
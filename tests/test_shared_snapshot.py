@@ -0,0 +1,78 @@
+import struct
+import uuid
+
+import pytest
+
+from acquisition import Snapshot
+from shared_snapshot import (_CRC_OFFSET, _HEADER, _SEQLOCK_OFFSET, SharedSnapshotReader,
+                             SharedSnapshotWriter)
+
+SENSOR_IDS = ['Sensor_8_1', 'Sensor_8_2']
+
+
+def snapshot(sequence, temperature):
+    return Snapshot.from_data(sequence, [
+        {'Sensor': sensor_id, 'Temperature': temperature, 'Humidity': 40.0, 'Timestamp': '2026-03-01 12:00:00'}
+        for sensor_id in SENSOR_IDS])
+
+
+@pytest.fixture
+def segment():
+    name = f'test_snapshot_{uuid.uuid4().hex[:12]}'
+    writer = SharedSnapshotWriter(name, SENSOR_IDS)
+    reader = SharedSnapshotReader(name, SENSOR_IDS)
+    yield writer, reader
+    reader.stop()
+    writer.close()
+    SharedSnapshotWriter.unlink(name)
+
+
+def temperatures(snapshot):
+    return [reading['Temperature'] for reading in snapshot.readings]
+
+
+def test_reader_sees_published_snapshot(segment):
+    writer, reader = segment
+    assert reader.latest().sequence == 0
+    writer.publish(snapshot(1, 21.5))
+    latest = reader.latest()
+    assert latest.sequence == 1
+    assert temperatures(latest) == [21.5, 21.5]
+
+
+def test_reader_rejects_body_during_write(segment):
+    writer, reader = segment
+    writer.publish(snapshot(1, 21.5))
+    assert reader.latest().sequence == 1
+    # Zapisovač uprostred zápisu: nepárne počítadlo a rozpísané telo
+    buf = writer._segment.buf
+    seqlock = struct.unpack_from('<Q', buf, _SEQLOCK_OFFSET)[0]
+    struct.pack_into('<Q', buf, _SEQLOCK_OFFSET, seqlock + 1)
+    buf[_HEADER.size:_HEADER.size + 8] = struct.pack('<Q', 99)
+    assert reader.latest().sequence == 1
+
+
+def test_reader_rejects_body_with_wrong_crc(segment):
+    writer, reader = segment
+    writer.publish(snapshot(1, 21.5))
+    assert reader.latest().sequence == 1
+    writer.publish(snapshot(2, 22.5))
+    # Párne počítadlo, ale CRC nesedí s telom (preusporiadané zápisy)
+    buf = writer._segment.buf
+    crc = struct.unpack_from('<I', buf, _CRC_OFFSET)[0]
+    struct.pack_into('<I', buf, _CRC_OFFSET, crc ^ 1)
+    latest = reader.latest()
+    assert latest.sequence == 1
+    assert temperatures(latest) == [21.5, 21.5]
+
+    writer.publish(snapshot(3, 23.5))
+    assert reader.latest().sequence == 3
+
+
+def test_writer_continues_sequence_after_restart(segment):
+    writer, reader = segment
+    writer.publish(snapshot(5, 21.5))
+    restarted = SharedSnapshotWriter(writer.name, SENSOR_IDS)
+    restarted.publish(snapshot(1, 22.5))
+    assert reader.latest().sequence == 6
+    restarted.close()
@@ -0,0 +1,69 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlite_store import SqliteStore, format_timestamp
+
+DAY = datetime(2026, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteStore(tmp_path)
+    # Dva senzory každú sekundu 12:00:00 - 12:00:09, vložené v opačnom poradí
+    store.insert([(format_timestamp(DAY + timedelta(seconds=second)), sensor_id, 20.0 + second, 40.0)
+                  for second in reversed(range(10)) for sensor_id in ('Sensor_8_1', 'Sensor_8_2')])
+    yield store
+    store.close()
+
+
+def seconds(records):
+    return [datetime.fromisoformat(record['timestamp']).second for record in records]
+
+
+def test_range_includes_both_ends(store):
+    records = list(store.query(DAY + timedelta(seconds=2), DAY + timedelta(seconds=4)))
+    assert seconds(records) == [2, 2, 3, 3, 4, 4]
+    assert records[0] == {'timestamp': '2026-03-01 12:00:02', 'sensor_id': 'Sensor_8_1',
+                          'temperature': 22.0, 'humidity': 40.0}
+
+
+def test_fractional_start_rounds_up(store):
+    records = store.query(DAY + timedelta(seconds=2, microseconds=1), DAY + timedelta(seconds=4))
+    assert seconds(records) == [3, 3, 4, 4]
+
+
+def test_fractional_end_keeps_whole_second(store):
+    records = store.query(DAY + timedelta(seconds=2), DAY + timedelta(seconds=4, microseconds=500000))
+    assert seconds(records) == [2, 2, 3, 3, 4, 4]
+
+
+def test_sensor_filter(store):
+    records = list(store.query(DAY, DAY + timedelta(seconds=9), sensor_id='Sensor_8_2'))
+    assert seconds(records) == list(range(10))
+    assert {record['sensor_id'] for record in records} == {'Sensor_8_2'}
+
+
+def test_delete_before(store):
+    assert store.delete_before(DAY + timedelta(seconds=5)) == 10
+    assert seconds(store.query(DAY, DAY + timedelta(seconds=9))) == [5, 5, 6, 6, 7, 7, 8, 8, 9, 9]
+
+
+def test_last_timestamp(store):
+    assert store.last_timestamp(DAY, DAY + timedelta(seconds=4)) == DAY + timedelta(seconds=4)
+    assert store.last_timestamp(DAY + timedelta(hours=1), DAY + timedelta(hours=2)) is None
+
+
+def test_old_schema_migrates_to_nullable_channels(tmp_path):
+    connection = sqlite3.connect(tmp_path / 'sensor_log.sqlite')
+    connection.executescript(
+        "CREATE TABLE readings (timestamp TEXT NOT NULL, sensor_id TEXT NOT NULL, "
+        "temperature REAL NOT NULL, humidity REAL NOT NULL);"
+        "INSERT INTO readings VALUES ('2026-03-01 12:00:00', 'Sensor_8_1', 21.0, 40.0);")
+    connection.close()
+    store = SqliteStore(tmp_path)
+    store.insert([(format_timestamp(DAY + timedelta(seconds=1)), 'Sensor_8_1', None, 41.0)])
+    records = list(store.query(DAY, DAY + timedelta(seconds=1)))
+    assert [(record['temperature'], record['humidity']) for record in records] == [(21.0, 40.0), (None, 41.0)]
+    store.close()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from volume_renderer import VolumePayload, quantize
+
+
+def dequantize(codes, offset, scale, bits):
+    # Rovnaký prevod ako decodeVolume v prehliadači
+    values = offset + codes.astype(np.float64) * scale
+    values[codes == (1 << bits) - 1] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('bits', [8, 16])
+def test_round_trip_within_half_step(bits):
+    rng = np.random.default_rng(1)
+    grid = rng.uniform(-12.5, 48.0, size=(9, 7, 5))
+    grid[rng.random(grid.shape) < 0.2] = np.nan
+    codes, offset, scale = quantize(grid, bits)
+    assert codes.dtype == np.dtype(f'uint{bits}')
+    nodata = (1 << bits) - 1
+    # Najvyšší kód je rezervovaný pre body mimo miestnosti, maximum dostane kód o jeden nižší
+    assert codes[np.isfinite(grid)].max() == nodata - 1
+    assert (codes == nodata).tolist() == np.isnan(grid).tolist()
+    values = dequantize(codes, offset, scale, bits)
+    assert np.isnan(values).tolist() == np.isnan(grid).tolist()
+    finite = np.isfinite(grid)
+    assert np.abs(values[finite] - grid[finite]).max() <= scale / 2 + 1e-9
+    assert offset == np.nanmin(grid)
+
+
+def test_constant_grid_is_exact():
+    grid = np.full((3, 3, 3), 21.5)
+    grid[0, 0, 0] = np.nan
+    codes, offset, scale = quantize(grid)
+    assert (offset, scale) == (21.5, 1.0)
+    values = dequantize(codes, offset, scale, 8)
+    assert np.isnan(values[0, 0, 0]) and (values.ravel()[1:] == 21.5).all()
+
+
+def test_grid_without_values_is_all_nodata():
+    codes, offset, scale = quantize(np.full((2, 2, 2), np.nan), 16)
+    assert (codes == 65535).all() and (offset, scale) == (0.0, 1.0)
+
+
+def test_payload_headers_describe_the_codes():
+    codes, offset, scale = quantize(np.linspace(0.0, 10.0, 8).reshape(2, 2, 2), 16)
+    payload = VolumePayload(codes.tobytes(), codes.shape, 16, offset, scale, (0.0, 1.0, 0.0, 1.0, 0.0, 1.0),
+                            '2026-03-01 12:00:00', 'temperature')
+    headers = payload.headers()
+    assert headers['X-Volume-Nodata'] == '65535'
+    assert (float(headers['X-Volume-Offset']), float(headers['X-Volume-Scale'])) == (offset, scale)
+    received = np.frombuffer(payload.data, dtype=np.uint16).reshape(payload.shape)
+    assert np.allclose(dequantize(received, offset, scale, 16), np.linspace(0.0, 10.0, 8).reshape(2, 2, 2))
@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Hashable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from metrics import VOLUME_CACHE_REQUESTS, VOLUME_RENDER_SECONDS
+from sensor_logger import record_value
+from snapshot_log import SnapshotLog, sensor_sort_key
+
+QUANTIZATION_DTYPES = {8: np.uint8, 16: np.uint16}
+
+
+@dataclass(frozen=True)
+class VolumePayload:
+    """Kvantovaná 3D mriežka: hodnota = offset + kód * scale, najvyšší kód je mimo miestnosti."""
+    data: bytes
+    shape: Tuple[int, int, int]
+    bits: int
+    offset: float
+    scale: float
+    bounds: Tuple[float, float, float, float, float, float]
+    timestamp: str
+    mode: str
+
+    @property
+    def nodata(self) -> int:
+        return (1 << self.bits) - 1
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            'X-Volume-Shape': ','.join(map(str, self.shape)),
+            'X-Volume-Bits': str(self.bits),
+            'X-Volume-Offset': repr(self.offset),
+            'X-Volume-Scale': repr(self.scale),
+            'X-Volume-Nodata': str(self.nodata),
+            'X-Volume-Bounds': ','.join(repr(bound) for bound in self.bounds),
+            'X-Volume-Timestamp': self.timestamp,
+            'X-Volume-Mode': self.mode
+        }
+
+
+def quantize(grid: np.ndarray, bits: int = 8) -> Tuple[np.ndarray, float, float]:
+    """Lineárna kvantizácia na `bits` bitov, NaN dostane rezervovaný najvyšší kód."""
+    dtype = QUANTIZATION_DTYPES[bits]
+    nodata = (1 << bits) - 1
+    finite = np.isfinite(grid)
+    if not finite.any():
+        return np.full(grid.shape, nodata, dtype=dtype), 0.0, 1.0
+    low = float(grid[finite].min())
+    high = float(grid[finite].max())
+    scale = (high - low) / (nodata - 1) if high > low else 1.0
+    codes = np.full(grid.shape, nodata, dtype=dtype)
+    codes[finite] = np.rint((grid[finite] - low) / scale).astype(dtype)
+    return codes, low, scale
+
+
+def readings_values(readings: Sequence[Mapping], sensor_ids: List[str], mode: str, num_sensors: int) -> np.ndarray:
+    """Hodnoty snapshotu v poradí `sensor_ids` (= poradie súradníc v geometrii)."""
+    column = {sensor_id: i for i, sensor_id in enumerate(sensor_ids)}
+    temperature = np.full((1, len(sensor_ids)), np.nan, dtype=np.float32)
+    humidity = np.full((1, len(sensor_ids)), np.nan, dtype=np.float32)
+    for reading in readings:
+        i = column.get(reading['sensor_id'])
+        if i is not None:
+            # CSV log vracia hodnoty ako reťazce, neplatný kanál je prázdny
+            temperature[0, i] = record_value(reading['temperature'], np.nan)
+            humidity[0, i] = record_value(reading['humidity'], np.nan)
+    snapshot_log = SnapshotLog(np.array([0], dtype='datetime64[s]'), sensor_ids, temperature, humidity)
+    return snapshot_log.values(mode, num_sensors)[0]
+
+
+class VolumeRenderer:
+    """Interpolácia snapshotu na serveri s LRU cache podľa snapshotu a rozlíšenia.
+
+    Geometria aj operátor interpolácie sú spoločné so `SensorVisualizer`,
+    opakované zobrazenie toho istého snapshotu sa iba vráti z cache.
+    """
+
+    def __init__(self, visualizer, sensor_ids: Sequence[str], cache_size: int = 64):
+        self.visualizer = visualizer
+        self.sensor_ids = sorted(sensor_ids, key=sensor_sort_key)
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Hashable, VolumePayload]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, key: Hashable, readings: Sequence[Mapping], timestamp: datetime,
+               mode: str = 'temperature', grid_points: int = 29, bits: int = 8) -> VolumePayload:
+        """`readings` sú slovníky so `sensor_id`, `temperature`, `humidity` (formát logu)."""
+        cache_key = (key, mode, grid_points, bits)
+        with self._lock:
+            payload = self._cache.get(cache_key)
+            if payload is not None:
+                self._cache.move_to_end(cache_key)
+                VOLUME_CACHE_REQUESTS.inc(result='hit')
+                return payload
+        VOLUME_CACHE_REQUESTS.inc(result='miss')
+
+        with VOLUME_RENDER_SECONDS.time(grid=grid_points):
+            values = readings_values(readings, self.sensor_ids, mode, len(self.visualizer.x_coords))
+            grid = self.visualizer.interpolate_grid(values, grid_points)
+            codes, offset, scale = quantize(grid, bits)
+        xi, yi, zi = self.visualizer.grid_axes(grid_points)
+        payload = VolumePayload(
+            data=codes.tobytes(), shape=codes.shape, bits=bits, offset=offset, scale=scale,
+            bounds=(float(xi[0]), float(xi[-1]), float(yi[0]), float(yi[-1]), float(zi[0]), float(zi[-1])),
+            timestamp=timestamp.strftime('%Y-%m-%d %H:%M:%S'), mode=mode)
+
+        with self._lock:
+            self._cache[cache_key] = payload
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return payload